@@ -15,11 +15,14 @@
 """GoldenStick."""
 
 import abc
+import copy
+import shutil
+import hashlib
 import os.path
 
 from mindspore.nn.cell import Cell
 from mindspore.train.callback import Callback
-from mindspore import export, context
+from mindspore import export, context, load_param_into_net, load_checkpoint, save_checkpoint, Parameter, Tensor
 from mindspore import log as logger
 from mindspore_gs.validator import Validator
 
@@ -36,6 +39,11 @@ class CompAlgo(abc.ABC):
             - save_mindir_path (str): The path to export MindIR, the path includes the directory and file name, which
               can be a relative path or an absolute path, the user needs to ensure write permission.
               Default: './network'.
+            - defer_export (bool): If true, MindIRs of epochs are converted and exported after training from
+              checkpoints saved at the end of these epochs, so that training is not blocked by compiling. Exports
+              are not run concurrently with training, because compiling can not. Default: False.
+            - save_mindir_interval (int): Export MindIR every `save_mindir_interval` epochs besides after training, 0
+              means only exporting after training. Default: 0.
     """
 
     def __init__(self, config=None):
@@ -57,6 +65,8 @@ class CompAlgo(abc.ABC):
         self.set_save_mindir(config.get("save_mindir", False))
         if self._config.save_mindir:
             self.set_save_mindir_path(config.get("save_mindir_path", "./network"))
+            self.set_defer_export(config.get("defer_export", False))
+            self.set_save_mindir_interval(config.get("save_mindir_interval", 0))
 
     def _update_config_from_dict(self, config: dict):
         """Update config for specific algo. If derived class has extra attributes, Should be over-writed."""
@@ -89,7 +99,8 @@ class CompAlgo(abc.ABC):
 
         cb = []
         if self._config.save_mindir:
-            cb.append(ExportMindIRCallBack(self, os.path.realpath(self._config.save_mindir_path)))
+            cb.append(ExportMindIRCallBack(self, os.path.realpath(self._config.save_mindir_path),
+                                           self._config.defer_export, self._config.save_mindir_interval))
         return cb
 
     def set_save_mindir(self, save_mindir: bool):
@@ -146,6 +157,38 @@ class CompAlgo(abc.ABC):
                              f" {save_mindir_path}.")
         self._config.save_mindir_path = os.path.realpath(save_mindir_path)
 
+    def set_defer_export(self, defer_export: bool):
+        """
+        Set whether to defer converting and exporting MindIR of epochs to the end of training, only takes effect if
+        `save_mindir` is True. A checkpoint is saved at the end of each exporting epoch, and MindIR is exported from it
+        after training, because compiling can not run concurrently with training.
+
+        Args:
+            defer_export (bool): If true, export MindIR of epochs after training, else export at the end of epochs.
+
+        Raises:
+            TypeError: If `defer_export` is not bool.
+        """
+        Validator.check_bool(defer_export, "defer_export", self.__class__.__name__)
+        self._config.defer_export = defer_export
+
+    def set_save_mindir_interval(self, save_mindir_interval: int):
+        """
+        Set the interval of epochs to export MindIR during training, only takes effect if `save_mindir` is True.
+        MindIR exported at the end of epoch `n` is named with suffix `_epoch{n}`.
+
+        Args:
+            save_mindir_interval (int): Export MindIR every `save_mindir_interval` epochs, 0 means only exporting
+                after training.
+
+        Raises:
+            TypeError: If `save_mindir_interval` is not int.
+            ValueError: If `save_mindir_interval` is negative.
+        """
+        Validator.check_is_int(save_mindir_interval, "save_mindir_interval", self.__class__.__name__)
+        Validator.check_non_negative_int(save_mindir_interval, "save_mindir_interval", self.__class__.__name__)
+        self._config.save_mindir_interval = save_mindir_interval
+
     def convert(self, net_opt: Cell, ckpt_path="") -> Cell:
         """
         Define how to convert a compressed network to a standard network before exporting to MindIR.
@@ -200,12 +243,22 @@ class CompAlgoConfig:
         """Init with default value."""
         self.save_mindir = False
         self.save_mindir_path = "./network"
+        self.defer_export = False
+        self.save_mindir_interval = 0
 
 
 class ExportMindIRCallBack(Callback):
-    """Export MindIR after training automatically."""
+    """
+    Export MindIR after training automatically.
 
-    def __init__(self, algo: CompAlgo, save_mindir_path: str):
+    Converting and exporting compile the network, which can not run concurrently with training. So with
+    `defer_export`, a checkpoint is saved next to the MindIR at the end of each exporting epoch, and MindIRs are
+    converted and exported from these checkpoints after training, then the checkpoints are removed. Only one copy of
+    parameters is kept in host memory at a time.
+    """
+
+    def __init__(self, algo: CompAlgo, save_mindir_path: str, defer_export: bool = False,
+                 save_mindir_interval: int = 0):
         """
         Init callback.
 
@@ -213,12 +266,120 @@ class ExportMindIRCallBack(Callback):
             algo (CompAlgo): Mindspore Golden stick algorithm.
             save_mindir_path (str): The path to export MindIR, the path includes the directory and file name, which can
                 be a relative path or an absolute path, the user needs to ensure write permission.
+            defer_export (bool): If true, MindIRs of epochs are exported after training from checkpoints saved at the
+                end of these epochs. Default: False.
+            save_mindir_interval (int): Export MindIR every `save_mindir_interval` epochs besides after training, 0
+                means only exporting after training. Default: 0.
         """
         self._algo = algo
         self._save_mindir_path = save_mindir_path
+        self._defer_export = defer_export
+        self._save_mindir_interval = save_mindir_interval
+        self._exported = {}
+        self._deferred = []
+        self._network = None
+        self._inputs = None
+
+    @staticmethod
+    def _params_snapshot(network: Cell) -> dict:
+        """Copy values of all parameters of `network` to host."""
+        return {param.name: param.asnumpy().copy() for param in network.get_parameters()}
+
+    @staticmethod
+    def _snapshot_hash(snapshot: dict) -> str:
+        """Hash names and values of parameters in `snapshot`."""
+        sha = hashlib.sha256()
+        for name in sorted(snapshot):
+            sha.update(name.encode("utf-8"))
+            sha.update(snapshot[name].tobytes())
+        return sha.hexdigest()
+
+    def _export(self, network: Cell, inputs, file_name: str, params_hash: str):
+        """
+        Convert and export `network` whose parameters hash to `params_hash`, or copy exported MindIR if parameters are
+        identical to a previous export.
+        """
+        exported = self._exported.get(params_hash)
+        if exported is not None:
+            if exported != file_name:
+                shutil.copyfile(f"{exported}.mindir", f"{file_name}.mindir")
+            logger.info(f"Parameters are identical to MindIR {exported}.mindir, skip converting {file_name}.")
+            return
+        net_deploy = self._algo.convert(network)
+        export(net_deploy, inputs, file_name=file_name, file_format="MINDIR")
+        self._exported[params_hash] = file_name
+
+    def _export_copy(self, network: Cell, inputs, file_name: str, params: dict, params_hash: str):
+        """Convert and export a copy of `network` with `params`, `network` is not changed."""
+        net_copy = copy.deepcopy(network)
+        load_param_into_net(net_copy, params)
+        self._export(net_copy, inputs, file_name, params_hash)
+
+    def _defer(self, file_name: str, snapshot: dict):
+        """Save `snapshot` into a checkpoint to be exported after training, unless the same parameters are deferred."""
+        params_hash = ExportMindIRCallBack._snapshot_hash(snapshot)
+        for _, _, deferred_hash in self._deferred:
+            if deferred_hash == params_hash:
+                self._deferred.append((file_name, None, params_hash))
+                return
+        ckpt_file = f"{file_name}.deferred.ckpt"
+        save_checkpoint([{"name": name, "data": Tensor(value)} for name, value in snapshot.items()], ckpt_file)
+        self._deferred.append((file_name, ckpt_file, params_hash))
+
+    def wait(self):
+        """
+        Export MindIRs deferred by `defer_export`, called at train end. Every deferred MindIR is tried even if some of
+        them fail, and deferred checkpoints are removed afterwards.
+
+        Raises:
+            RuntimeError: If any export failed.
+        """
+        deferred, self._deferred = self._deferred, []
+        errors = []
+        for file_name, ckpt_file, params_hash in deferred:
+            try:
+                if ckpt_file is None:
+                    if params_hash not in self._exported:
+                        raise RuntimeError("MindIR of identical parameters is not exported.")
+                    self._export(None, self._inputs, file_name, params_hash)
+                else:
+                    self._export_copy(self._network, self._inputs, file_name, load_checkpoint(ckpt_file),
+                                      params_hash)
+            except Exception as e:  # pylint: disable=broad-except
+                logger.error(f"Failed to export MindIR {file_name}.mindir: {e}")
+                errors.append(e)
+        for _, ckpt_file, _ in deferred:
+            if ckpt_file is not None and os.path.exists(ckpt_file):
+                os.remove(ckpt_file)
+        if errors:
+            raise RuntimeError(f"Failed to export {len(errors)} MindIR after training: {errors[0]}") from errors[0]
+
+    def on_train_epoch_end(self, run_context):
+        """Called on epoch end, export MindIR every `save_mindir_interval` epochs."""
+        if not self._save_mindir_interval:
+            return
+        cb_params = run_context.original_args()
+        if cb_params.cur_epoch_num % self._save_mindir_interval != 0 or cb_params.cur_epoch_num == cb_params.epoch_num:
+            return
+        file_name = f"{self._save_mindir_path}_epoch{cb_params.cur_epoch_num}"
+        snapshot = ExportMindIRCallBack._params_snapshot(cb_params.network)
+        self._network = cb_params.network
+        self._inputs = cb_params.train_dataset
+        if self._defer_export:
+            self._defer(file_name, snapshot)
+            return
+        # network is still to be trained, so convert a copy of it.
+        params = {name: Parameter(Tensor(value), name=name) for name, value in snapshot.items()}
+        self._export_copy(cb_params.network, cb_params.train_dataset, file_name, params,
+                          ExportMindIRCallBack._snapshot_hash(snapshot))
 
     def on_train_end(self, run_context):
-        """Called on train end, convert net and export MindIR."""
+        """Called on train end, export deferred MindIRs, then convert net and export MindIR."""
         cb_params = run_context.original_args()
-        net_deploy = self._algo.convert(cb_params.network)
-        export(net_deploy, cb_params.train_dataset, file_name=self._save_mindir_path, file_format="MINDIR")
+        self._network = cb_params.network
+        self._inputs = cb_params.train_dataset
+        try:
+            self.wait()
+        finally:
+            params_hash = ExportMindIRCallBack._snapshot_hash(ExportMindIRCallBack._params_snapshot(cb_params.network))
+            self._export(cb_params.network, cb_params.train_dataset, self._save_mindir_path, params_hash)
@@ -48,6 +48,9 @@ class NetTransformer:
     def get_network(self) -> Cell:
         return self._symbol_tree.get_network()
 
+    def get_symbol_tree(self) -> SymbolTree:
+        return self._symbol_tree
+
     def get_code(self):
         return self._symbol_tree.get_code()
 
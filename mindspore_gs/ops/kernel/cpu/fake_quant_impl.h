@@ -0,0 +1,227 @@
+/**
+ * Copyright 2023 Huawei Technologies Co., Ltd
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+
+#ifndef MINDSPORE_GS_OPS_KERNEL_CPU_FAKE_QUANT_IMPL_H
+#define MINDSPORE_GS_OPS_KERNEL_CPU_FAKE_QUANT_IMPL_H
+
+#include <algorithm>
+#include <cmath>
+#include <condition_variable>
+#include <cstring>
+#include <functional>
+#include <mutex>
+#include <thread>
+#include <vector>
+#include "aot/custom_aot_extra.h"
+
+// minimal number of elements processed by one thread, avoid creating threads for small tensors.
+constexpr int kMinTaskSize = 32768;
+
+/**
+ * Number of threads used to process `total_num` tasks of `task_size` elements.
+ */
+inline int GetThreadNum(const int total_num, const int task_size) {
+  int max_threads = static_cast<int>(std::thread::hardware_concurrency());
+  int64_t total_size = static_cast<int64_t>(total_num) * std::max(task_size, 1);
+  int thread_num = static_cast<int>(std::min<int64_t>(total_size / kMinTaskSize + 1, total_num));
+  return std::max(std::min(thread_num, max_threads), 1);
+}
+
+/**
+ * Run `task(start, end)` over [0, total_num) in parallel, each thread processes a contiguous range.
+ * @param total_num - int, number of tasks
+ * @param task_size - int, number of elements processed in each task, purpose for cal the number of threads
+ * @param task - function
+ */
+inline void ParallelFor(const int total_num, const int task_size, const std::function<void(int, int)> &task) {
+  int thread_num = GetThreadNum(total_num, task_size);
+  if (thread_num == 1) {
+    task(0, total_num);
+    return;
+  }
+  std::vector<std::thread> threads;
+  int block = (total_num + thread_num - 1) / thread_num;
+  for (int start = 0; start < total_num; start += block) {
+    threads.emplace_back(task, start, std::min(start + block, total_num));
+  }
+  for (auto &thread : threads) {
+    thread.join();
+  }
+}
+
+/**
+ * Barrier which blocks threads until all `count` threads arrive.
+ */
+class Barrier {
+ public:
+  explicit Barrier(int count) : count_(count) {}
+
+  void Wait() {
+    std::unique_lock<std::mutex> lock(mutex_);
+    if (++arrived_ == count_) {
+      cv_.notify_all();
+      return;
+    }
+    cv_.wait(lock, [this] { return arrived_ >= count_; });
+  }
+
+ private:
+  std::mutex mutex_;
+  std::condition_variable cv_;
+  int count_;
+  int arrived_ = 0;
+};
+
+/**
+ * Run `task(index)` on `thread_num` threads, `index` is in [0, thread_num).
+ */
+inline void ParallelRun(const int thread_num, const std::function<void(int)> &task) {
+  if (thread_num == 1) {
+    task(0);
+    return;
+  }
+  std::vector<std::thread> threads;
+  for (int index = 0; index < thread_num; index++) {
+    threads.emplace_back(task, index);
+  }
+  for (auto &thread : threads) {
+    thread.join();
+  }
+}
+
+/**
+ * Update min and max by the min and max value of current data, the same as MinMaxUpdate kernels. The updated range
+ * always contains zero.
+ */
+inline void UpdateMinMax(const float data_min, const float data_max, const float input_min, const float input_max,
+                         float *output_min, float *output_max, const bool ema, const float ema_decay) {
+  if (ema) {
+    *output_min = ema_decay * data_min + (1 - ema_decay) * input_min;
+    *output_max = ema_decay * data_max + (1 - ema_decay) * input_max;
+  } else {
+    *output_min = data_min;
+    *output_max = data_max;
+  }
+  *output_min = *output_min > 0 ? 0 : *output_min;
+  *output_max = *output_max < 0 ? 0 : *output_max;
+}
+
+/**
+ * Find the nudge min, max and scale value of one channel, the same as `NudgeMinMaxPerChannel` of GPU kernel, except
+ * that `input_min` and `input_max` are not modified.
+ * @param input_min float
+ * @param input_max float
+ * @param quant_min 0 or 1
+ * @param quant_max 1 << bit -1
+ * @param nudge_min float
+ * @param nudge_max float
+ * @param scale float
+ * @param symmetric bool
+ */
+inline void NudgeMinMax(float input_min, float input_max, const float quant_min, const float quant_max,
+                        float *nudge_min, float *nudge_max, float *scale, const bool symmetric) {
+  float zp_from_min = 0.f;
+  if (symmetric) {
+    float abs_max = std::abs(input_min) < input_max ? input_max : -input_min;
+    input_min = std::abs(input_min) < input_max ? -input_max : input_min;
+    input_max = abs_max;
+  }
+  if ((quant_max - quant_min) == 0 || (input_max - input_min) == 0) {
+    *scale = 0.f;
+    zp_from_min = 0.f;
+  } else {
+    *scale = (input_max - input_min) / (quant_max - quant_min);
+    zp_from_min = quant_min - input_min / *scale;
+  }
+
+  float nudge_zp = 0.f;
+  if (zp_from_min <= quant_min) {
+    nudge_zp = quant_min;
+  } else if (zp_from_min >= quant_max) {
+    nudge_zp = quant_max;
+  } else {
+    nudge_zp = std::round(zp_from_min);
+  }
+
+  *nudge_min = (quant_min - nudge_zp) * (*scale);
+  *nudge_max = (quant_max - nudge_zp) * (*scale);
+}
+
+/**
+ * Calculate nudge min, max and scale of each channel.
+ */
+inline void CalNudge(const float *input_min, const float *input_max, const float quant_min, const float quant_max,
+                     float *nudge_min, float *nudge_max, float *scale, const int channel_num, const bool symmetric) {
+  for (int i = 0; i < channel_num; i++) {
+    NudgeMinMax(input_min[i], input_max[i], quant_min, quant_max, nudge_min + i, nudge_max + i, scale + i, symmetric);
+  }
+}
+
+/**
+ * Calculate fake quant output of `size` elements which share the same nudge min, max and scale.
+ */
+inline void FakeQuant(const float *input, float *output, const int size, const float nudge_min, const float nudge_max,
+                      const float scale) {
+  if (scale == 0.f) {
+    std::fill(output, output + size, nudge_min);
+    return;
+  }
+  for (int i = 0; i < size; i++) {
+    // clamp input x
+    float input_x = std::min(std::max(input[i], nudge_min), nudge_max);
+    // clamp shift
+    float nudge_input = std::floor((input_x - nudge_min) / scale + 0.5f);
+    // quantize
+    output[i] = nudge_input * scale + nudge_min;
+  }
+}
+
+/**
+ * Calculate gradient of fake quant of `size` elements which share the same nudge min and max, gradient only passes
+ * through elements inside of [nudge_min, nudge_max].
+ */
+inline void FakeQuantGrad(const float *input, const float *gradient, float *output, const int size,
+                          const float nudge_min, const float nudge_max) {
+  for (int i = 0; i < size; i++) {
+    output[i] = (input[i] < nudge_min || input[i] > nudge_max) ? 0.f : gradient[i];
+  }
+}
+
+/**
+ * Check number of params and that all inputs and outputs are float32.
+ */
+inline int CheckParams(const int nparam, const int io_num, const char **dtypes) {
+  if (nparam != io_num) {
+    return 1;
+  }
+  for (int index = 0; index < io_num; index++) {
+    if (strcmp(dtypes[index], "float32") != 0) {
+      return 2;
+    }
+  }
+  return 0;
+}
+
+inline int GetSize(const int ndim, const int64_t *shape) {
+  int size = 1;
+  for (int i = 0; i < ndim; i++) {
+    size *= shape[i];
+  }
+  return size;
+}
+
+#endif  // MINDSPORE_GS_OPS_KERNEL_CPU_FAKE_QUANT_IMPL_H
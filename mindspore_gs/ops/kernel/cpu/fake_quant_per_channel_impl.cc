@@ -0,0 +1,97 @@
+/**
+ * Copyright 2023 Huawei Technologies Co., Ltd
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+
+#include "fake_quant_impl.h"
+
+class FQPerChannelKernelAttr : public AotKernelData {
+ public:
+  int num_bits;
+  bool training;
+  bool symmetric;
+  bool narrow_range;
+  int quant_delay;
+};
+
+extern "C" int CustomFakeQuantPerChannelInit(int *ndims, int64_t **shapes, const char **dtypes, AotExtra *extra) {
+  FQPerChannelKernelAttr *kernel_ptr = new FQPerChannelKernelAttr;
+  kernel_ptr->num_bits = static_cast<int>(extra->Attr<int64_t>("num_bits"));
+  kernel_ptr->training = extra->Attr<bool>("training");
+  kernel_ptr->symmetric = extra->Attr<bool>("symmetric");
+  kernel_ptr->narrow_range = extra->Attr<bool>("narrow_range");
+  kernel_ptr->quant_delay = static_cast<int>(extra->Attr<int64_t>("quant_delay"));
+  extra->SetKernelData(kernel_ptr);
+
+  return 0;
+}
+
+int global_step = 0;
+
+extern "C" int CustomFakeQuantPerChannel(int nparam, void **params, int *ndims, int64_t **shapes, const char **dtypes,
+                                         void *stream, void *extra_void) {
+  constexpr int IO_NUM = 3 + 1;  // input 3, output 1
+  constexpr int OUTPUT_INDEX = 3;
+
+  int ret = CheckParams(nparam, IO_NUM, dtypes);
+  if (ret != 0) {
+    return ret;
+  }
+
+  float *input_data = static_cast<float *>(params[0]);
+  float *input_min = static_cast<float *>(params[1]);
+  float *input_max = static_cast<float *>(params[2]);
+  float *output = static_cast<float *>(params[3]);
+  int size = GetSize(ndims[OUTPUT_INDEX], shapes[OUTPUT_INDEX]);
+
+  AotExtra *extra = static_cast<AotExtra *>(extra_void);
+  auto kernel_ptr = static_cast<FQPerChannelKernelAttr *>(extra->KernelData());
+  int num_bits = kernel_ptr->num_bits;
+  if (num_bits <= 2 || num_bits >= 16) {
+    return 3;
+  }
+  bool training = kernel_ptr->training;
+  bool symmetric = kernel_ptr->symmetric;
+  bool narrow_range = kernel_ptr->narrow_range;
+  int quant_delay = kernel_ptr->quant_delay;
+  if (quant_delay < 0) {
+    return 3;
+  }
+
+  float quant_min = 0;
+  float quant_max = (1 << num_bits) - 1;
+  if (narrow_range) {
+    quant_min++;
+  }
+  int num_channels = static_cast<int>(shapes[0][0]);
+  int per_channel_num = size / num_channels;
+
+  if (training && global_step++ < quant_delay) {
+    std::copy(input_data, input_data + size, output);
+    return 0;
+  }
+  std::vector<float> scale(num_channels);
+  std::vector<float> nudge_min(num_channels);
+  std::vector<float> nudge_max(num_channels);
+  CalNudge(input_min, input_max, quant_min, quant_max, nudge_min.data(), nudge_max.data(), scale.data(), num_channels,
+           symmetric);
+  ParallelFor(num_channels, per_channel_num, [&](int start, int end) {
+    for (int i = start; i < end; i++) {
+      FakeQuant(input_data + i * per_channel_num, output + i * per_channel_num, per_channel_num, nudge_min[i],
+                nudge_max[i], scale[i]);
+    }
+  });
+  return 0;
+}
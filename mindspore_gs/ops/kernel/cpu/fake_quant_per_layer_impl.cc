@@ -0,0 +1,91 @@
+/**
+ * Copyright 2023 Huawei Technologies Co., Ltd
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+
+#include "fake_quant_impl.h"
+
+class FQPerLayerKernelAttr : public AotKernelData {
+ public:
+  int num_bits;
+  bool training;
+  bool symmetric;
+  bool narrow_range;
+  int quant_delay;
+};
+
+extern "C" int CustomFakeQuantPerLayerInit(int *ndims, int64_t **shapes, const char **dtypes, AotExtra *extra) {
+  FQPerLayerKernelAttr *kernel_ptr = new FQPerLayerKernelAttr;
+  kernel_ptr->num_bits = static_cast<int>(extra->Attr<int64_t>("num_bits"));
+  kernel_ptr->training = extra->Attr<bool>("training");
+  kernel_ptr->symmetric = extra->Attr<bool>("symmetric");
+  kernel_ptr->narrow_range = extra->Attr<bool>("narrow_range");
+  kernel_ptr->quant_delay = static_cast<int>(extra->Attr<int64_t>("quant_delay"));
+  extra->SetKernelData(kernel_ptr);
+
+  return 0;
+}
+
+int global_step = 0;
+
+extern "C" int CustomFakeQuantPerLayer(int nparam, void **params, int *ndims, int64_t **shapes, const char **dtypes,
+                                       void *stream, void *extra_void) {
+  constexpr int IO_NUM = 3 + 1;  // input 3, output 1
+  constexpr int OUTPUT_INDEX = 3;
+
+  int ret = CheckParams(nparam, IO_NUM, dtypes);
+  if (ret != 0) {
+    return ret;
+  }
+
+  float *input_data = static_cast<float *>(params[0]);
+  float *input_min = static_cast<float *>(params[1]);
+  float *input_max = static_cast<float *>(params[2]);
+  float *output = static_cast<float *>(params[3]);
+  int size = GetSize(ndims[OUTPUT_INDEX], shapes[OUTPUT_INDEX]);
+
+  AotExtra *extra = static_cast<AotExtra *>(extra_void);
+  auto kernel_ptr = static_cast<FQPerLayerKernelAttr *>(extra->KernelData());
+  int num_bits = kernel_ptr->num_bits;
+  if (num_bits <= 2 || num_bits >= 16) {
+    return 3;
+  }
+  bool training = kernel_ptr->training;
+  bool symmetric = kernel_ptr->symmetric;
+  bool narrow_range = kernel_ptr->narrow_range;
+  int quant_delay = kernel_ptr->quant_delay;
+  if (quant_delay < 0) {
+    return 3;
+  }
+
+  float quant_min = 0;
+  float quant_max = (1 << num_bits) - 1;
+  if (narrow_range) {
+    quant_min++;
+  }
+
+  if (training && global_step++ < quant_delay) {
+    std::copy(input_data, input_data + size, output);
+    return 0;
+  }
+  float scale = 0.f;
+  float nudge_min = 0.f;
+  float nudge_max = 0.f;
+  NudgeMinMax(input_min[0], input_max[0], quant_min, quant_max, &nudge_min, &nudge_max, &scale, symmetric);
+  ParallelFor(size, 1, [&](int start, int end) {
+    FakeQuant(input_data + start, output + start, end - start, nudge_min, nudge_max, scale);
+  });
+  return 0;
+}
@@ -0,0 +1,108 @@
+/**
+ * Copyright 2023 Huawei Technologies Co., Ltd
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+
+#include "fake_quant_impl.h"
+
+class MUFQPerChannelKernelAttr : public AotKernelData {
+ public:
+  int num_bits;
+  bool ema;
+  float ema_decay;
+  bool symmetric;
+  bool narrow_range;
+  int quant_delay;
+};
+
+extern "C" int CustomMinMaxUpdateFakeQuantPerChannelInit(int *ndims, int64_t **shapes, const char **dtypes,
+                                                         AotExtra *extra) {
+  MUFQPerChannelKernelAttr *kernel_ptr = new MUFQPerChannelKernelAttr;
+  kernel_ptr->num_bits = static_cast<int>(extra->Attr<int64_t>("num_bits"));
+  kernel_ptr->ema = extra->Attr<bool>("ema");
+  kernel_ptr->ema_decay = extra->Attr<float>("ema_decay");
+  kernel_ptr->symmetric = extra->Attr<bool>("symmetric");
+  kernel_ptr->narrow_range = extra->Attr<bool>("narrow_range");
+  kernel_ptr->quant_delay = static_cast<int>(extra->Attr<int64_t>("quant_delay"));
+  extra->SetKernelData(kernel_ptr);
+
+  return 0;
+}
+
+int global_step = 0;
+
+extern "C" int CustomMinMaxUpdateFakeQuantPerChannel(int nparam, void **params, int *ndims, int64_t **shapes,
+                                                     const char **dtypes, void *stream, void *extra_void) {
+  constexpr int IO_NUM = 3 + 3;  // input 3, output 3
+  constexpr int INPUT_INDEX = 0;
+
+  int ret = CheckParams(nparam, IO_NUM, dtypes);
+  if (ret != 0) {
+    return ret;
+  }
+
+  float *input_data = static_cast<float *>(params[0]);
+  float *input_min = static_cast<float *>(params[1]);
+  float *input_max = static_cast<float *>(params[2]);
+  float *output = static_cast<float *>(params[3]);
+  float *output_min = static_cast<float *>(params[4]);
+  float *output_max = static_cast<float *>(params[5]);
+  int size = GetSize(ndims[INPUT_INDEX], shapes[INPUT_INDEX]);
+  int num_channels = static_cast<int>(shapes[0][0]);
+  int per_channel_num = size / num_channels;
+
+  AotExtra *extra = static_cast<AotExtra *>(extra_void);
+  auto kernel_ptr = static_cast<MUFQPerChannelKernelAttr *>(extra->KernelData());
+  int num_bits = kernel_ptr->num_bits;
+  if (num_bits <= 2 || num_bits >= 16) {
+    return 3;
+  }
+  bool ema = kernel_ptr->ema;
+  float ema_decay = kernel_ptr->ema_decay;
+  bool symmetric = kernel_ptr->symmetric;
+  bool narrow_range = kernel_ptr->narrow_range;
+  int quant_delay = kernel_ptr->quant_delay;
+  if (quant_delay < 0) {
+    return 3;
+  }
+
+  float quant_min = 0;
+  float quant_max = (1 << num_bits) - 1;
+  if (narrow_range) {
+    quant_min++;
+  }
+  bool delayed = global_step++ < quant_delay;
+
+  // every channel is reduced and then fake quantized right away while it is still in cache.
+  ParallelFor(num_channels, per_channel_num, [&](int start, int end) {
+    for (int i = start; i < end; i++) {
+      const float *channel_input = input_data + i * per_channel_num;
+      float *channel_output = output + i * per_channel_num;
+      auto minmax = std::minmax_element(channel_input, channel_input + per_channel_num);
+      UpdateMinMax(*minmax.first, *minmax.second, input_min[i], input_max[i], output_min + i, output_max + i, ema,
+                   ema_decay);
+      if (delayed) {
+        std::copy(channel_input, channel_input + per_channel_num, channel_output);
+        continue;
+      }
+      float scale = 0.f;
+      float nudge_min = 0.f;
+      float nudge_max = 0.f;
+      NudgeMinMax(output_min[i], output_max[i], quant_min, quant_max, &nudge_min, &nudge_max, &scale, symmetric);
+      FakeQuant(channel_input, channel_output, per_channel_num, nudge_min, nudge_max, scale);
+    }
+  });
+  return 0;
+}
@@ -0,0 +1,122 @@
+/**
+ * Copyright 2023 Huawei Technologies Co., Ltd
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+
+#include "fake_quant_impl.h"
+
+class MUFQPerLayerKernelAttr : public AotKernelData {
+ public:
+  int num_bits;
+  bool ema;
+  float ema_decay;
+  bool symmetric;
+  bool narrow_range;
+  int quant_delay;
+};
+
+extern "C" int CustomMinMaxUpdateFakeQuantPerLayerInit(int *ndims, int64_t **shapes, const char **dtypes,
+                                                       AotExtra *extra) {
+  MUFQPerLayerKernelAttr *kernel_ptr = new MUFQPerLayerKernelAttr;
+  kernel_ptr->num_bits = static_cast<int>(extra->Attr<int64_t>("num_bits"));
+  kernel_ptr->ema = extra->Attr<bool>("ema");
+  kernel_ptr->ema_decay = extra->Attr<float>("ema_decay");
+  kernel_ptr->symmetric = extra->Attr<bool>("symmetric");
+  kernel_ptr->narrow_range = extra->Attr<bool>("narrow_range");
+  kernel_ptr->quant_delay = static_cast<int>(extra->Attr<int64_t>("quant_delay"));
+  extra->SetKernelData(kernel_ptr);
+
+  return 0;
+}
+
+int global_step = 0;
+
+extern "C" int CustomMinMaxUpdateFakeQuantPerLayer(int nparam, void **params, int *ndims, int64_t **shapes,
+                                                   const char **dtypes, void *stream, void *extra_void) {
+  constexpr int IO_NUM = 3 + 3;  // input 3, output 3
+  constexpr int INPUT_INDEX = 0;
+
+  int ret = CheckParams(nparam, IO_NUM, dtypes);
+  if (ret != 0) {
+    return ret;
+  }
+
+  float *input_data = static_cast<float *>(params[0]);
+  float *input_min = static_cast<float *>(params[1]);
+  float *input_max = static_cast<float *>(params[2]);
+  float *output = static_cast<float *>(params[3]);
+  float *output_min = static_cast<float *>(params[4]);
+  float *output_max = static_cast<float *>(params[5]);
+  int size = GetSize(ndims[INPUT_INDEX], shapes[INPUT_INDEX]);
+
+  AotExtra *extra = static_cast<AotExtra *>(extra_void);
+  auto kernel_ptr = static_cast<MUFQPerLayerKernelAttr *>(extra->KernelData());
+  int num_bits = kernel_ptr->num_bits;
+  if (num_bits <= 2 || num_bits >= 16) {
+    return 3;
+  }
+  bool ema = kernel_ptr->ema;
+  float ema_decay = kernel_ptr->ema_decay;
+  bool symmetric = kernel_ptr->symmetric;
+  bool narrow_range = kernel_ptr->narrow_range;
+  int quant_delay = kernel_ptr->quant_delay;
+  if (quant_delay < 0) {
+    return 3;
+  }
+
+  float quant_min = 0;
+  float quant_max = (1 << num_bits) - 1;
+  if (narrow_range) {
+    quant_min++;
+  }
+  bool delayed = global_step++ < quant_delay;
+
+  // each thread reduces a contiguous block, waits for all partial results, and then fake quantizes the same block
+  // while it is still in cache, so data is read from memory once.
+  int thread_num = GetThreadNum(size, 1);
+  int block = (size + thread_num - 1) / thread_num;
+  std::vector<float> partial_min(thread_num, input_data[0]);
+  std::vector<float> partial_max(thread_num, input_data[0]);
+  Barrier barrier(thread_num);
+  ParallelRun(thread_num, [&](int index) {
+    int begin = std::min(index * block, size);
+    int end = std::min(begin + block, size);
+    if (begin < end) {
+      auto minmax = std::minmax_element(input_data + begin, input_data + end);
+      partial_min[index] = *minmax.first;
+      partial_max[index] = *minmax.second;
+    }
+    barrier.Wait();
+    float new_min = 0.f;
+    float new_max = 0.f;
+    UpdateMinMax(*std::min_element(partial_min.begin(), partial_min.end()),
+                 *std::max_element(partial_max.begin(), partial_max.end()), input_min[0], input_max[0], &new_min,
+                 &new_max, ema, ema_decay);
+    if (index == 0) {
+      output_min[0] = new_min;
+      output_max[0] = new_max;
+    }
+    if (delayed) {
+      std::copy(input_data + begin, input_data + end, output + begin);
+      return;
+    }
+    float scale = 0.f;
+    float nudge_min = 0.f;
+    float nudge_max = 0.f;
+    NudgeMinMax(new_min, new_max, quant_min, quant_max, &nudge_min, &nudge_max, &scale, symmetric);
+    FakeQuant(input_data + begin, output + begin, end - begin, nudge_min, nudge_max, scale);
+  });
+  return 0;
+}
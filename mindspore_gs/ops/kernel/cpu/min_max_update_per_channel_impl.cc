@@ -0,0 +1,74 @@
+/**
+ * Copyright 2023 Huawei Technologies Co., Ltd
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+
+#include "fake_quant_impl.h"
+
+class minmax_update_perchannel_kernel_attr : public AotKernelData {
+ public:
+  float ema_decay;
+  bool ema;
+};
+
+extern "C" int CustomMinMaxUpdatePerChannelInit(int *ndims, int64_t **shapes, const char **dtypes, AotExtra *extra) {
+  minmax_update_perchannel_kernel_attr *kernel_ptr = new minmax_update_perchannel_kernel_attr;
+  kernel_ptr->ema = extra->Attr<bool>("ema");
+  kernel_ptr->ema_decay = extra->Attr<float>("ema_decay");
+  extra->SetKernelData(kernel_ptr);
+
+  return 0;
+}
+
+extern "C" int CustomMinMaxUpdatePerChannel(int nparam, void **params, int *ndims, int64_t **shapes,
+                                            const char **dtypes, void *stream, void *extra_void) {
+  constexpr int IO_NUM = 3 + 2;  // input 3, output 2
+  constexpr int INPUT_INDEX = 0;
+
+  int ret = CheckParams(nparam, IO_NUM, dtypes);
+  if (ret != 0) {
+    return ret;
+  }
+
+  float *input_data = static_cast<float *>(params[0]);
+  float *input_min = static_cast<float *>(params[1]);
+  float *input_max = static_cast<float *>(params[2]);
+  float *output_min = static_cast<float *>(params[3]);
+  float *output_max = static_cast<float *>(params[4]);
+  int size = GetSize(ndims[INPUT_INDEX], shapes[INPUT_INDEX]);
+  int num_channels = static_cast<int>(shapes[0][0]);
+  int per_channel_num = size / num_channels;
+
+  AotExtra *extra = static_cast<AotExtra *>(extra_void);
+  auto kernel_ptr = static_cast<minmax_update_perchannel_kernel_attr *>(extra->KernelData());
+  float ema_decay = kernel_ptr->ema_decay;
+  bool ema = kernel_ptr->ema;
+
+  ParallelFor(num_channels, per_channel_num, [&](int start, int end) {
+    for (int i = start; i < end; i++) {
+      auto minmax = std::minmax_element(input_data + i * per_channel_num, input_data + (i + 1) * per_channel_num);
+      if (ema) {
+        output_min[i] = ema_decay * (*minmax.first) + (1 - ema_decay) * input_min[i];
+        output_max[i] = ema_decay * (*minmax.second) + (1 - ema_decay) * input_max[i];
+      } else {
+        output_min[i] = *minmax.first;
+        output_max[i] = *minmax.second;
+      }
+      output_min[i] = output_min[i] > 0 ? 0 : output_min[i];
+      output_max[i] = output_max[i] < 0 ? 0 : output_max[i];
+    }
+  });
+  return 0;
+}
@@ -0,0 +1,86 @@
+/**
+ * Copyright 2023 Huawei Technologies Co., Ltd
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+
+#include "fake_quant_impl.h"
+
+class minmax_update_perlayer_kernel_attr : public AotKernelData {
+ public:
+  float ema_decay;
+  bool ema;
+};
+
+extern "C" int CustomMinMaxUpdatePerLayerInit(int *ndims, int64_t **shapes, const char **dtypes, AotExtra *extra) {
+  minmax_update_perlayer_kernel_attr *kernel_ptr = new minmax_update_perlayer_kernel_attr;
+  kernel_ptr->ema = extra->Attr<bool>("ema");
+  kernel_ptr->ema_decay = extra->Attr<float>("ema_decay");
+  extra->SetKernelData(kernel_ptr);
+
+  return 0;
+}
+
+extern "C" int CustomMinMaxUpdatePerLayer(int nparam, void **params, int *ndims, int64_t **shapes, const char **dtypes,
+                                          void *stream, void *extra_void) {
+  constexpr int IO_NUM = 3 + 2;  // input 3, output 2
+  constexpr int INPUT_INDEX = 0;
+
+  int ret = CheckParams(nparam, IO_NUM, dtypes);
+  if (ret != 0) {
+    return ret;
+  }
+
+  float *input_data = static_cast<float *>(params[0]);
+  float *input_min = static_cast<float *>(params[1]);
+  float *input_max = static_cast<float *>(params[2]);
+  float *output_min = static_cast<float *>(params[3]);
+  float *output_max = static_cast<float *>(params[4]);
+  int size = GetSize(ndims[INPUT_INDEX], shapes[INPUT_INDEX]);
+
+  AotExtra *extra = static_cast<AotExtra *>(extra_void);
+  auto kernel_ptr = static_cast<minmax_update_perlayer_kernel_attr *>(extra->KernelData());
+  float ema_decay = kernel_ptr->ema_decay;
+  bool ema = kernel_ptr->ema;
+
+  // each thread reduces a contiguous range, then partial results are reduced.
+  int max_threads = std::max(static_cast<int>(std::thread::hardware_concurrency()), 1);
+  std::vector<float> partial_min(max_threads, input_data[0]);
+  std::vector<float> partial_max(max_threads, input_data[0]);
+  int block = (size + max_threads - 1) / max_threads;
+  ParallelFor(max_threads, block, [&](int start, int end) {
+    for (int i = start; i < end; i++) {
+      int begin = std::min(i * block, size);
+      int finish = std::min(begin + block, size);
+      if (begin < finish) {
+        auto minmax = std::minmax_element(input_data + begin, input_data + finish);
+        partial_min[i] = *minmax.first;
+        partial_max[i] = *minmax.second;
+      }
+    }
+  });
+  float minel = *std::min_element(partial_min.begin(), partial_min.end());
+  float maxel = *std::max_element(partial_max.begin(), partial_max.end());
+
+  if (ema) {
+    output_min[0] = ema_decay * minel + (1 - ema_decay) * input_min[0];
+    output_min[0] = output_min[0] > 0 ? 0 : output_min[0];
+    output_max[0] = ema_decay * maxel + (1 - ema_decay) * input_max[0];
+    output_max[0] = output_max[0] < 0 ? 0 : output_max[0];
+  } else {
+    output_min[0] = minel > 0 ? 0 : minel;
+    output_max[0] = maxel < 0 ? 0 : maxel;
+  }
+  return 0;
+}
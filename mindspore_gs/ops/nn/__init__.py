@@ -24,12 +24,14 @@ from .conv2d_bn_fold_quant_one_conv import Conv2dBnFoldQuantOneConv
 from .conv2d_quant import Conv2dQuant
 from .dense_quant import DenseQuant
 from .fake_quant_with_min_max_observer import FakeQuantWithMinMaxObserver
+from .histogram_observer import HistogramObserver
 from .mul_quant import MulQuant
 from .tensor_add_quant import TensorAddQuant
 
 
 __all__ = [
     'FakeQuantWithMinMaxObserver',
+    'HistogramObserver',
     'Conv2dBnFoldQuantOneConv',
     'Conv2dBnFoldQuant',
     'Conv2dBnWithoutFoldQuant',
@@ -49,6 +49,13 @@ class Conv2dBnFoldQuant(Cell):
     and Batch Normalization operation are used here, the purpose of the first convolution and Batch Normalization
     is to count the mean `E[y]` and variance `Var[y]` of current batch output for quantization.
 
+    If `single_conv` is True, the weight is folded with the moving variance :math:`Var_{mv}` first, and only one
+    convolution is executed. Its output is rescaled per channel by :math:`\sqrt{Var_{mv}+\epsilon}/\gamma` to recover
+    :math:`y`, from which `E[y]` and `Var[y]` are counted, so that the convolution FLOPs and activation memory of
+    training are halved. The recovered :math:`y` is computed from quantized weight, so statistics differ slightly
+    from the two convolution mode. :math:`|\gamma|` is clamped to at least :math:`\epsilon` in this mode so that the
+    rescaling is always defined.
+
     Args:
         in_channels (int): The number of input channel :math:`C_{in}`.
         out_channels (int): The number of output channel :math:`C_{out}`.
@@ -82,6 +89,8 @@ class Conv2dBnFoldQuant(Cell):
         quant_dtype (QuantDtype): Specifies the FakeQuant datatype. Default: QuantDtype.INT8.
         freeze_bn (int): The quantization freeze Batch Normalization op is according to the global step.
             Default: 100000.
+        single_conv (bool): Whether to count batch statistics from the output of the folded convolution instead of
+            running an extra convolution. Default: False.
 
     Inputs:
         - **x** (Tensor) - Tensor of shape :math:`(N, C_{in}, H_{in}, W_{in})`.
@@ -92,7 +101,7 @@ class Conv2dBnFoldQuant(Cell):
     Raises:
         TypeError: If `in_channels`, `out_channels` or `group` is not an int.
         TypeError: If `kernel_size`, `stride`, `padding` or `dilation` is neither an int nor a tuple.
-        TypeError: If `has_bias` or `fake` is not a bool.
+        TypeError: If `has_bias`, `fake` or `single_conv` is not a bool.
         ValueError: If `in_channels`, `out_channels`, `kernel_size`, `stride` or `dilation` is less than 1.
         ValueError: If `padding` is less than 0.
         ValueError: If `pad_mode` is not one of 'same', 'valid', 'pad'.
@@ -136,7 +145,8 @@ class Conv2dBnFoldQuant(Cell):
                  fake=True,
                  quant_config=quant_config_default,
                  quant_dtype=QuantDtype.INT8,
-                 freeze_bn=100000):
+                 freeze_bn=100000,
+                 single_conv=False):
         """Initialize Conv2dBnFoldQuant layer"""
         super(Conv2dBnFoldQuant, self).__init__()
         if context.get_context('device_target') == "CPU":
@@ -175,6 +185,7 @@ class Conv2dBnFoldQuant(Cell):
         self.fake = Validator.check_bool(fake, "fake", self.cls_name)
         self.quant_config = quant_config
         self.quant_dtype = quant_dtype
+        self.single_conv = Validator.check_bool(single_conv, "single_conv", self.cls_name)
         self.is_gpu = context.get_context('device_target') == "GPU"
 
         # initialize convolution op and Parameter
@@ -214,6 +225,13 @@ class Conv2dBnFoldQuant(Cell):
         self.step = Parameter(initializer('normal', [1], dtype=mstype.int32), name='step', requires_grad=False)
         self.one = Tensor(1, mstype.int32)
         self.assignadd = P.AssignAdd()
+        self.sqrt = P.Sqrt()
+        self.reshape = P.Reshape()
+        self.abs = P.Abs()
+        self.maximum = P.Maximum()
+        self.less = P.Less()
+        self.select = P.Select()
+        self.ones_like = P.OnesLike()
 
     @classmethod
     def from_convbn(cls, convbn: Conv2dBn, quant_config: QuantConfig, extra_args: dict):
@@ -235,7 +253,8 @@ class Conv2dBnFoldQuant(Cell):
                          weight_init=convbn.conv.weight_init,
                          quant_config=quant_config,
                          fake=True,
-                         freeze_bn=extra_args["freeze_bn"])
+                         freeze_bn=extra_args["freeze_bn"],
+                         single_conv=extra_args.get("single_conv", False))
         conv_quant.gamma = convbn.batchnorm.gamma
         conv_quant.beta = convbn.batchnorm.beta
         conv_quant.moving_mean = convbn.batchnorm.moving_mean
@@ -249,13 +268,40 @@ class Conv2dBnFoldQuant(Cell):
         """Display instance object as string."""
         s = 'in_channels={}, out_channels={}, kernel_size={}, stride={}, ' \
             'pad_mode={}, padding={}, dilation={}, group={}, ' \
-            'fake={}, freeze_bn={}, momentum={}'.format(self.in_channels, self.out_channels, self.kernel_size,
-                                                        self.stride, self.pad_mode, self.padding, self.dilation,
-                                                        self.group, self.fake, self.freeze_bn, self.momentum)
+            'fake={}, freeze_bn={}, momentum={}, single_conv={}'.format(self.in_channels, self.out_channels,
+                                                                        self.kernel_size, self.stride, self.pad_mode,
+                                                                        self.padding, self.dilation, self.group,
+                                                                        self.fake, self.freeze_bn, self.momentum,
+                                                                        self.single_conv)
         return s
 
-    def construct(self, x):
-        """construct."""
+    def _nonzero_gamma(self):
+        """Gamma whose absolute value is clamped to at least `eps` with its sign kept, 0 is taken as positive."""
+        ones = self.ones_like(self.gamma)
+        sign = self.select(self.less(self.gamma, 0.0), -ones, ones)
+        return sign * self.maximum(self.abs(self.gamma), self.eps)
+
+    def _single_conv_fold(self, x):
+        """Run the folded convolution once and count batch statistics from its output rescaled per channel."""
+        running_std = self.sqrt(self.moving_variance + self.eps)
+        # gamma is clamped away from 0, otherwise the folded scale can not be undone. The folded weight differs from
+        # the unclamped one only in channels whose gamma is less than `eps`, where the difference is less than `eps`.
+        gamma = self._nonzero_gamma()
+        weight = self.correct_mul(self.weight, gamma, running_std)
+        if self.fake:
+            weight = self.fake_quant_weight(weight)
+        out = self.conv(x, weight)
+        # undo the per-channel scale gamma / running_std folded into weight to recover the unfolded output
+        out_conv = out * self.reshape(running_std / gamma, (1, -1, 1, 1))
+        if self.has_bias:
+            out = self.bias_add(out, self.bias)
+            out_conv = self.bias_add(out_conv, self.bias)
+        batch_mean, batch_std, running_mean, _ = self.batchnorm_fold(out_conv, self.moving_mean,
+                                                                     self.moving_variance, self.step)
+        return out, batch_mean, batch_std, running_mean, running_std
+
+    def _two_conv_fold(self, x):
+        """Count batch statistics by an extra convolution with unfolded weight, then run the folded convolution."""
         out_conv = self.conv(x, self.weight)
         if self.has_bias:
             out_conv = self.bias_add(out_conv, self.bias)
@@ -271,6 +317,14 @@ class Conv2dBnFoldQuant(Cell):
         out = self.conv(x, weight)
         if self.has_bias:
             out = self.bias_add(out, self.bias)
+        return out, batch_mean, batch_std, running_mean, running_std
+
+    def construct(self, x):
+        """construct."""
+        if self.single_conv:
+            out, batch_mean, batch_std, running_mean, running_std = self._single_conv_fold(x)
+        else:
+            out, batch_mean, batch_std, running_mean, running_std = self._two_conv_fold(x)
         # BN fold2
         if self.is_gpu:
             if self.training:
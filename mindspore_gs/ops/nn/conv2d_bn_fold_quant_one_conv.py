@@ -24,9 +24,10 @@ from mindspore.nn.cell import Cell
 from mindspore_gs.validator import Validator, twice
 from ...quantization.simulated_quantization.combined import Conv2dBn
 from .fake_quant_with_min_max_observer import quant_config_default, QuantConfig
+from .eval_weight_cache import EvalWeightCache
 
 
-class Conv2dBnFoldQuantOneConv(Cell):
+class Conv2dBnFoldQuantOneConv(EvalWeightCache, Cell):
     r"""
     2D convolution which use the convolution layer statistics once to calculate Batch Normalization
     operation folded construct.
@@ -134,6 +135,7 @@ class Conv2dBnFoldQuantOneConv(Cell):
                  quant_dtype=QuantDtype.INT8):
         """Initialize Conv2dBnFoldQuant layer"""
         super(Conv2dBnFoldQuantOneConv, self).__init__()
+        self._init_eval_weight_cache()
         self.in_channels = Validator.check_positive_int(in_channels, "in_channels", self.cls_name)
         self.out_channels = Validator.check_positive_int(out_channels, "out_channels", self.cls_name)
         self.kernel_size = twice(kernel_size)
@@ -253,10 +255,8 @@ class Conv2dBnFoldQuantOneConv(Cell):
                                           self.momentum)
         return s
 
-    def construct(self, x):
-        """construct."""
-        running_std = P.Sqrt()(P.Add()(self.moving_variance, self.eps))
-        scale_factor = self.gamma / running_std
+    def _fold_weight(self, scale_factor):
+        """Fold `scale_factor` of BatchNorm into weight, then fake quantize it."""
         if self.channel_axis:
             scale_factor = self.reshape(scale_factor, (1, -1, 1, 1))
         else:
@@ -264,6 +264,20 @@ class Conv2dBnFoldQuantOneConv(Cell):
         weight = self.weight * scale_factor
         if self.fake:
             weight = self.fake_quant_weight(weight)
+        return weight
+
+    def _quant_weight(self):
+        """Weight folded with moving statistics of BatchNorm and fake quantized."""
+        return self._fold_weight(self.gamma / P.Sqrt()(P.Add()(self.moving_variance, self.eps)))
+
+    def construct(self, x):
+        """construct."""
+        running_std = P.Sqrt()(P.Add()(self.moving_variance, self.eps))
+        scale_factor = self.gamma / running_std
+        if self.cache_eval_weight and not self.training:
+            weight = self._cached_eval_weight()
+        else:
+            weight = self._fold_weight(scale_factor)
         conv = self.conv(x, weight)
 
         if self.freeze_bn:
@@ -23,9 +23,10 @@ from mindspore.nn.cell import Cell
 from mindspore_gs.validator import Validator, twice
 from ...quantization.simulated_quantization.combined import Conv2dBn
 from .fake_quant_with_min_max_observer import quant_config_default, QuantConfig
+from .eval_weight_cache import EvalWeightCache
 
 
-class Conv2dBnWithoutFoldQuant(Cell):
+class Conv2dBnWithoutFoldQuant(EvalWeightCache, Cell):
     r"""
     2D convolution and batchnorm without fold with fake quantized construct.
 
@@ -111,6 +112,7 @@ class Conv2dBnWithoutFoldQuant(Cell):
                  quant_config=quant_config_default):
         """Initialize Conv2dBnWithoutFoldQuant."""
         super(Conv2dBnWithoutFoldQuant, self).__init__()
+        self._init_eval_weight_cache()
         self.in_channels = Validator.check_positive_int(in_channels, "in_channels", self.cls_name)
         self.out_channels = Validator.check_positive_int(out_channels, "out_channels", self.cls_name)
         self.has_bias = has_bias
@@ -187,9 +189,16 @@ class Conv2dBnWithoutFoldQuant(Cell):
             conv_quant.bias = convbn.conv.bias
         return conv_quant
 
+    def _quant_weight(self):
+        """Fake quantized weight."""
+        return self.fake_quant_weight(self.weight)
+
     def construct(self, x):
         """construct."""
-        weight = self.fake_quant_weight(self.weight)
+        if self.cache_eval_weight and not self.training:
+            weight = self._cached_eval_weight()
+        else:
+            weight = self._quant_weight()
         out = self.conv(x, weight)
         if self.has_bias:
             out = self.bias_add(out, self.bias)
@@ -24,9 +24,10 @@ from mindspore.nn.layer.conv import Conv2d
 from mindspore_gs.validator import Validator, twice
 from ...quantization.simulated_quantization.combined import Conv2dBn
 from .fake_quant_with_min_max_observer import quant_config_default, QuantConfig
+from .eval_weight_cache import EvalWeightCache
 
 
-class Conv2dQuant(Cell):
+class Conv2dQuant(EvalWeightCache, Cell):
     r"""
     2D convolution with fake quantized operation layer.
 
@@ -103,6 +104,7 @@ class Conv2dQuant(Cell):
                  quant_dtype=QuantDtype.INT8):
         """Initialize Conv2dQuant."""
         super(Conv2dQuant, self).__init__()
+        self._init_eval_weight_cache()
         self.in_channels = Validator.check_positive_int(in_channels, "in_channels", self.cls_name)
         self.out_channels = Validator.check_positive_int(out_channels, "out_channels", self.cls_name)
         self.has_bias = has_bias
@@ -197,9 +199,16 @@ class Conv2dQuant(Cell):
             conv_quant.bias = convbn.conv.bias
         return conv_quant
 
+    def _quant_weight(self):
+        """Fake quantized weight."""
+        return self.fake_quant_weight(self.weight)
+
     def construct(self, x):
         """construct."""
-        weight = self.fake_quant_weight(self.weight)
+        if self.cache_eval_weight and not self.training:
+            weight = self._cached_eval_weight()
+        else:
+            weight = self._quant_weight()
         out = self.conv(x, weight)
         if self.has_bias:
             return self.bias_add(out, self.bias)
@@ -26,9 +26,10 @@ from mindspore.nn.cell import Cell
 from mindspore.nn.layer.basic import Dense
 from mindspore_gs.validator import Validator
 from .fake_quant_with_min_max_observer import quant_config_default, QuantConfig
+from .eval_weight_cache import EvalWeightCache
 
 
-class DenseQuant(Cell):
+class DenseQuant(EvalWeightCache, Cell):
     r"""
     The fully connected layer with fake quantized operation.
 
@@ -97,6 +98,7 @@ class DenseQuant(Cell):
                  quant_dtype=QuantDtype.INT8):
         """Initialize DenseQuant."""
         super(DenseQuant, self).__init__()
+        self._init_eval_weight_cache()
         self.in_channels = Validator.check_positive_int(in_channels, "in_channels", self.cls_name)
         self.out_channels = Validator.check_positive_int(out_channels, "out_channels", self.cls_name)
         self.has_bias = Validator.check_bool(has_bias, "has_bias", self.cls_name)
@@ -152,13 +154,20 @@ class DenseQuant(Cell):
             dense_quant.bias = dense.bias
         return dense_quant
 
+    def _quant_weight(self):
+        """Fake quantized weight."""
+        return self.fake_quant_weight(self.weight)
+
     def construct(self, x):
         """Use operators to construct the Dense layer.
 
         Args:
             x (Tensor): Input tensor.
         """
-        output = self.fake_quant_weight(self.weight)
+        if self.cache_eval_weight and not self.training:
+            output = self._cached_eval_weight()
+        else:
+            output = self._quant_weight()
         output = self.matmul(x, output)
         if self.has_bias:
             output = self.bias_add(output, self.bias)
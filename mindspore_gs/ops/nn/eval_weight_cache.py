@@ -0,0 +1,110 @@
+# Copyright 2023 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""EvalWeightCache."""
+from __future__ import absolute_import
+
+import numpy as np
+import mindspore
+from mindspore.ops import operations as P
+from mindspore.common.tensor import Tensor
+from mindspore.common.parameter import Parameter
+
+
+class EvalWeightCache:
+    """
+    Mixin of quant cells which caches the weight used in eval mode.
+
+    Weight, BatchNorm statistics and quantization ranges rarely change in eval mode, but quant cells fake quantize (and
+    fold) weight in every forward pass. After `enable_eval_weight_cache` is called, the weight used in eval mode is
+    computed when cell is set to eval mode by `set_train(False)`, and `construct` reads the cached weight until cell is
+    set to train mode. Parameters may still be changed in eval mode, for example loaded from a checkpoint by
+    `load_param_into_net`, so the cache also keeps a fingerprint of parameters of cell, which is the sum of each
+    parameter. Before every use of the cached weight, the fingerprint is computed again, which reads each parameter
+    once, and the cached weight is recomputed in graph if the fingerprint changes.
+
+    Cached weight and fingerprint are Parameters named after `self.weight` with suffix "_eval_cache" and
+    "_eval_fingerprint", which are not registered into parameters of cell, so they are neither trained nor saved into
+    checkpoint.
+
+    Subclass calls `_init_eval_weight_cache` in its constructor, implements `_quant_weight` which returns the weight
+    fed into convolution or matmul, and uses `self._cached_eval_weight()` when `self.cache_eval_weight` is True and
+    cell is not training.
+    """
+
+    def _init_eval_weight_cache(self):
+        self.cache_eval_weight = False
+        self.eval_weight = None
+        self.eval_weight_fingerprint = None
+        self._eval_weight_sources = ()
+
+    def _quant_weight(self):
+        """Compute weight fed into convolution or matmul, must be overridden by subclass."""
+        raise NotImplementedError
+
+    def _eval_weight_shape(self):
+        """Shape of weight fed into convolution or matmul, the same as `self.weight` by default."""
+        return self.weight.shape
+
+    def _eval_weight_name(self):
+        """Name of cached weight, derived from the name of `self.weight` so that it is unique in network."""
+        return self.weight.name + "_eval_cache"
+
+    def _eval_weight_fingerprint(self):
+        """Sum of each parameter which the cached weight is computed from."""
+        fingerprint = ()
+        for param in self._eval_weight_sources:
+            fingerprint += (P.Cast()(P.ReduceSum()(param), mindspore.float32),)
+        return P.Stack()(fingerprint)
+
+    def _cached_eval_weight(self):
+        """Cached weight, recomputed first if parameters of cell are changed since it is computed."""
+        fingerprint = self._eval_weight_fingerprint()
+        if P.ReduceAny()(P.NotEqual()(fingerprint, self.eval_weight_fingerprint)):
+            P.Assign()(self.eval_weight, self._quant_weight())
+            P.Assign()(self.eval_weight_fingerprint, fingerprint)
+        return self.eval_weight
+
+    def enable_eval_weight_cache(self):
+        """Enable caching of the weight used in eval mode."""
+        if self.eval_weight is None:
+            eval_weight = Parameter(Tensor(np.zeros(self._eval_weight_shape()), self.weight.dtype),
+                                    name=self._eval_weight_name(), requires_grad=False)
+            # cached weight is derived from other parameters, so it is not registered into the parameters of cell and
+            # is not saved into checkpoint. Graph still reads it as a free parameter of `construct`.
+            object.__setattr__(self, "eval_weight", eval_weight)
+            object.__setattr__(self, "_eval_weight_sources", tuple(self.get_parameters()))
+            # NaN never equals any fingerprint, so cached weight is computed at its first use if it is not refreshed.
+            fingerprint = Parameter(Tensor(np.full((len(self._eval_weight_sources),), np.nan), mindspore.float32),
+                                    name=self.weight.name + "_eval_fingerprint", requires_grad=False)
+            object.__setattr__(self, "eval_weight_fingerprint", fingerprint)
+        self.cache_eval_weight = True
+        if not self.training:
+            self.refresh_eval_weight()
+
+    def refresh_eval_weight(self):
+        """Recompute the cached weight and its fingerprint from current parameters."""
+        if self.eval_weight is not None:
+            # name of weight is prefixed when cell is inserted into network, keep name of cache in sync with it.
+            self.eval_weight.name = self._eval_weight_name()
+            self.eval_weight_fingerprint.name = self.weight.name + "_eval_fingerprint"
+            self.eval_weight.set_data(self._quant_weight())
+            self.eval_weight_fingerprint.set_data(self._eval_weight_fingerprint())
+
+    def add_flags_recursive(self, **flags):
+        """Recompute the cached weight after cell and its fake quantizers are set to eval mode."""
+        cell = super(EvalWeightCache, self).add_flags_recursive(**flags)
+        if getattr(self, "cache_eval_weight", False) and flags.get("training") is False:
+            self.refresh_eval_weight()
+        return cell
@@ -0,0 +1,278 @@
+# Copyright 2023 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""HistogramObserver."""
+from __future__ import absolute_import
+
+import numpy as np
+
+import mindspore
+from mindspore.common.parameter import Parameter
+from mindspore.common.tensor import Tensor
+from mindspore.common.dtype import QuantDtype
+from mindspore_gs.validator import Validator
+from mindspore_gs.ops.common.quant_op_utils import get_quant_dtype_num_bits
+from ...quantization.quant_utils import compute_kl_threshold_from_histogram
+from .fake_quant_with_min_max_observer import UniformQuantObserver
+
+
+class HistogramObserver(UniformQuantObserver):
+    r"""
+    Calibration observer which collects a fixed-size histogram of data passing through it, data is returned unchanged.
+
+    The histogram has `bins` uniform bins over range :math:`[-R, R]`, where :math:`R` is always a power of two. When
+    data out of range comes, :math:`R` is doubled until covering data, and every two adjacent bins are merged into
+    one bin of the new histogram exactly. So the memory is fixed no matter how much data is observed, and histograms
+    of different observers, for example observers of the same layer on different data shards or worker processes,
+    can be merged exactly by `merge`. Quantization range can be computed from histogram by `get_min_max`,
+    `get_percentile_min_max`, `get_kl_threshold` and `get_mse_threshold` without storing observed data.
+
+    Args:
+        bins (int): Number of bins of histogram, must be a multiple of 4. Default: 2048.
+        quant_dtype (QuantDtype): The datatype of quantization. Default: QuantDtype.INT8.
+        symmetric (bool): Whether the quantization algorithm is symmetric or not. Default: False.
+        narrow_range (bool): Whether the quantization algorithm uses narrow range or not. Default: False.
+
+    Inputs:
+        - **x** (Tensor) - The input of HistogramObserver.
+
+    Outputs:
+        Tensor, the same as `x`.
+
+    Raises:
+        TypeError: If `bins` is not an int.
+        ValueError: If `bins` is not a positive multiple of 4.
+
+    Supported Platforms:
+        ``Ascend`` ``GPU`` ``CPU``
+
+    Note:
+        Histogram is updated by numpy, so observer only works in PyNative mode.
+
+    Examples:
+        >>> import mindspore
+        >>> from mindspore import Tensor
+        >>> from mindspore_gs.ops.nn import HistogramObserver
+        >>> observer = HistogramObserver(bins=8)
+        >>> x = Tensor(np.array([[1, 2, 1], [-2, 0, -1]]), mindspore.float32)
+        >>> _ = observer(x)
+        >>> print(observer.histogram.asnumpy())
+        [0. 0. 1. 1. 1. 2. 1. 0.]
+        >>> print(observer.get_min_max())
+        (-2.0, 2.0)
+    """
+
+    def __init__(self, bins=2048, quant_dtype=QuantDtype.INT8, symmetric=False, narrow_range=False):
+        """Initialize HistogramObserver."""
+        super(HistogramObserver, self).__init__(quant_dtype=quant_dtype, per_channel=False, symmetric=symmetric,
+                                                narrow_range=narrow_range, num_channels=1)
+        Validator.check_is_int(bins, "bins", self.cls_name)
+        Validator.check_positive_int(bins, "bins", self.cls_name)
+        if bins % 4 != 0:
+            raise ValueError(f"For '{self.cls_name}', the 'bins' must be a multiple of 4, but got {bins}.")
+        self.bins = bins
+        self.num_bits = get_quant_dtype_num_bits(quant_dtype)
+        self.histogram = Parameter(Tensor(np.zeros(bins), mindspore.float64), name="histogram", requires_grad=False)
+        self.range_max = Parameter(Tensor(np.zeros(1), mindspore.float32), name="range_max", requires_grad=False)
+        self.float_min = Parameter(Tensor(np.zeros(1), mindspore.float32), name="float_min", requires_grad=False)
+        self.float_max = Parameter(Tensor(np.zeros(1), mindspore.float32), name="float_max", requires_grad=False)
+
+    @staticmethod
+    def _range_of(abs_max):
+        """The smallest power of two which is greater than `abs_max`."""
+        return float(np.ldexp(1.0, int(np.frexp(max(float(abs_max), np.finfo(np.float32).tiny))[1])))
+
+    @staticmethod
+    def _extend_histogram(hist, range_max, new_range_max):
+        """Double range of histogram until it reaches `new_range_max`, merging every two adjacent bins each time."""
+        bins = hist.shape[0]
+        # after log2(bins) times of doubling, all data has been merged into the two central bins.
+        for _ in range(bins.bit_length()):
+            if range_max >= new_range_max:
+                break
+            extended = np.zeros_like(hist)
+            extended[bins // 4: bins // 4 + bins // 2] = hist.reshape(-1, 2).sum(axis=1)
+            hist = extended
+            range_max *= 2
+        return hist
+
+    def _is_empty(self):
+        return float(self.range_max.asnumpy()[0]) == 0.0
+
+    def _set_state(self, hist, range_max, float_min, float_max):
+        self.histogram.set_data(Tensor(hist, mindspore.float64))
+        self.range_max.set_data(Tensor(np.array([range_max]), mindspore.float32))
+        self.float_min.set_data(Tensor(np.array([float_min]), mindspore.float32))
+        self.float_max.set_data(Tensor(np.array([float_max]), mindspore.float32))
+
+    def _merge_state(self, hist, range_max, float_min, float_max):
+        """Merge a histogram with its range into histogram of this observer."""
+        if self._is_empty():
+            self._set_state(hist, range_max, float_min, float_max)
+            return
+        cur_range_max = float(self.range_max.asnumpy()[0])
+        new_range_max = max(cur_range_max, range_max)
+        cur_hist = HistogramObserver._extend_histogram(self.histogram.asnumpy(), cur_range_max, new_range_max)
+        hist = HistogramObserver._extend_histogram(hist, range_max, new_range_max)
+        self._set_state(cur_hist + hist, new_range_max, min(float(self.float_min.asnumpy()[0]), float_min),
+                        max(float(self.float_max.asnumpy()[0]), float_max))
+
+    def update(self, x):
+        """
+        Update histogram with data `x`.
+
+        Args:
+            x (Union[Tensor, numpy.ndarray]): Data to be observed.
+        """
+        if isinstance(x, Tensor):
+            x = x.asnumpy()
+        x = np.asarray(x, dtype=np.float32).ravel()
+        if x.size == 0:
+            return
+        x_min, x_max = float(x.min()), float(x.max())
+        range_max = HistogramObserver._range_of(max(-x_min, x_max))
+        if not self._is_empty():
+            range_max = max(range_max, float(self.range_max.asnumpy()[0]))
+        hist, _ = np.histogram(x, bins=self.bins, range=(-range_max, range_max))
+        self._merge_state(hist.astype(np.float64), range_max, x_min, x_max)
+
+    def merge(self, other):
+        """
+        Merge histogram of `other` into this observer, as if data observed by `other` is observed by this observer.
+
+        Args:
+            other (HistogramObserver): Observer to be merged, which has the same number of bins as this observer.
+
+        Raises:
+            TypeError: If `other` is not a HistogramObserver.
+            ValueError: If `other` has different number of bins.
+        """
+        Validator.check_value_type("other", other, [HistogramObserver], self.cls_name)
+        if other.bins != self.bins:
+            raise ValueError(f"For '{self.cls_name}', only observers with the same number of bins can be merged, but "
+                             f"got {other.bins} and {self.bins}.")
+        if other._is_empty():
+            return
+        self._merge_state(other.histogram.asnumpy().copy(), float(other.range_max.asnumpy()[0]),
+                          float(other.float_min.asnumpy()[0]), float(other.float_max.asnumpy()[0]))
+
+    def _check_not_empty(self):
+        if self._is_empty():
+            raise RuntimeError(f"For '{self.cls_name}', no data is observed yet.")
+
+    def _bin_edges(self):
+        range_max = float(self.range_max.asnumpy()[0])
+        return np.linspace(-range_max, range_max, self.bins + 1)
+
+    def _abs_histogram(self):
+        """Fold histogram into histogram of absolute value of data, trailing empty bins are removed."""
+        hist = self.histogram.asnumpy()
+        half = self.bins // 2
+        abs_hist = hist[half:] + hist[:half][::-1]
+        nonzero = np.nonzero(abs_hist)[0]
+        num_bins = int(nonzero[-1]) + 1 if nonzero.size else 1
+        bin_width = float(self.range_max.asnumpy()[0]) / half
+        return abs_hist[:num_bins], np.arange(num_bins + 1) * bin_width
+
+    def get_min_max(self):
+        """
+        Get the minimum and maximum value of observed data.
+
+        Returns:
+            2-tuple of float, minimum and maximum value.
+
+        Raises:
+            RuntimeError: If no data is observed.
+        """
+        self._check_not_empty()
+        return float(self.float_min.asnumpy()[0]), float(self.float_max.asnumpy()[0])
+
+    def get_percentile_min_max(self, percentile=99.99):
+        """
+        Get the range which covers `percentile` percent of observed data, the same fraction of data is clipped on both
+        sides. Quantiles are interpolated linearly inside bins.
+
+        Args:
+            percentile (float): Percent of data to be covered, in range (0, 100]. Default: 99.99.
+
+        Returns:
+            2-tuple of float, minimum and maximum value.
+
+        Raises:
+            RuntimeError: If no data is observed.
+            ValueError: If `percentile` is not in range (0, 100].
+        """
+        Validator.check_value_type("percentile", percentile, [int, float], self.cls_name)
+        if not 0 < percentile <= 100:
+            raise ValueError(f"For '{self.cls_name}', the 'percentile' must be in range (0, 100], but got "
+                             f"{percentile}.")
+        self._check_not_empty()
+        float_min, float_max = self.get_min_max()
+        hist = self.histogram.asnumpy()
+        cdf = np.concatenate(([0.0], np.cumsum(hist))) / np.sum(hist)
+        tail = (100 - percentile) / 200
+        lower, upper = np.interp([tail, 1 - tail], cdf, self._bin_edges())
+        return float(np.clip(lower, float_min, float_max)), float(np.clip(upper, float_min, float_max))
+
+    def get_kl_threshold(self, chunk_size=64):
+        """
+        Get the clip threshold of absolute value of observed data by KL-J distance, see
+        `compute_kl_threshold_from_histogram`.
+
+        Args:
+            chunk_size (int): The maximum number of candidate thresholds evaluated together. Default: 64.
+
+        Returns:
+            Float, clip threshold.
+
+        Raises:
+            RuntimeError: If no data is observed.
+        """
+        self._check_not_empty()
+        abs_hist, bin_edges = self._abs_histogram()
+        return compute_kl_threshold_from_histogram(abs_hist, bin_edges, self.num_bits, chunk_size)
+
+    def get_mse_threshold(self):
+        """
+        Get the clip threshold of absolute value of observed data which minimizes the mean squared error of
+        symmetric quantization. Data in each bin is regarded as located at the center of bin, clipped data contributes
+        its squared clipping error, and unclipped data contributes rounding error :math:`scale^2 / 12`.
+
+        Returns:
+            Float, clip threshold.
+
+        Raises:
+            RuntimeError: If no data is observed.
+        """
+        self._check_not_empty()
+        abs_hist, bin_edges = self._abs_histogram()
+        centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+        candidates = bin_edges[1:]
+        quant_max = (1 << (self.num_bits - 1)) - 1
+        scale = candidates / max(quant_max, 1)
+        clip_error = np.maximum(centers[None, :] - candidates[:, None], 0) ** 2
+        clipped = centers[None, :] > candidates[:, None]
+        error = np.where(clipped, clip_error, (scale ** 2 / 12)[:, None]) @ abs_hist
+        return max(float(candidates[np.argmin(error)]), 1e-5)
+
+    def extend_repr(self):
+        """Display instance object as string."""
+        s = 'quant_dtype={}, symmetric={}, narrow_range={}, bins={}'.format(self.quant_dtype, self.symmetric,
+                                                                            self.narrow_range, self.bins)
+        return s
+
+    def construct(self, x):
+        """construct."""
+        self.update(x)
+        return x
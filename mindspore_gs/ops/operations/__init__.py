@@ -21,12 +21,16 @@ from .fake_quant_perchannel import FakeQuantPerChannel
 from .fake_quant_perlayer import FakeQuantPerLayer
 from .min_max_update_perchannel import MinMaxUpdatePerChannel
 from .min_max_update_perlayer import MinMaxUpdatePerLayer
+from .min_max_update_fake_quant_perchannel import MinMaxUpdateFakeQuantPerChannel
+from .min_max_update_fake_quant_perlayer import MinMaxUpdateFakeQuantPerLayer
 
 __all__ = [
     "MinMaxUpdatePerLayer",
     "FakeQuantPerLayer",
     "FakeQuantPerChannel",
     "MinMaxUpdatePerChannel",
+    "MinMaxUpdateFakeQuantPerLayer",
+    "MinMaxUpdateFakeQuantPerChannel",
     "GSCustom",
     "custom_op_attr_register"
 ]
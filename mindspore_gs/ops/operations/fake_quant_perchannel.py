@@ -71,7 +71,7 @@ class FakeQuantPerChannel(GSCustom):
                  training=True,
                  channel_axis=1):
         """Initialize FakeQuantPerChannel OP"""
-        support_device = ["GPU"]
+        support_device = ["GPU", "CPU"]
         self._check_support_device_target(support_device)
         if num_bits not in self.support_quant_bit:
             raise ValueError(
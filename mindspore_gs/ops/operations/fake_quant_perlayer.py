@@ -67,7 +67,7 @@ class FakeQuantPerLayer(GSCustom):
                  narrow_range=False,
                  training=True):
         """Initialize FakeQuantPerLayer OP"""
-        support_device = ["GPU"]
+        support_device = ["GPU", "CPU"]
         self._check_support_device_target(support_device)
         if num_bits not in self.support_quant_bit:
             raise ValueError(
@@ -34,7 +34,7 @@ class FakeQuantPerChannelGrad(GSCustom):
                  symmetric=False,
                  narrow_range=False):
         """Initialize FakeQuantPerChannelGrad OP"""
-        support_device = ["GPU"]
+        support_device = ["GPU", "CPU"]
         self._check_support_device_target(support_device)
         if num_bits not in self.support_quant_bit:
             raise ValueError(
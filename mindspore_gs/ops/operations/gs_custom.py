@@ -163,7 +163,7 @@ class GSCustom(Custom):
         >>> class FooOps(GSCustom):
         >>>    @custom_op_attr_register
         >>>    def __init__(self, attribute_one, attribute_two=1):
-        >>>        support_device = ["GPU"]
+        >>>        support_device = ["GPU", "CPU"]
         >>>        self._check_support_device_target(support_device)
         >>>    def _infer_shape(self, x):
         >>>        return x
@@ -245,20 +245,24 @@ class GSCustom(Custom):
 
     def _get_forward_func(self) -> str:
         """
-        Automatically generate farward func according to class name.
+        Automatically generate farward func according to class name and device target, cu file under 'kernel/gpu' is
+        used on GPU and cc file under 'kernel/cpu' is used on CPU.
 
         Returns:
             Farward func, a string represent '{dir_path}/{file_name}:{func_name}'.
         """
         dir_path = os.path.dirname(os.path.abspath(__file__))
-        cu_file_name = GSCustom._get_lower_name(self._get_custom_op_name()) + "_impl.cu"
-        logger.info(f"Custom op {self._get_custom_op_name()} cu_file_name {cu_file_name}")
+        device_target = context.get_context('device_target')
+        kernel_dir, kernel_suffix = ("../kernel/cpu", "_impl.cc") if device_target == "CPU" else \
+            ("../kernel/gpu", "_impl.cu")
+        kernel_file_name = GSCustom._get_lower_name(self._get_custom_op_name()) + kernel_suffix
+        logger.info(f"Custom op {self._get_custom_op_name()} kernel_file_name {kernel_file_name}")
         func_name = "Custom" + self._get_custom_op_name()
         logger.info(f"Custom op {self._get_custom_op_name()} func_name {func_name}")
-        func_path = os.path.join(dir_path, "../kernel/gpu", cu_file_name)
+        func_path = os.path.join(dir_path, kernel_dir, kernel_file_name)
         logger.info(f"Custom op {self._get_custom_op_name()} func_path {func_path}")
         if not os.path.exists(func_path):
-            error_str = f"For {self._get_custom_op_name()}, cu file not exist, the path is {func_path}"
+            error_str = f"For {self._get_custom_op_name()}, kernel file not exist, the path is {func_path}"
             logger.error(error_str)
             raise RuntimeError(error_str)
         return func_path + ":" + func_name
@@ -0,0 +1,130 @@
+# Copyright 2023 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+MindSpore golden stick simulated-quantization ops MinMaxUpdateFakeQuantPerChannel.
+"""
+from mindspore.ops import DataType
+from mindspore.ops.functional import zeros_like
+from mindspore_gs.validator import Rel
+from mindspore_gs.validator import Validator as validator
+from mindspore_gs.ops.operations import GSCustom, custom_op_attr_register
+from mindspore_gs.ops.operations.grad_operations import FakeQuantPerChannelGrad
+
+
+class MinMaxUpdateFakeQuantPerChannel(GSCustom):
+    r"""
+    Updates min and max per channel and simulates the quantize and dequantize operations with the updated range in
+    training time. It is the same as `MinMaxUpdatePerChannel` followed by `FakeQuantPerChannel`, but data is scanned
+    in one kernel, each channel is fake quantized right after its range is reduced, while it is still in cache.
+
+    Args:
+        num_bits (int) : Number bits to quantilization. Default: 8.
+        ema (bool): Uses EMA algorithm update tensor min and tensor max. Default: False.
+        ema_decay (int) : EMA algorithm decay parameter. Default: 0.999.
+        quant_delay (int): Quantilization delay parameter. Before delay step, min and max are updated but data is
+            not fake quantized. Default: 0.
+        symmetric (bool): Whether the quantization algorithm is symmetric or not. Default: False.
+        narrow_range (bool): Whether the quantization algorithm uses narrow range or not. Default: False.
+        channel_axis (int): Quantization by channel axis, only 0 is supported, the same as the CPU kernels of
+            `MinMaxUpdatePerChannel` and `FakeQuantPerChannel` which split channels along the first axis. Default: 0.
+
+    Inputs:
+        - **x** (Tensor) : float32 Tensor representing the shape of the output tensor.
+        - **min** (Tensor) : Value of the min range of each channel of the input data.
+        - **max** (Tensor) : Value of the max range of each channel of the input data.
+
+    Outputs:
+        - Tensor: Simulates quantize tensor of x.
+        - Tensor: Updated min range of each channel.
+        - Tensor: Updated max range of each channel.
+
+    Raises:
+        ValueError: If `channel_axis` is not 0.
+
+    Examples:
+        >>> import numpy as np
+        >>> from mindspore.common import dtype as mstype
+        >>> from mindspore import Tensor
+        >>> x = Tensor(np.random.rand(16, 3, 5, 5), mstype.float32)
+        >>> min_value = Tensor(np.random.uniform(-1, 0, size=16), mstype.float32)
+        >>> max_value = Tensor(np.random.uniform(0, 1, size=16), mstype.float32)
+        >>> output, new_min, new_max = MinMaxUpdateFakeQuantPerChannel()(x, min_value, max_value)
+    """
+    support_quant_bit = [4, 7, 8]
+
+    @custom_op_attr_register
+    def __init__(self,
+                 num_bits=8,
+                 ema=False,
+                 ema_decay=0.999,
+                 quant_delay=0,
+                 symmetric=False,
+                 narrow_range=False,
+                 channel_axis=0):
+        """Initialize MinMaxUpdateFakeQuantPerChannel OP"""
+        support_device = ["CPU"]
+        self._check_support_device_target(support_device)
+        if num_bits not in self.support_quant_bit:
+            raise ValueError(
+                f"For '{self._get_custom_op_name()}' Attr \'num_bits\' is not support.")
+        if ema and not ema_decay:
+            raise ValueError(
+                f"For '{self._get_custom_op_name()}' attr \'ema\' and \'ema_decay\' should set together.")
+        validator.check_value_type('ema', ema, (bool,), self._get_custom_op_name())
+        validator.check_value_type('symmetric', symmetric, (bool,), self._get_custom_op_name())
+        validator.check_value_type('narrow_range', narrow_range, (bool,), self._get_custom_op_name())
+        validator.check_float_range(ema_decay, 0, 1, Rel.INC_BOTH, 'ema_decay', self._get_custom_op_name())
+        validator.check_positive_int(num_bits, 'num_bits', self._get_custom_op_name())
+        validator.check_non_negative_int(quant_delay, 'quant_delay', self._get_custom_op_name())
+        validator.check_non_negative_int(channel_axis, 'channel_axis', self._get_custom_op_name())
+        if channel_axis != 0:
+            raise ValueError(f"For '{self._get_custom_op_name()}' attr \'channel_axis\' only supports 0, but got "
+                             f"{channel_axis}.")
+
+    def _infer_shape(self, x, x_min, x_max):
+        """infer_shape."""
+        return x, x_min, x_max
+
+    def _infer_dtype(self, x, x_min, x_max):
+        """infer_dtype."""
+        return x, x_min, x_max
+
+    def _get_op_bprop(self):
+        """Bprop func."""
+        fqperchannel_bprop = FakeQuantPerChannelGrad(
+            num_bits=self._get_custom_attr("num_bits"),
+            quant_delay=self._get_custom_attr("quant_delay"),
+            symmetric=self._get_custom_attr("symmetric"),
+            narrow_range=self._get_custom_attr("narrow_range")
+        )
+
+        def bprop(x, x_min, x_max, out, dout):
+            """Bprop func, gradient passes through data inside of the updated range of its channel."""
+            dx = fqperchannel_bprop(dout[0], x, out[1], out[2])
+            return dx, zeros_like(x_min), zeros_like(x_max)
+        return bprop
+
+    def _get_op_input_names(self) -> (str,):
+        """set_op_input_names"""
+        return "x", "min_val", "max_val"
+
+    def _get_op_output_names(self) -> (str,):
+        """set_op_output_names"""
+        return "y", "min_out", "max_out"
+
+    def _get_op_dtype_formats(self) -> [[DataType]]:
+        """set_op_dtype_format"""
+        return [[DataType.F32_Default, DataType.F32_Default, DataType.F32_Default, DataType.F32_Default,
+                 DataType.F32_Default, DataType.F32_Default]]
@@ -54,7 +54,7 @@ class MinMaxUpdatePerChannel(GSCustom):
     @custom_op_attr_register
     def __init__(self, ema=False, ema_decay=0.999, channel_axis=1):
         """Initialize FakeQuantPerChannelUpdate OP for Ascend"""
-        support_device = ["GPU"]
+        support_device = ["GPU", "CPU"]
         self._check_support_device_target(support_device)
         if ema and not ema_decay:
             raise ValueError(
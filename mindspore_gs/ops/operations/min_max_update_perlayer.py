@@ -52,7 +52,7 @@ class MinMaxUpdatePerLayer(GSCustom):
     @custom_op_attr_register
     def __init__(self, ema=False, ema_decay=0.999):
         """Initialize FakeQuantMinMaxPerLayerUpdate OP"""
-        support_device = ["GPU"]
+        support_device = ["GPU", "CPU"]
         self._check_support_device_target(support_device)
         if ema and not ema_decay:
             raise ValueError(
@@ -14,6 +14,7 @@
 # ============================================================================
 """ScopPruner."""
 
+import numpy as np
 import mindspore
 import mindspore.nn as nn
 import mindspore.ops as ops
@@ -232,6 +233,18 @@ class KfCallback(Callback):
         cb_params.train_dataset_element = cur_data
 
 
+class KnockoffBatchMap:
+    """
+    Dataset map operation which appends a knockoff copy to each batch, the same as `KfCallback` but in dataset
+    pipeline. Knockoff copy is the batch with samples shuffled by a random permutation, which is shared by all columns.
+    """
+
+    def __call__(self, *columns):
+        perm = np.random.permutation(columns[0].shape[0])
+        outputs = tuple(np.concatenate((column, column[perm]), axis=0) for column in columns)
+        return outputs[0] if len(outputs) == 1 else outputs
+
+
 class PrunerKfCompressAlgo(CompAlgo):
     """
     `PrunerKfCompressAlgo` is a subclass of CompAlgo, which implements the use of high imitation data to learn and
@@ -279,7 +292,9 @@ class PrunerKfCompressAlgo(CompAlgo):
         >>> kf_pruning = PrunerKfCompressAlgo({})
         >>> ## 3) Apply Konckoff-algorithm to origin network
         >>> net_pruning = kf_pruning.apply(net)
-        >>> ## 4) Print network and check the result. Conv2d and bn should be transformed to KfConv2d.
+        >>> ## 4) Generate knockoff data in dataset pipeline if training in dataset sink mode, optional
+        >>> ## dataset = kf_pruning.knockoff_dataset(dataset)
+        >>> ## 5) Print network and check the result. Conv2d and bn should be transformed to KfConv2d.
         >>> print(net_pruning)
         NetToPrune<
           (layer): Net<
@@ -297,18 +312,48 @@ class PrunerKfCompressAlgo(CompAlgo):
          >
     """
 
+    def __init__(self, config=None):
+        super(PrunerKfCompressAlgo, self).__init__(config)
+        self._knockoff_in_dataset = False
+
     def callbacks(self, *args, **kwargs):
         """
-        Define the callbacks for SCOP algorithm，the callback that generates konockoff data.
+        Define the callbacks for SCOP algorithm，the callback that generates konockoff data. The callback is not
+        needed if knockoff data is generated by dataset returned from `knockoff_dataset`.
 
         Returns:
             List of instance of SCOP Callbacks.
         """
         cb = []
-        cb.append(KfCallback())
+        if not self._knockoff_in_dataset:
+            cb.append(KfCallback())
         cb.extend(super(PrunerKfCompressAlgo, self).callbacks())
         return cb
 
+    def knockoff_dataset(self, dataset, input_columns=("image", "label"), num_parallel_workers=None):
+        """
+        Generate knockoff data in dataset pipeline instead of `KfCallback`. Each batch of `dataset` is appended with a
+        knockoff copy of it, so that knockoff data is prepared in parallel with training and training can run in
+        dataset sink mode. `callbacks` does not return `KfCallback` after this method is called.
+
+        Args:
+            dataset (Dataset): Batched training dataset.
+            input_columns (Union[tuple, list]): Names of columns fed into network, usually data and label. Default:
+                ("image", "label").
+            num_parallel_workers (int): Number of workers of map operation, None means using default setting of
+                dataset. Default: None.
+
+        Returns:
+            Dataset, whose batches are twice as large as batches of `dataset`.
+
+        Raises:
+            TypeError: If `input_columns` is not tuple or list.
+        """
+        Validator.check_value_type("input_columns", input_columns, [tuple, list], self.__class__.__name__)
+        self._knockoff_in_dataset = True
+        return dataset.map(operations=KnockoffBatchMap(), input_columns=list(input_columns),
+                           output_columns=list(input_columns), num_parallel_workers=num_parallel_workers)
+
     def _tranform(self, net):
         """Transform net."""
         module = net._cells
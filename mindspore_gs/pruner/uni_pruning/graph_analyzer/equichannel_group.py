@@ -14,6 +14,7 @@
 # ============================================================================
 """Class for model's equal channel group."""
 
+from collections import deque
 from .graph import Graph
 
 
@@ -30,7 +31,7 @@ induce_constraint_layers = ["Add"]  # "Mul", "Sub", "Pow", "Max", "Min", "Concat
 class EquichannelGroup:
     """Class for representing pruning group."""
 
-    def __init__(self, initial_layer, graph: Graph):
+    def __init__(self, initial_layer, graph: Graph, linear_search=False):
         self.__initial_layer = initial_layer
         self.__starts = {initial_layer}
         self.__middles = set()
@@ -38,7 +39,10 @@ class EquichannelGroup:
         self.__subgraph = set()
         self.__induce_layers = set()
         self.__conv_bn_pairs = []
-        self.__closure(graph.nodes)
+        if linear_search:
+            self.__linear_closure(graph)
+        else:
+            self.__closure(graph.nodes)
 
     def __repr__(self):
         return f"starts: {self.__starts}, \n" \
@@ -121,3 +125,26 @@ class EquichannelGroup:
     def __closure(self, nodes):
         """Get all paths from start layer."""
         self.__get_all_paths(self.__initial_layer, nodes)
+
+    def __linear_closure(self, graph: Graph):
+        """Visit each node reachable from start layer once by BFS, stop at prunable layers."""
+        nodes = graph.nodes
+        self.__subgraph.add(self.__initial_layer)
+        visited = {self.__initial_layer}
+        queue = deque([self.__initial_layer])
+        while queue:
+            node_id = queue.popleft()
+            outputs = nodes[node_id].outputs if node_id in nodes else graph.consumers(node_id)
+            for out in outputs:
+                if out in nodes:
+                    self.__subgraph.add(out)
+                    if nodes[out].op_type in prunable_layers:
+                        self.ms_ends.add(out)
+                        continue
+                    if nodes[out].op_type in affectable_layers:
+                        self.ms_middles.add(out)
+                    if nodes[out].op_type in induce_constraint_layers:
+                        self.induce_layers.add(out)
+                if out not in visited:
+                    visited.add(out)
+                    queue.append(out)
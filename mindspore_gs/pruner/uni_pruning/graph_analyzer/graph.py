@@ -75,9 +75,18 @@ class Node:
 
 
 class Graph:
-    """Represent graph with ordered nodes."""
+    """
+    Represent graph with ordered nodes.
+
+    Besides the `inputs` and `outputs` lists of each node, graph keeps reverse indexes from node name to names of
+    nodes which refer to it in their `inputs` (consumers) or `outputs` (producers). So removing, renaming and merging
+    nodes only visit their neighbours instead of all nodes of graph. The indexes may contain stale names, every
+    reference is checked against the lists of node before being modified.
+    """
     def __init__(self, mindir_graph: GraphProto):
         self._nodes = {}
+        self._consumers = {}
+        self._producers = {}
         self.__init_graph(mindir_graph)
 
     def __init_graph(self, mindir_graph: GraphProto):
@@ -91,32 +100,60 @@ class Graph:
                 if inp in self._nodes:
                     self._nodes[inp].outputs.append(node.name)
 
+        for node in self._nodes.values():
+            self.__index_node(node.name, node)
+
         # rename node with op_type+index to express the node more clearly
         for node in list(self._nodes.values()):
             new_name = f"{node.op_type}_{node.index}"
             self.rename_node(node, new_name)
 
+    def __index_node(self, name, node: Node):
+        """Add `node` named `name` into consumers and producers indexes."""
+        for inp in node.inputs:
+            self._consumers.setdefault(inp, set()).add(name)
+        for out in node.outputs:
+            self._producers.setdefault(out, set()).add(name)
+
+    def __referring_nodes(self, index, name, attr):
+        """Get nodes which have `name` in their `attr` list, according to `index`."""
+        result = []
+        for holder in index.get(name, ()):
+            node = self._nodes.get(holder)
+            if node is not None and name in getattr(node, attr):
+                result.append(node)
+        return result
+
+    def consumers(self, name):
+        """Return names of nodes which take `name` as input."""
+        return [node.name for node in self.__referring_nodes(self._consumers, name, "inputs")]
+
     def remove_node(self, node_to_remove: Node):
         """Remove node."""
-        for node in self.nodes.values():
-            if node_to_remove.name in node.inputs:
-                node.inputs.remove(node_to_remove.name)
-            if node_to_remove.name in node.outputs:
-                node.outputs.remove(node_to_remove.name)
-        del self.nodes[node_to_remove.name]
+        name = node_to_remove.name
+        for node in self.__referring_nodes(self._consumers, name, "inputs"):
+            node.inputs.remove(name)
+        for node in self.__referring_nodes(self._producers, name, "outputs"):
+            node.outputs.remove(name)
+        del self.nodes[name]
 
     def rename_node(self, cur_node: Node, new_name):
         """Rename node."""
+        old_name = cur_node.name
         # create an element with new name key to origin node
-        del self.nodes[cur_node.name]
+        del self.nodes[old_name]
         self.nodes[new_name] = cur_node
-        for node in self.nodes.values():
-            if cur_node.name in node.inputs:
-                node.inputs.remove(cur_node.name)
-                node.inputs.append(new_name)
-            if cur_node.name in node.outputs:
-                node.outputs.remove(cur_node.name)
-                node.outputs.append(new_name)
+        self.__index_node(new_name, cur_node)
+        consumers = self.__referring_nodes(self._consumers, old_name, "inputs")
+        producers = self.__referring_nodes(self._producers, old_name, "outputs")
+        for node in consumers:
+            node.inputs.remove(old_name)
+            node.inputs.append(new_name)
+        for node in producers:
+            node.outputs.remove(old_name)
+            node.outputs.append(new_name)
+        self._consumers.setdefault(new_name, set()).update(node.name for node in consumers)
+        self._producers.setdefault(new_name, set()).update(node.name for node in producers)
         self.nodes[new_name].name = new_name
 
     def merge_nodes(self, node: Node, node_to_merge: Node):
@@ -126,13 +163,17 @@ class Graph:
         for inp in node_to_merge.inputs:
             if (inp not in node.inputs) and (inp != node.name):
                 node.inputs.append(inp)
+                self._consumers.setdefault(inp, set()).add(node.name)
                 self.nodes[inp].outputs.remove(node_to_merge.name)
                 self.nodes[inp].outputs.append(node.name)
+                self._producers.setdefault(node.name, set()).add(inp)
         for out in node_to_merge.outputs:
             if out not in node.outputs:
                 node.outputs.append(out)
+                self._producers.setdefault(out, set()).add(node.name)
                 self.nodes[out].inputs.remove(node_to_merge.name)
                 self.nodes[out].inputs.append(node.name)
+                self._consumers.setdefault(node.name, set()).add(out)
         del self.nodes[node_to_merge.name]
 
     @property
@@ -33,11 +33,18 @@ class GraphAnalyzer:
     Args:
         net (Cell): network,
         *inputs: network's inputs
+        linear_search (bool): If True, find groups by a single BFS pass over the graph from each start layer and
+            merge groups sharing induce layers by disjoint set. If False, enumerate all paths from each start layer
+            and merge groups by pairwise comparison. Both return the same groups on networks like ResNet-50, but when
+            groups are chained through several shared induce layers, pairwise comparison may skip some of the merges,
+            so its groups can differ from the connected components returned by linear search. Default: True.
     """
 
-    def __init__(self, net, *inputs):
+    def __init__(self, net, *inputs, linear_search=True):
         Validator.check_value_type("net", net, [Cell])
+        Validator.check_bool(linear_search, "linear_search", self.__class__.__name__)
         self._net = net
+        self._linear_search = linear_search
         self._mindir = None
         self._inputs = inputs
         self._cells = {name: cell for name, cell in self._net.cells_and_names() if not cell.cells()}
@@ -109,6 +116,38 @@ class GraphAnalyzer:
                 else:
                     self._graph.rename_node(node, new_name)
 
+    @staticmethod
+    def __union_induce_layers(merge_groups):
+        """
+        Find components of groups connected by shared induce layers with disjoint set.
+
+        Components are ordered by their smallest group index, and each component starts with its smallest index.
+        """
+        parents = list(range(len(merge_groups)))
+
+        def find(idx):
+            root = idx
+            while parents[root] != root:
+                root = parents[root]
+            while parents[idx] != root:
+                parents[idx], idx = root, parents[idx]
+            return root
+
+        induce_owner = {}
+        for idx, group in enumerate(merge_groups):
+            for layer in group.induce_layers:
+                if layer not in induce_owner:
+                    induce_owner[layer] = idx
+                    continue
+                root1, root2 = find(idx), find(induce_owner[layer])
+                if root1 != root2:
+                    parents[max(root1, root2)] = min(root1, root2)
+
+        components = {}
+        for idx in range(len(merge_groups)):
+            components.setdefault(find(idx), []).append(idx)
+        return list(components.values())
+
     def __split_groups(self):
         """Separate layer groups."""
         def get_all_connected_groups(merge_group_idx):
@@ -134,7 +173,7 @@ class GraphAnalyzer:
         merge_groups = []
         for inp in self.mindir.graph.input:
             name = inp.name.replace(self.mindir.graph.name + ":", "")
-            group = EquichannelGroup(name, self._graph)
+            group = EquichannelGroup(name, self._graph, self._linear_search)
             if group.induce_layers:
                 merge_groups.append(group)
             else:
@@ -142,22 +181,24 @@ class GraphAnalyzer:
 
         for node in self._graph.nodes.values():
             if node.op_type in prunable_layers:
-                group = EquichannelGroup(node.name, self._graph)
+                group = EquichannelGroup(node.name, self._graph, self._linear_search)
                 if group.induce_layers:
                     merge_groups.append(group)
                 else:
                     groups.append(group)
 
-        merge_group_idx = {}
-        for i, gr1 in enumerate(merge_groups):
-            merge_group_idx[i] = set()
-            for j, gr2 in enumerate(merge_groups):
-                if i == j:
-                    continue
-                if set(gr1.induce_layers) & set(gr2.induce_layers):
-                    merge_group_idx[i].add(j)
-
-        connected_groups = get_all_connected_groups(merge_group_idx)
+        if self._linear_search:
+            connected_groups = self.__union_induce_layers(merge_groups)
+        else:
+            merge_group_idx = {}
+            for i, gr1 in enumerate(merge_groups):
+                merge_group_idx[i] = set()
+                for j, gr2 in enumerate(merge_groups):
+                    if i == j:
+                        continue
+                    if set(gr1.induce_layers) & set(gr2.induce_layers):
+                        merge_group_idx[i].add(j)
+            connected_groups = get_all_connected_groups(merge_group_idx)
         for component in connected_groups:
             group = merge_groups[component.pop(0)]
             for grp in component:
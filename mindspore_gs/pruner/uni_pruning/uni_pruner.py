@@ -27,9 +27,8 @@ from mindspore.train.callback import Callback
 from mindspore_gs.validator import Validator
 from ...comp_algo import CompAlgo
 from .graph_analyzer import GraphAnalyzer
-from .utils import do_mask, get_channel_importances, get_mask, prune_net, save_model_and_mask
-from .unipruning_masked_layer import UniPruningMaskedConv2d, UniPruningMaskedDense
-from ..ops import MaskedCell
+from .utils import get_channel_importances, MaskSearcher, PruningExecutor, save_model_and_mask, AsyncExporter
+from .unipruning_masked_layer import UniPruningMaskedConv2d, UniPruningMaskedDense, prune_network
 
 
 class UniPrunerCallback(Callback):
@@ -48,12 +47,13 @@ class UniPrunerCallback(Callback):
         TypeError: If `filter_lower_threshold` is not int.
         TypeError: If `device_target` is not string.
         TypeError: If `rank` is not int.
+        TypeError: If `async_export` is not bool.
     """
 
     def __init__(self, exp_name, output_path, input_size,
                  prune_flag, frequency, target_sparsity,
                  pruning_step, filter_lower_threshold,
-                 device_target: GraphAnalyzer, rank):
+                 device_target: GraphAnalyzer, rank, async_export=False):
         super().__init__()
         Validator.check_value_type("exp_name", exp_name, [str], self.__class__.__name__)
         Validator.check_value_type("output_path", output_path, [str], self.__class__.__name__)
@@ -65,6 +65,7 @@ class UniPrunerCallback(Callback):
         Validator.check_value_type("filter_lower_threshold", filter_lower_threshold, [int], self.__class__.__name__)
         Validator.check_value_type("device_target", device_target, [str], self.__class__.__name__)
         Validator.check_value_type("rank", rank, [int], self.__class__.__name__)
+        Validator.check_bool(async_export, "async_export", self.__class__.__name__)
         self.exp_name = exp_name
         self.output_path = os.path.join(output_path, exp_name)
         self.input_size = input_size
@@ -74,9 +75,11 @@ class UniPrunerCallback(Callback):
         self.filter_lower_threshold = filter_lower_threshold
         self.mask = {}
         self.graph_anaylzer = None
+        self._pruning_executor = None
         self.prune_flag = prune_flag
         self.rank = rank
         self.device_target = device_target
+        self._exporter = AsyncExporter() if async_export else None
         if device_target == 'Ascend':
             self.save_model = True
         else:
@@ -103,6 +106,13 @@ class UniPrunerCallback(Callback):
             logger.info('Final UniZeroing step rank', self.rank)
             self.uni_zeroing(run_context)
 
+    def _get_pruning_executor(self):
+        """Get executor of groups of `graph_anaylzer`, which is created once for the same groups."""
+        groups = self.graph_anaylzer.groups
+        if self._pruning_executor is None or self._pruning_executor.groups is not groups:
+            self._pruning_executor = PruningExecutor(groups)
+        return self._pruning_executor
+
     def uni_zeroing(self, run_context):
         """
         UniZeroing step, consisting of:
@@ -117,18 +127,37 @@ class UniPrunerCallback(Callback):
         """
         # compute channel importances and get pruning mask
         norms = get_channel_importances(self.graph_anaylzer.groups, self.filter_lower_threshold)
-        self.mask = get_mask(self.graph_anaylzer.groups, norms, self.pruning_step,
-                             self.filter_lower_threshold, self._target_sparsity)
+        self.mask = MaskSearcher(self.graph_anaylzer.groups, norms, self.pruning_step,
+                                 self.filter_lower_threshold, self._target_sparsity).search()
         # apply pruning mask -> zero model
-        do_mask(self.graph_anaylzer.groups, self.mask)
+        self._get_pruning_executor().zero(self.mask)
         origin_args = run_context.original_args()
         net: Cell = origin_args.network
         cur_epoch_num = origin_args.cur_epoch_num
-        save_model_and_mask(net, self.output_path, f'{self.exp_name}_zeroed_rank{self.rank}',
-                            cur_epoch_num, self.input_size, self.device_target, self.save_model,
-                            self.mask)
+        save = save_model_and_mask if self._exporter is None else self._exporter.submit
+        save(net, self.output_path, f'{self.exp_name}_zeroed_rank{self.rank}', cur_epoch_num, self.input_size,
+             self.device_target, self.save_model, self.mask)
         logger.info(f'UniZeroing ended rank{self.rank}')
 
+    def end(self, run_context):
+        """Wait for background saves and export deferred models when training ends."""
+        if self._exporter is None:
+            return
+        self._exporter.flush(run_context.original_args().network)
+        stats = self._exporter.get_stats()
+        logger.info(f"UniPruning export rank{self.rank}: {stats['blocked_time']:.3f}s blocked training, "
+                    f"{stats['overlapped_time']:.3f}s overlapped with training.")
+
+    def get_export_stats(self):
+        """
+        Get time spent by training blocked on saving checkpoints and masks, and time of saving overlapped with
+        training. Only available when `async_export` is True.
+
+        Returns:
+            dict, with keys 'blocked_time' and 'overlapped_time' in seconds, None if `async_export` is False.
+        """
+        return None if self._exporter is None else self._exporter.get_stats()
+
 
 class UniPruner(CompAlgo):
     """
@@ -155,6 +184,8 @@ class UniPruner(CompAlgo):
               Default: 0
             - device_target: Device on which experiment is performed (Ascend, GPU).
               Default: Ascend
+            - async_export (bool): Whether to save checkpoints and masks in a background thread during training.
+              Models are then exported into .MINDIR and .AIR when training ends. Default: False
 
     Raises:
         TypeError: If `config` is not dict.
@@ -210,7 +241,8 @@ class UniPruner(CompAlgo):
                                            filter_lower_threshold=config["filter_lower_threshold"],
                                            prune_flag=config["prune_flag"],
                                            rank=config["rank"],
-                                           device_target=config["device_target"])
+                                           device_target=config["device_target"],
+                                           async_export=config.get("async_export", False))
         self.graph_anaylzer = None
 
     def apply(self, network: Cell) -> Cell:
@@ -283,7 +315,7 @@ class UniPruner(CompAlgo):
             Validator.check_value_type("mask", mask, [dict], self.__class__.__name__)
         Validator.check_value_type("tag", tag, [str], self.__class__.__name__)
         if mask is not None:
-            prune_net(self.graph_anaylzer.groups, mask)
+            PruningExecutor(self.graph_anaylzer.groups).prune(mask)
         save_model_and_mask(net, self._callback.output_path, f'{args.exp_name}_{tag}_{self._callback.rank}',
                             args.epoch_size, self._callback.input_size, args.device_target,
                             export_air=True)
@@ -304,11 +336,7 @@ class UniPruner(CompAlgo):
             else:
                 raise ValueError(
                     f'The parameter `ckpt_path` can only be empty or a valid file, but got {real_path}.')
-        for name, layer in net_opt.cells_and_names():
-            if not isinstance(layer, MaskedCell):
-                continue
-            net_opt.insert_child_to_cell(name, layer.prune())
-        return net_opt
+        return prune_network(net_opt)
 
     def callbacks(self, *args, **kwargs) -> [Callback]:
         """get UniPruner callback"""
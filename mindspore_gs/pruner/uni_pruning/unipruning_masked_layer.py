@@ -19,30 +19,74 @@ from mindspore import nn, Tensor
 from ..ops import MaskedConv2d, MaskedDense
 
 
-def _prune_coci_weight(in_mask: np.array, out_mask: np.array, weight: np.array, cout, cin) -> np.array:
-    """
-    Prune weight in format [COut, CIn, ...] with in_mask and out_mask.
-    """
-    for co in range(cout - 1, -1, -1):
-        if out_mask[co] == 1:
-            continue
-        weight = np.delete(weight, co, axis=0)
-    for ci in range(cin - 1, -1, -1):
-        if in_mask[ci] == 1:
-            continue
-        weight = np.delete(weight, ci, axis=1)
+def _zero_coci_weight(in_mask: np.array, out_mask: np.array, weight: np.array) -> np.array:
+    """
+    Zero weight in format [COut, CIn, ...] with in_mask and out_mask in place.
+    """
+    weight[np.flatnonzero(out_mask != 1)] = 0
+    weight[:, np.flatnonzero(in_mask != 1)] = 0
     return weight
 
 
-def _prune_bias(out_mask: np.array, bias: np.array, cout) -> np.array:
+def _prune_coci_weight(in_mask: np.array, out_mask: np.array, weight: np.array) -> np.array:
+    """
+    Prune weight in format [COut, CIn, ...] with in_mask and out_mask, by one gather on each axis.
+    """
+    weight = np.take(weight, np.flatnonzero(out_mask == 1), axis=0)
+    return np.take(weight, np.flatnonzero(in_mask == 1), axis=1)
+
+
+def _prune_bias(out_mask: np.array, bias: np.array) -> np.array:
     """
     Prune bias with out_mask.
     """
-    for co in range(cout - 1, -1, -1):
-        if out_mask[co] == 1:
-            continue
-        bias = np.delete(bias, co, axis=0)
-    return bias
+    return bias[np.flatnonzero(out_mask == 1)]
+
+
+def _zeroing_updates(masked_cell) -> list:
+    """
+    Zeroed parameters of handler of `masked_cell`, as a list of (parameter, new value).
+    """
+    in_mask = masked_cell.in_mask.asnumpy()
+    out_mask = masked_cell.out_mask.asnumpy()
+    handler = masked_cell.handler
+    updates = [(handler.weight, _zero_coci_weight(in_mask, out_mask, handler.weight.asnumpy()))]
+    if handler.has_bias:
+        bias = handler.bias.asnumpy()
+        bias[np.flatnonzero(out_mask != 1)] = 0
+        updates.append((handler.bias, bias))
+    return updates
+
+
+def _pruning_updates(masked_cell) -> list:
+    """
+    Pruned parameters of handler of `masked_cell`, as a list of (parameter, new value).
+    """
+    in_mask = masked_cell.in_mask.asnumpy()
+    out_mask = masked_cell.out_mask.asnumpy()
+    handler = masked_cell.handler
+    updates = [(handler.weight, _prune_coci_weight(in_mask, out_mask, handler.weight.asnumpy()))]
+    if handler.has_bias:
+        updates.append((handler.bias, _prune_bias(out_mask, handler.bias.asnumpy())))
+    return updates
+
+
+def _sync_parameters(updates: list):
+    """
+    Write all new values back into their parameters.
+    """
+    for param, value in updates:
+        param.init_flag = False
+        param.init = None
+        param.assign_value(Tensor(value))
+
+
+def _update_channels(handler: nn.Cell):
+    """
+    Update in_channels and out_channels of `handler` according to its pruned weight.
+    """
+    handler.out_channels = handler.weight.shape[0]
+    handler.in_channels = handler.weight.shape[1]
 
 
 class UniPruningMaskedConv2d(MaskedConv2d):
@@ -59,54 +103,15 @@ class UniPruningMaskedConv2d(MaskedConv2d):
 
     def zeroing(self):
         """ Zero cout and cin dimension of weight according to mask. """
-        in_mask = self.in_mask.asnumpy()
-        out_mask = self.out_mask.asnumpy()
-        conv2d: nn.Conv2d = self.handler
-        weight = conv2d.weight.asnumpy()
         # kernel of Conv2d in MindSpore is in [COut, CIn, KH, KW]
-        for co in range(0, conv2d.out_channels):
-            if out_mask[co] == 1:
-                continue
-            weight[co, :, :, :] *= 0
-        for co in range(0, conv2d.out_channels):
-            for ci in range(0, conv2d.in_channels):
-                if in_mask[ci] == 1:
-                    continue
-                weight[co, ci, :, :] *= 0
-        conv2d.weight.init_flag = False
-        conv2d.weight.init = None
-        conv2d.weight.assign_value(Tensor(weight))
-        if not conv2d.has_bias:
-            return
-        bias = conv2d.bias
-        for co in range(0, conv2d.out_channels):
-            if out_mask[co] == 1:
-                continue
-            bias[co] = 0
-        conv2d.bias.init_flag = False
-        conv2d.bias.init = None
-        conv2d.bias.assign_value(Tensor(bias))
+        _sync_parameters(_zeroing_updates(self))
 
     def prune(self) -> nn.Cell:
         """ Erase cout and cin dimension of weight according to mask. """
-        in_mask = self.in_mask.asnumpy()
-        out_mask = self.out_mask.asnumpy()
-        conv2d: nn.Conv2d = self.handler
-        weight = conv2d.weight.asnumpy()
         # kernel of Conv2d in MindSpore is in [COut, CIn, KH, KW]
-        new_weight = _prune_coci_weight(in_mask, out_mask, weight, conv2d.out_channels, conv2d.in_channels)
-        conv2d.weight.init_flag = False
-        conv2d.weight.init = None
-        conv2d.weight.assign_value(Tensor(new_weight))
-        if conv2d.has_bias:
-            bias = conv2d.bias.asnumpy()
-            new_bias = _prune_bias(out_mask, bias, conv2d.out_channels)
-            conv2d.bias.init_flag = False
-            conv2d.bias.init = None
-            conv2d.bias.assign_value(Tensor(new_bias))
-        conv2d.out_channels = conv2d.weight.shape[0]
-        conv2d.in_channels = conv2d.weight.shape[1]
-        return conv2d
+        _sync_parameters(_pruning_updates(self))
+        _update_channels(self.handler)
+        return self.handler
 
 
 class UniPruningMaskedDense(MaskedDense):
@@ -123,51 +128,59 @@ class UniPruningMaskedDense(MaskedDense):
 
     def zeroing(self):
         """ Zero cout and cin dimension of weight according to mask. """
-        in_mask = self.in_mask.asnumpy()
-        out_mask = self.out_mask.asnumpy()
-        dense: nn.Dense = self.handler
-        weight = dense.weight.asnumpy()
         # kernel of Dense in MindSpore is in [COut, CIn]
-        for co in range(0, dense.out_channels):
-            if out_mask[co] == 1:
-                continue
-            weight[co, :] *= 0
-        for co in range(0, dense.out_channels):
-            for ci in range(0, dense.in_channels):
-                if in_mask[ci] == 1:
-                    continue
-                weight[co, ci] = 0
-        dense.weight.init_flag = False
-        dense.weight.init = None
-        dense.weight.assign_value(Tensor(weight))
-        if not dense.has_bias:
-            return
-        bias = dense.bias
-        for co in range(0, dense.out_channels):
-            if out_mask[co] == 1:
-                continue
-            bias[co] = 0
-        dense.bias.init_flag = False
-        dense.bias.init = None
-        dense.bias.assign_value(Tensor(bias))
+        _sync_parameters(_zeroing_updates(self))
 
     def prune(self) -> nn.Cell:
         """ Erase cout and cin dimension of weight according to mask. """
-        in_mask = self.in_mask.asnumpy()
-        out_mask = self.out_mask.asnumpy()
-        dense: nn.Dense = self.handler
-        weight = dense.weight.asnumpy()
         # kernel of Dense in MindSpore is in [COut, CIn]
-        new_weight = _prune_coci_weight(in_mask, out_mask, weight, dense.out_channels, dense.in_channels)
-        dense.weight.init_flag = False
-        dense.weight.init = None
-        dense.weight.assign_value(Tensor(new_weight))
-        if dense.has_bias:
-            bias = dense.bias.asnumpy()
-            new_bias = _prune_bias(out_mask, bias, dense.out_channels)
-            dense.bias.init_flag = False
-            dense.bias.init = None
-            dense.bias.assign_value(Tensor(new_bias))
-        dense.out_channels = dense.weight.shape[0]
-        dense.in_channels = dense.weight.shape[1]
-        return dense
+        _sync_parameters(_pruning_updates(self))
+        _update_channels(self.handler)
+        return self.handler
+
+
+def _masked_cells(network: nn.Cell) -> list:
+    """All UniPruning masked cells in `network` with their names."""
+    return [(name, cell) for name, cell in network.cells_and_names()
+            if isinstance(cell, (UniPruningMaskedConv2d, UniPruningMaskedDense))]
+
+
+def zeroing_network(network: nn.Cell) -> nn.Cell:
+    """
+    Zero cout and cin dimension of weights of all masked cells in `network` according to their masks. New values of
+    all affected parameters are computed first, and then written back in one pass.
+
+    Args:
+        network (Cell): Network with UniPruning masked cells.
+
+    Returns:
+        Cell, `network` with zeroed weights.
+    """
+    updates = []
+    for _, cell in _masked_cells(network):
+        updates.extend(_zeroing_updates(cell))
+    _sync_parameters(updates)
+    return network
+
+
+def prune_network(network: nn.Cell) -> nn.Cell:
+    """
+    Erase cout and cin dimension of weights of all masked cells in `network` according to their masks, and replace
+    each masked cell by its pruned handler. New values of all affected parameters are computed first, and then written
+    back in one pass.
+
+    Args:
+        network (Cell): Network with UniPruning masked cells.
+
+    Returns:
+        Cell, pruned `network`.
+    """
+    masked_cells = _masked_cells(network)
+    updates = []
+    for _, cell in masked_cells:
+        updates.extend(_pruning_updates(cell))
+    _sync_parameters(updates)
+    for name, cell in masked_cells:
+        _update_channels(cell.handler)
+        network.insert_child_to_cell(name, cell.handler)
+    return network
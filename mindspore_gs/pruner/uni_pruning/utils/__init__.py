@@ -17,22 +17,31 @@
 
 from .model_utils import (
     get_model_size,
+    get_start_layer_size,
+    get_middle_layer_size,
     get_layer_type,
+    export_model,
+    save_mask,
     save_model_and_mask,
+    AsyncExporter,
     load_model,
     find_ms_cell
 )
 from .importance_criteria import (
     get_medians,
+    get_layer_medians,
+    get_candidate_num,
     get_channel_importances,
     choose_channel_group_to_zero
 )
 from .mask import (
     get_mask,
-    get_expanded_mask,
-    do_mask
+    get_expanded_mask
 )
+from .mask_search import MaskSearcher
 from .prune import (
     update_channel_out,
+    PruningExecutor,
+    do_mask,
     prune_net
 )
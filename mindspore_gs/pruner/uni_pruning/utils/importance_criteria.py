@@ -26,14 +26,26 @@ def get_medians(norms, step):
         medians.append(OrderedDict.fromkeys(norm_group.keys()))
         for key in norm_group.keys():
             filter_norms, norms_idx = norm_group[key][0], norm_group[key][1]
-            for i in range(0, len(norms_idx) - 1, step):
-                median = np.median(filter_norms[norms_idx[i:i+step]])
-                if i == 0:
-                    medians[idx][key] = [median]
-                else:
-                    medians[idx][key].append(median)
+            medians[idx][key] = get_layer_medians(filter_norms, norms_idx, step)
     return medians
 
+def get_layer_medians(filter_norms, norms_idx, step):
+    """
+    Count medians of each channel group of a single layer.
+    """
+    return [np.median(filter_norms[norms_idx[i:i+step]]) for i in range(0, len(norms_idx) - 1, step)]
+
+def get_candidate_num(length, step, filter_num_threshold):
+    """
+    Count the number of channel groups of a layer which are allowed to be zeroed.
+    """
+    cnt = 0
+    for i in range(length - 1):
+        cnt += step
+        if length * step - cnt <= filter_num_threshold:
+            return i + 1
+    return max(length - 1, 0)
+
 def get_channel_importances(groups, filter_num_thr):
     """
     For each layer count 2 arrays: one with channel importances, second with sorted channel indexes.
@@ -14,9 +14,8 @@
 # ============================================================================
 """Implementation of functions to compute pruning mask and zeroize weights according to mask."""
 import numpy as np
-from mindspore import Tensor, float32 as ms_f32
 from .importance_criteria import get_medians, choose_channel_group_to_zero
-from .model_utils import get_model_size, get_layer_type, find_ms_cell
+from .model_utils import get_model_size, get_layer_type
 
 
 def get_mask(groups, norms, step, filter_num_threshold, target_sparsity):
@@ -76,54 +75,3 @@ def get_expanded_mask(groups, mask):
                 passed[group] = True
                 break
     return layer_mask
-
-def do_mask(groups, mask):
-    """
-    Zero layer channels according to pruning mask.
-    """
-    expanded_mask = get_expanded_mask(groups, mask)
-    for key, layer_mask in expanded_mask.items():
-        cell = find_ms_cell(groups, key)
-        if layer_mask['type'] in ['conv', 'fc']:
-            weight = cell.weight.asnumpy()
-            if layer_mask['cin']:
-                weight[:, layer_mask['cin_idx']] *= 0
-            if layer_mask['cout']:
-                weight[layer_mask['cout_idx']] *= 0
-                if cell.has_bias:
-                    bias = cell.bias.asnumpy()
-                    bias[layer_mask['cout_idx']] *= 0
-                    bias = Tensor(bias, ms_f32)
-                    cell.bias.init_flag = False
-                    cell.bias.init = None
-                    cell.bias.assign_value(bias)
-            shape = weight.shape
-            weight = Tensor(np.ravel(weight).reshape(shape), ms_f32)
-            cell.weight.init_flag = False
-            cell.weight.init = None
-            cell.weight.assign_value(weight)
-
-        elif layer_mask['type'] == 'bn' and layer_mask['cout']:
-            gamma = cell.gamma.asnumpy()
-            gamma[layer_mask['cout_idx']] *= 0
-            cell.gamma.init_flag = False
-            cell.gamma.init = None
-            cell.gamma.assign_value(Tensor(gamma))
-
-            beta = cell.beta.asnumpy()
-            beta[layer_mask['cout_idx']] *= 0
-            cell.beta.init_flag = False
-            cell.beta.init = None
-            cell.beta.assign_value(Tensor(beta))
-
-            moving_mean = cell.moving_mean.asnumpy()
-            moving_mean[layer_mask['cout_idx']] *= 0
-            cell.moving_mean.init_flag = False
-            cell.moving_mean.init = None
-            cell.moving_mean.assign_value(Tensor(moving_mean))
-
-            moving_variance = cell.moving_variance.asnumpy()
-            moving_variance[layer_mask['cout_idx']] *= 0
-            cell.moving_variance.init_flag = False
-            cell.moving_variance.init = None
-            cell.moving_variance.assign_value(Tensor(moving_variance))
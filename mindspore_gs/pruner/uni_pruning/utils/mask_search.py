@@ -0,0 +1,137 @@
+# Copyright 2023 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Incremental search of UniPruning mask."""
+import heapq
+import numpy as np
+from .importance_criteria import get_layer_medians, get_candidate_num
+from .mask import get_expanded_mask
+from .model_utils import get_model_size, get_start_layer_size, get_middle_layer_size
+
+
+class MaskSearcher:
+    """
+    Incremental version of `get_mask`, which produces the same pruning mask.
+
+    Instead of recounting medians of all layers, choosing channel group over all layers and recounting model size
+    on every iteration, it keeps medians of each channel group in a global priority queue and only updates the
+    channel groups of the block touched by the last selection. Pruned model size is tracked incrementally too.
+
+    Args:
+        groups (list): equichannel groups of network.
+        norms (list): channel importances returned by `get_channel_importances`, modified in place as in `get_mask`.
+        step (int): the number of channels which would be zeroed as a single unit.
+        filter_num_threshold (int): the minimal number of channels in each layer.
+        target_sparsity (float): target compression rate of the pruned model.
+    """
+
+    _zero_norm = -10.0
+    _eps = 1e-5
+
+    def __init__(self, groups, norms, step, filter_num_threshold, target_sparsity):
+        self._groups = groups
+        self._norms = norms
+        self._step = step
+        self._filter_num_threshold = filter_num_threshold
+        self._layer_mask = get_expanded_mask(groups, {})
+        self._size = get_model_size(groups, self._layer_mask)
+        self._target_size = self._size * target_sparsity
+        self._keys = [list(norm_group.keys()) for norm_group in norms]
+        self._versions = [0] * len(norms)
+        self._counts = [0] * len(norms)
+        self._heap = []
+        # expanded mask of shared layer is decided by the last activated block, see `get_expanded_mask`.
+        self._owners = {}
+        self._activated_idx = {}
+        self._layer_sizes = {}
+        for group in groups:
+            for layer, mod in group.ms_starts.items():
+                self._layer_sizes.setdefault(layer, []).append((get_start_layer_size, mod))
+            for layer, mod in group.ms_middles.items():
+                self._layer_sizes.setdefault(layer, []).append((get_middle_layer_size, mod))
+        for block_idx in range(len(norms)):
+            self._push_block(block_idx)
+
+    @staticmethod
+    def _block_fields(group):
+        """Get expanded mask fields affected by group."""
+        fields = [(layer, 'cout') for layer in group.ms_starts]
+        fields.extend((layer, 'cout') for layer in group.ms_middles)
+        fields.extend((layer, 'cin') for layer in group.ms_ends)
+        return fields
+
+    def _layer_size(self, layer):
+        """Count the number of params of layer with respect to current expanded mask."""
+        return sum(size_fn(mod, self._layer_mask[layer]) for size_fn, mod in self._layer_sizes.get(layer, []))
+
+    def _push_block(self, block_idx):
+        """Push all zeroing candidates of block into priority queue, invalidate old ones."""
+        self._versions[block_idx] += 1
+        version = self._versions[block_idx]
+        for key_idx, key in enumerate(self._keys[block_idx]):
+            filter_norms, norms_idx = self._norms[block_idx][key][0], self._norms[block_idx][key][1]
+            medians = get_layer_medians(filter_norms, norms_idx, self._step)
+            highest_median = medians[-1]
+            for i in range(get_candidate_num(len(medians), self._step, self._filter_num_threshold)):
+                current_median = medians[i]
+                # zero median is chosen first, the same as `choose_channel_group_to_zero`
+                if current_median == 0:
+                    heapq.heappush(self._heap, (0, 0.0, block_idx, key_idx, i, version))
+                    continue
+                ratio = highest_median / (current_median + self._eps)
+                if ratio > -1:
+                    heapq.heappush(self._heap, (1, -ratio, block_idx, key_idx, i, version))
+
+    def _choose_channel_group_to_zero(self):
+        """Pop the most unimportant channel group from priority queue."""
+        while self._heap:
+            _, _, block_idx, key_idx, chosen_idx, version = heapq.heappop(self._heap)
+            if version != self._versions[block_idx]:
+                continue
+            norms_idx = self._norms[block_idx][self._keys[block_idx][key_idx]][1]
+            return np.array(norms_idx[chosen_idx * self._step: (chosen_idx + 1) * self._step]), block_idx
+        raise RuntimeError("There is no channel group left to be zeroed before reaching target sparsity.")
+
+    def _update_size(self, block_idx):
+        """Update expanded mask of layers affected by block and pruned model size."""
+        for layer, field in self._block_fields(self._groups[block_idx]):
+            owner = self._owners.get((layer, field))
+            if owner is not None and self._activated_idx[owner] > self._activated_idx[block_idx]:
+                continue
+            self._owners[(layer, field)] = block_idx
+            old_size = self._layer_size(layer)
+            self._layer_mask[layer][field] = self._counts[block_idx]
+            self._size += self._layer_size(layer) - old_size
+
+    def search(self):
+        """
+        Choose groups of channels with the highest relative importance measure until reaching target sparsity.
+
+        Returns:
+            dict, pruning mask where layer is key and value is an array of channels to be zeroed.
+        """
+        chunks = {}
+        while True:
+            zero_idx, block_idx = self._choose_channel_group_to_zero()
+            for layer in self._norms[block_idx]:
+                chunks.setdefault(layer, []).append(zero_idx)
+                self._norms[block_idx][layer][0][zero_idx] = self._zero_norm
+                self._norms[block_idx][layer][1] = np.argsort(self._norms[block_idx][layer][0])
+            self._activated_idx.setdefault(block_idx, len(self._activated_idx))
+            self._counts[block_idx] += len(zero_idx)
+            self._update_size(block_idx)
+            self._push_block(block_idx)
+            if self._size <= self._target_size:
+                break
+        return {layer: np.concatenate(layer_chunks) for layer, layer_chunks in chunks.items()}
@@ -15,9 +15,14 @@
 """Various functions that are used in UniPruning algorithm."""
 import os
 import json
+import time
+import queue
+import functools
+import threading
 import numpy as np
 from mindspore import log as logger
-from mindspore import nn, float32 as ms_f32, Tensor, load, export, save_checkpoint
+from mindspore import nn, float32 as ms_f32, Tensor, Parameter, load, export, save_checkpoint, load_checkpoint, \
+    load_param_into_net
 
 
 def get_model_size(groups, layer_mask):
@@ -27,26 +32,39 @@ def get_model_size(groups, layer_mask):
     size = 0
     for group in groups:
         for layer in group.ms_starts:
-            mod = group.ms_starts[layer]
-            if isinstance(mod, nn.Conv2d):
-                shape = mod.weight.shape
-                size += (shape[0] - layer_mask[layer]['cout']) * \
-                    (shape[1] - layer_mask[layer]['cin']) * shape[2] * shape[3]
-                if mod.bias is not None:
-                    size += (shape[0] - layer_mask[layer]['cout'])
-            if isinstance(mod, nn.Dense):
-                shape = mod.weight.shape
-                size += (shape[0] - layer_mask[layer]['cout']) * \
-                    (shape[1] - layer_mask[layer]['cin'])
-                if mod.bias is not None:
-                    size += (shape[0] - layer_mask[layer]['cout'])
+            size += get_start_layer_size(group.ms_starts[layer], layer_mask[layer])
         for layer in group.ms_middles:
-            mod = group.ms_middles[layer]
-            if isinstance(mod, nn.BatchNorm2d):
-                shape = mod.gamma.shape
-                size += (shape[0] - layer_mask[layer]['cout']) * 4
+            size += get_middle_layer_size(group.ms_middles[layer], layer_mask[layer])
     return size
 
+def get_start_layer_size(mod, layer_mask):
+    """
+    Count the number of params in the start layer of group with respect to its expanded mask.
+    """
+    size = 0
+    if isinstance(mod, nn.Conv2d):
+        shape = mod.weight.shape
+        size += (shape[0] - layer_mask['cout']) * \
+            (shape[1] - layer_mask['cin']) * shape[2] * shape[3]
+        if mod.bias is not None:
+            size += (shape[0] - layer_mask['cout'])
+    if isinstance(mod, nn.Dense):
+        shape = mod.weight.shape
+        size += (shape[0] - layer_mask['cout']) * \
+            (shape[1] - layer_mask['cin'])
+        if mod.bias is not None:
+            size += (shape[0] - layer_mask['cout'])
+    return size
+
+def get_middle_layer_size(mod, layer_mask):
+    """
+    Count the number of params in the middle layer of group with respect to its expanded mask.
+    """
+    if isinstance(mod, nn.BatchNorm2d):
+        shape = mod.gamma.shape
+        return (shape[0] - layer_mask['cout']) * 4
+    return 0
+
 def get_layer_type(layer):
     """
     Get layer type as a string.
@@ -60,31 +78,159 @@ def get_layer_type(layer):
 
     return 'unused_type'
 
-def save_model_and_mask(net, output_path, exp_name, cur_step_num,
-                        input_size, device_target, save_model=True, mask=None, export_air=False):
+def _ckpt_file(output_path, exp_name, cur_step_num):
+    return f'{os.path.join(output_path, exp_name)}_epoch{cur_step_num}.ckpt'
+
+def export_model(net, output_path, exp_name, cur_step_num, input_size, device_target, export_air=False):
     """
-    Save model as .MINDIR and .AIR, weights as .ckpt and mask as .json.
+    Export model as .MINDIR, and as .AIR if `export_air` on Ascend.
     """
     fake_input = np.random.uniform(0.0, 1.0, size=input_size).astype(np.float32)
     fake_input = Tensor(fake_input, ms_f32)
-    save_checkpoint(net, f'{os.path.join(output_path, exp_name)}_epoch{cur_step_num}.ckpt')
-    if save_model:
-        logger.info(f'Exporting model {exp_name} into MINDIR')
+    logger.info(f'Exporting model {exp_name} into MINDIR')
+    export(net, fake_input,
+           file_name=f'{os.path.join(output_path, exp_name)}_epoch{cur_step_num}.mindir',
+           file_format='MINDIR')
+    if device_target == 'Ascend' and export_air:
+        logger.info(f'Exporting model {exp_name} into AIR')
         export(net, fake_input,
-               file_name=f'{os.path.join(output_path, exp_name)}_epoch{cur_step_num}.mindir',
-               file_format='MINDIR')
-        if device_target == 'Ascend' and export_air:
-            logger.info(f'Exporting model {exp_name} into AIR')
-            export(net, fake_input,
-                   file_name=f'{os.path.join(output_path, exp_name)}_epoch{cur_step_num}.air',
-                   file_format='AIR')
+               file_name=f'{os.path.join(output_path, exp_name)}_epoch{cur_step_num}.air',
+               file_format='AIR')
+
+def save_mask(mask, output_path, exp_name, cur_step_num):
+    """
+    Save mask as .json.
+    """
+    logger.info('saving mask into JSON')
+    save_mask_dict = {key: np.asarray(val).tolist() for key, val in mask.items()}
+    mask_save_path = f"{os.path.join(output_path, exp_name)}_epoch{cur_step_num}_mask.json"
+    with open(mask_save_path, 'w+', encoding='utf8') as file_path:
+        json.dump(save_mask_dict, file_path, indent=3)
 
+def save_model_and_mask(net, output_path, exp_name, cur_step_num,
+                        input_size, device_target, save_model=True, mask=None, export_air=False):
+    """
+    Save model as .MINDIR and .AIR, weights as .ckpt and mask as .json.
+    """
+    save_checkpoint(net, _ckpt_file(output_path, exp_name, cur_step_num))
+    if save_model:
+        export_model(net, output_path, exp_name, cur_step_num, input_size, device_target, export_air)
     if mask is not None:
-        logger.info('saving mask into JSON')
-        save_mask = {key: val.tolist() for key, val in mask.items()}
-        mask_save_path = f"{os.path.join(output_path, exp_name)}_epoch{cur_step_num}_mask.json"
-        with open(mask_save_path, 'w+', encoding='utf8') as file_path:
-            json.dump(save_mask, file_path, indent=3)
+        save_mask(mask, output_path, exp_name, cur_step_num)
+
+def _snapshot_parameters(net):
+    """Copy values of all parameters of `net` to host."""
+    return [{"name": param.name, "data": Tensor(param.asnumpy().copy())} for _, param in net.parameters_and_names()]
+
+class AsyncExporter:
+    """
+    Save checkpoints and masks of UniPruning in a background thread, so that training is not stalled by writing
+    files.
+
+    When a save is submitted, parameters of network are copied to host on the training thread, and the copy is written
+    by the worker thread. At most `max_pending` saves wait in queue, and submitting blocks while queue is full.
+    Exporting .MINDIR and .AIR needs to compile the network, which can not run concurrently with training, so model
+    exports are deferred to `flush`: each of them is exported from its checkpoint after training, and current
+    parameters of network are restored afterwards.
+
+    Args:
+        max_pending (int): The maximum number of saves waiting in queue. Default: 2.
+    """
+
+    def __init__(self, max_pending=2):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+        self._error = None
+        self._deferred_exports = []
+        self._blocked_time = 0.0
+        self._overlapped_time = 0.0
+
+    def _run(self):
+        """Run saves in queue until a None is got."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                self._queue.task_done()
+                return
+            start = time.time()
+            try:
+                job()
+            except Exception as e:  # pylint: disable=broad-except
+                logger.error(f'Failed to save UniPruning checkpoint or mask: {e}')
+                self._error = e
+            finally:
+                self._overlapped_time += time.time() - start
+                self._queue.task_done()
+
+    def _check_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError(f'Failed to save UniPruning checkpoint or mask in background: {error}') from error
+
+    @staticmethod
+    def _save(snapshot, ckpt_file, mask, output_path, exp_name, cur_step_num):
+        save_checkpoint(snapshot, ckpt_file)
+        if mask is not None:
+            save_mask(mask, output_path, exp_name, cur_step_num)
+
+    def submit(self, net, output_path, exp_name, cur_step_num,
+               input_size, device_target, save_model=True, mask=None, export_air=False):
+        """
+        Submit a save with the same arguments as `save_model_and_mask`.
+
+        Raises:
+            RuntimeError: If a previous save failed.
+        """
+        start = time.time()
+        self._check_error()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='UniPruningExporter', daemon=True)
+            self._thread.start()
+        ckpt_file = _ckpt_file(output_path, exp_name, cur_step_num)
+        if mask is not None:
+            mask = {key: np.array(val) for key, val in mask.items()}
+        self._queue.put(functools.partial(AsyncExporter._save, _snapshot_parameters(net), ckpt_file, mask,
+                                          output_path, exp_name, cur_step_num))
+        if save_model:
+            self._deferred_exports.append((ckpt_file, (output_path, exp_name, cur_step_num, input_size,
+                                                       device_target, export_air)))
+        self._blocked_time += time.time() - start
+
+    def flush(self, net):
+        """
+        Wait for all submitted saves, and then export deferred models of `net`.
+
+        Args:
+            net (Cell): Network whose saves were submitted.
+
+        Raises:
+            RuntimeError: If a save failed.
+        """
+        start = time.time()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._check_error()
+        if self._deferred_exports:
+            current = {item["name"]: Parameter(item["data"], name=item["name"]) for item in _snapshot_parameters(net)}
+            try:
+                for ckpt_file, export_args in self._deferred_exports:
+                    load_param_into_net(net, load_checkpoint(ckpt_file))
+                    export_model(net, *export_args)
+            finally:
+                load_param_into_net(net, current)
+                self._deferred_exports = []
+        self._blocked_time += time.time() - start
+
+    def get_stats(self):
+        """
+        Get time spent by training thread blocked on saving and time of saving overlapped with training.
+
+        Returns:
+            dict, with keys 'blocked_time' and 'overlapped_time' in seconds.
+        """
+        return {'blocked_time': self._blocked_time, 'overlapped_time': self._overlapped_time}
 
 def load_model(output_path, exp_name, cur_step_num, input_size, dtype):
     """
@@ -17,7 +17,6 @@ import numpy as np
 from mindspore import Tensor
 from mindspore.nn import Conv2d
 from mindspore.ops import Conv2D
-from .model_utils import find_ms_cell
 from .mask import get_expanded_mask
 
 
@@ -39,52 +38,122 @@ def update_channel_out(cell, new_val):
             data_format=cell.conv2d.format
         )
 
-def prune_net(groups, mask):
+
+class PruningExecutor:
     """
-    Pruning function of network according to mask.
+    Zero or prune layers of groups according to pruning mask.
+
+    Layers are indexed by name once when executor is created. To apply a mask, all affected parameters are read to
+    host first, masks are applied on the numpy arrays, and then parameters are written back one by one after all new
+    values are computed. Each parameter is replaced by `assign_value` instead of `load_param_into_net`, because
+    pruning changes shapes of parameters, which `load_param_into_net` does not allow.
+
+    Args:
+        groups (list): Equichannel groups of network found by `GraphAnalyzer`.
     """
-    expanded_mask = get_expanded_mask(groups, mask)
-    for key, layer_mask in expanded_mask.items():
-        cell = find_ms_cell(groups, key)
-        if layer_mask['type'] in ['conv', 'fc'] and \
-        layer_mask['cin'] + layer_mask['cout']:
-            weight = cell.weight.asnumpy()
+
+    conv_fc_params = ('weight', 'bias')
+    bn_params = ('gamma', 'beta', 'moving_mean', 'moving_variance')
+
+    def __init__(self, groups):
+        self.groups = groups
+        self._cells = {}
+        for group in groups:
+            for key, cell in group.ms_starts.items():
+                self._cells.setdefault(key, cell)
+            for key, cell in group.ms_middles.items():
+                self._cells.setdefault(key, cell)
+
+    def find_cell(self, key):
+        """
+        Get layer as mindspore cell by name.
+
+        Args:
+            key (str): Name of layer.
+
+        Returns:
+            Cell, None if no layer is named `key`.
+        """
+        return self._cells.get(key)
+
+    def _affected_layers(self, mask):
+        """Layers changed by `mask`, as a list of (cell, expanded mask of layer, names of affected parameters)."""
+        layers = []
+        for key, layer_mask in get_expanded_mask(self.groups, mask).items():
+            cell = self.find_cell(key)
+            if layer_mask['type'] in ['conv', 'fc'] and layer_mask['cin'] + layer_mask['cout']:
+                names = self.conv_fc_params if layer_mask['cout'] and cell.has_bias else self.conv_fc_params[:1]
+                layers.append((cell, layer_mask, names))
+            elif layer_mask['type'] == 'bn' and layer_mask['cout']:
+                layers.append((cell, layer_mask, self.bn_params))
+        return layers
+
+    @staticmethod
+    def _read(layers):
+        """Read all affected parameters of `layers` to host."""
+        return [{name: getattr(cell, name).asnumpy() for name in names} for cell, _, names in layers]
+
+    @staticmethod
+    def _write(layers, values):
+        """Write new values of all affected parameters of `layers` back, one parameter at a time."""
+        for (cell, _, _), layer_values in zip(layers, values):
+            for name, value in layer_values.items():
+                param = getattr(cell, name)
+                param.init_flag = False
+                param.init = None
+                param.assign_value(Tensor(value))
+
+    def zero(self, mask):
+        """
+        Zero channels of layers according to pruning mask.
+
+        Args:
+            mask (dict): Pruning mask where layer is key and value is an array of channels to be pruned.
+        """
+        layers = self._affected_layers(mask)
+        values = PruningExecutor._read(layers)
+        for (_, layer_mask, _), layer_values in zip(layers, values):
+            if layer_mask['type'] == 'bn':
+                for value in layer_values.values():
+                    value[layer_mask['cout_idx']] = 0
+                continue
             if layer_mask['cin']:
-                weight = np.delete(weight, layer_mask['cin_idx'], axis=1)
+                layer_values['weight'][:, layer_mask['cin_idx']] = 0
+            if layer_mask['cout']:
+                for value in layer_values.values():
+                    value[layer_mask['cout_idx']] = 0
+        PruningExecutor._write(layers, values)
+
+    def prune(self, mask):
+        """
+        Erase channels of layers according to pruning mask.
+
+        Args:
+            mask (dict): Pruning mask where layer is key and value is an array of channels to be pruned.
+        """
+        layers = self._affected_layers(mask)
+        values = PruningExecutor._read(layers)
+        for (_, layer_mask, _), layer_values in zip(layers, values):
+            if layer_mask['type'] != 'bn' and layer_mask['cin']:
+                layer_values['weight'] = np.delete(layer_values['weight'], layer_mask['cin_idx'], axis=1)
             if layer_mask['cout']:
-                weight = np.delete(weight, layer_mask['cout_idx'], axis=0)
-                cell.out_channels = weight.shape[0]
-                update_channel_out(cell, weight.shape[0])
-                if cell.has_bias:
-                    bias = cell.bias.asnumpy()
-                    bias = np.delete(bias, layer_mask['cout_idx'])
-                    cell.bias.init_flag = False
-                    cell.bias.init = None
-                    cell.bias.assign_value(Tensor.from_numpy(bias))
-
-            shape = weight.shape
-            cell.weight.init_flag = False
-            cell.weight.init = None
-            cell.weight.assign_value(Tensor.from_numpy(np.ravel(weight).reshape(shape)))
-
-        elif layer_mask['type'] == 'bn' and layer_mask['cout']:
-            gamma = cell.gamma.asnumpy()
-            gamma = np.delete(gamma, layer_mask['cout_idx'])
-            cell.gamma.init_flag = False
-            cell.gamma.init = None
-            cell.gamma.assign_value(Tensor.from_numpy(gamma))
-            beta = cell.beta.asnumpy()
-            beta = np.delete(beta, layer_mask['cout_idx'])
-            cell.beta.init_flag = False
-            cell.beta.init = None
-            cell.beta.assign_value(Tensor.from_numpy(beta))
-            moving_mean = cell.moving_mean.asnumpy()
-            moving_mean = np.delete(moving_mean, layer_mask['cout_idx'])
-            cell.moving_mean.init_flag = False
-            cell.moving_mean.init = None
-            cell.moving_mean.assign_value(Tensor.from_numpy(moving_mean))
-            moving_variance = cell.moving_variance.asnumpy()
-            moving_variance = np.delete(moving_variance, layer_mask['cout_idx'])
-            cell.moving_variance.init_flag = False
-            cell.moving_variance.init = None
-            cell.moving_variance.assign_value(Tensor.from_numpy(moving_variance))
+                for name, value in layer_values.items():
+                    layer_values[name] = np.delete(value, layer_mask['cout_idx'], axis=0)
+        PruningExecutor._write(layers, values)
+        for cell, layer_mask, _ in layers:
+            if layer_mask['type'] != 'bn' and layer_mask['cout']:
+                update_channel_out(cell, cell.weight.shape[0])
+
+
+def do_mask(groups, mask):
+    """
+    Zero layer channels according to pruning mask.
+    """
+    PruningExecutor(groups).zero(mask)
+
+
+def prune_net(groups, mask):
+    """
+    Pruning function of network according to mask.
+    """
+    PruningExecutor(groups).prune(mask)
@@ -19,8 +19,10 @@ MindSpore golden stick quantization module.
 from ..version import __version__, mindspore_version_check
 mindspore_version_check()
 
-from .simulated_quantization import SimulatedQuantizationAwareTraining
+from .simulated_quantization import SimulatedQuantizationAwareTraining, SimulatedPostTrainingQuantization
 from .slb import SlbQuantAwareTraining
+from .rewrite_cache import RewriteCache
 
-__all__ = ["SimulatedQuantizationAwareTraining", "SlbQuantAwareTraining"]
+__all__ = ["SimulatedQuantizationAwareTraining", "SimulatedPostTrainingQuantization", "SlbQuantAwareTraining",
+           "RewriteCache"]
 __all__.extend(__version__)
@@ -16,6 +16,65 @@
 FakeQuantizer.
 FakeQuantizer should be a Cell for automatic-differentiation
 """
+import numpy as np
+import mindspore
 from mindspore.nn.cell import Cell
+from mindspore.common.parameter import Parameter
+from mindspore.common.tensor import Tensor
 
 FakeQuantizer = Cell
+
+
+class FreezableObserver:
+    """
+    Mixin of fake quantizers whose quantization range can be frozen in training.
+
+    Frozen state is kept in Parameter `observer_frozen` rather than a python attribute, so a compiled graph switches to
+    the frozen path at runtime without recompiling, and frozen state is saved into checkpoint. Subclass calls
+    `_init_observer_freeze` in its constructor, keeps its range in `_float_min` and `_float_max`, and checks
+    `observer_frozen` in `construct` only if `_observer_freezable` is True, so that the frozen path is not compiled
+    into graph of fake quantizers which are never frozen.
+    """
+
+    def _init_observer_freeze(self, freezable=True):
+        self._observer_freezable = freezable
+        self.observer_frozen = Parameter(Tensor(0, mindspore.float32), name="observer_frozen", requires_grad=False)
+
+    def is_observer_freezable(self):
+        """
+        Whether quantization range can be frozen, which is decided when fake quantizer is created.
+
+        Returns:
+            bool, whether quantization range can be frozen.
+        """
+        return self._observer_freezable
+
+    def freeze_observer(self):
+        """
+        Stop updating quantization range, data is fake quantized with the current range in later steps.
+
+        Raises:
+            RuntimeError: If fake quantizer is not created freezable.
+        """
+        if not self._observer_freezable:
+            raise RuntimeError(f"For '{type(self).__name__}', quantization range can not be frozen because fake "
+                               f"quantizer is not created freezable.")
+        self.observer_frozen.set_data(Tensor(1, mindspore.float32))
+
+    def is_observer_frozen(self):
+        """
+        Whether quantization range is frozen.
+
+        Returns:
+            bool, whether quantization range is frozen.
+        """
+        return bool(self.observer_frozen.asnumpy() != 0)
+
+    def get_range(self):
+        """
+        Get current quantization range.
+
+        Returns:
+            2-tuple of numpy.ndarray, minimum and maximum value of range.
+        """
+        return np.array(self._float_min.asnumpy()), np.array(self._float_max.asnumpy())
@@ -14,12 +14,26 @@
 # ============================================================================
 """LayerQConfig."""
 import abc
+import copy
 from typing import Optional
 from mindspore.nn import Cell
 from .fake_quantizer import FakeQuantizer
 layer_policy_key = "layer_quant_policy"
 
 
+class LayerPolicyState:
+    """
+    Per-node state of layer policy, which records the number of inputs of node and whether each input needs to be
+    fake-quantized.
+    """
+
+    __slots__ = ("input_num", "inputs_insert_fq")
+
+    def __init__(self):
+        self.input_num = 0
+        self.inputs_insert_fq = []
+
+
 class LayerPolicy(abc.ABC):
     """
     Base class for layer quantize configure.
@@ -39,8 +53,46 @@ class LayerPolicy(abc.ABC):
             `get_output_quantizers` and `wrapper_cell`.
     """
     def __init__(self):
-        self._input_num = 0
-        self._inputs_insert_fq = []
+        self._state = LayerPolicyState()
+
+    @property
+    def _input_num(self) -> int:
+        return self._state.input_num
+
+    @_input_num.setter
+    def _input_num(self, input_num: int):
+        self._state.input_num = input_num
+
+    @property
+    def _inputs_insert_fq(self) -> list:
+        return self._state.inputs_insert_fq
+
+    @_inputs_insert_fq.setter
+    def _inputs_insert_fq(self, inputs_insert_fq: list):
+        self._state.inputs_insert_fq = inputs_insert_fq
+
+    def clone(self) -> "LayerPolicy":
+        """
+        Create layer policy of a node from this policy. Quantizer factories and config are shared with this policy,
+        while per-node state and quantizer instances are owned by the new policy, so that assigning policy to a node
+        does not deep-copy the whole policy.
+
+        Returns:
+            Layer policy of a node.
+        """
+        policy = copy.copy(self)
+        policy._state = LayerPolicyState()
+        policy._create_quantizers()
+        return policy
+
+    def _create_quantizers(self):
+        """
+        Create quantizer instances owned by a node. By default, every quantizer instance held by policy is copied.
+        Derived class can override it to create quantizers from config directly.
+        """
+        for name, value in list(vars(self).items()):
+            if isinstance(value, FakeQuantizer):
+                setattr(self, name, copy.deepcopy(value))
 
     def get_weight_name_and_quantizers(self) -> [(str, FakeQuantizer)]:
         """
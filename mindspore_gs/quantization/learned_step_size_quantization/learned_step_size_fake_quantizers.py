@@ -21,7 +21,7 @@ from mindspore.ops.operations import _quant_ops as Q
 from mindspore.common.parameter import Parameter
 from mindspore.common.tensor import Tensor
 from ..fake_quantizer import FakeQuantizer
-from ..quant_utils import compute_kl_threshold
+from ..quant_utils import compute_kl_threshold, compute_kl_thresholds
 
 
 def _calculate_quant_max(num_bits, neg_trunc=False):
@@ -109,8 +109,7 @@ class LearnedStepSizeFakeQuantizePerChannel(FakeQuantizer):
         self._float_max = Parameter(Tensor(self._get_init_array(float_max), mindspore.float32), name="float_max")
 
     def compute_quant_param(self, weight_param):
-        max_init = [compute_kl_threshold(weight_para_each.asnumpy(), self._num_bits)
-                    for weight_para_each in weight_param]
+        max_init = compute_kl_thresholds(weight_param.asnumpy(), self._num_bits).tolist()
         min_init = [-x for x in max_init]
         self._float_min.set_data(Tensor(self._get_init_array(max_init)))
         self._float_max.set_data(Tensor(self._get_init_array(min_init)))
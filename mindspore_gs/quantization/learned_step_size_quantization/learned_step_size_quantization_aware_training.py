@@ -64,6 +64,8 @@ class LearnedStepSizeQuantizationAwareTraining(SimQAT):
     Raises:
         TypeError: If `bn_fold`, `one_conv_fold` or `enable_fusion` is not bool.
         TypeError: If `freeze_bn` is not int.
+        ValueError: If `freeze_observer`, `freeze_observer_epoch` or `freeze_observer_tolerance` is set, observer
+            freezing is not supported by learned step size quantization.
         TypeError: If `quant_delay` is not int, or every element of `quant_delay` is not int.
         TypeError: If `quant_dtype` is not `QuantDtype`, or every element of `quant_dtype` is not `QuantDtype`.
         TypeError: If `per_channel` is not bool, or every element of `per_channel` is not bool.
@@ -339,6 +341,57 @@ class LearnedStepSizeQuantizationAwareTraining(SimQAT):
             raise ValueError("Learned step size quantization only support `freeze_bn` is 0 currently")
         super(LearnedStepSizeQuantizationAwareTraining, self).set_freeze_bn(freeze_bn)
 
+    def set_freeze_observer(self, freeze_observer):
+        """
+        Set value of freeze_observer of `_config`. Observer freezing is not supported by learned step size
+        quantization because its quantization range is learned by optimizer rather than tracked by an observer.
+
+        Args:
+            freeze_observer (int): Only -1 is supported.
+
+        Raises:
+            TypeError: If `freeze_observer` is not int.
+            ValueError: Learned step size quantization only support `freeze_observer` is -1 currently
+        """
+        Validator.check_is_int(freeze_observer, "freeze_observer", self.__class__.__name__)
+        if freeze_observer != -1:
+            raise ValueError("Learned step size quantization only support `freeze_observer` is -1 currently")
+        super(LearnedStepSizeQuantizationAwareTraining, self).set_freeze_observer(freeze_observer)
+
+    def set_freeze_observer_epoch(self, freeze_observer_epoch):
+        """
+        Set value of freeze_observer_epoch of `_config`. Observer freezing is not supported by learned step size
+        quantization.
+
+        Args:
+            freeze_observer_epoch (int): Only -1 is supported.
+
+        Raises:
+            TypeError: If `freeze_observer_epoch` is not int.
+            ValueError: Learned step size quantization only support `freeze_observer_epoch` is -1 currently
+        """
+        Validator.check_is_int(freeze_observer_epoch, "freeze_observer_epoch", self.__class__.__name__)
+        if freeze_observer_epoch != -1:
+            raise ValueError("Learned step size quantization only support `freeze_observer_epoch` is -1 currently")
+        super(LearnedStepSizeQuantizationAwareTraining, self).set_freeze_observer_epoch(freeze_observer_epoch)
+
+    def set_freeze_observer_tolerance(self, freeze_observer_tolerance):
+        """
+        Set value of freeze_observer_tolerance of `_config`. Observer freezing is not supported by learned step size
+        quantization.
+
+        Args:
+            freeze_observer_tolerance (float): Only 0.0 is supported.
+
+        Raises:
+            TypeError: If `freeze_observer_tolerance` is not float.
+            ValueError: Learned step size quantization only support `freeze_observer_tolerance` is 0.0 currently
+        """
+        Validator.check_is_float(freeze_observer_tolerance, "freeze_observer_tolerance", self.__class__.__name__)
+        if freeze_observer_tolerance != 0.0:
+            raise ValueError("Learned step size quantization only support `freeze_observer_tolerance` is 0.0 currently")
+        super(LearnedStepSizeQuantizationAwareTraining, self).set_freeze_observer_tolerance(freeze_observer_tolerance)
+
     def set_enable_fusion(self, enable_fusion):
         """
         Set value of enable_fusion of `_config`
@@ -408,3 +461,6 @@ class LearnedStepSizeQuantizationAwareTraining(SimQAT):
         self.set_bn_fold(config.get("bn_fold", False))
         self.set_one_conv_fold(config.get("one_conv_fold", True))
         self.set_freeze_bn(0)
+        self.set_freeze_observer(config.get("freeze_observer", -1))
+        self.set_freeze_observer_epoch(config.get("freeze_observer_epoch", -1))
+        self.set_freeze_observer_tolerance(config.get("freeze_observer_tolerance", 0.0))
@@ -52,6 +52,9 @@ class LearnedStepSizeQuantizationLayerPolicy(SimulatedLayerPolicy):
 
         if config.act_per_channel:
             raise NotImplementedError("act quant only support perlayer now!")
+
+    def _create_quantizers(self):
+        config = self._config
         self._act_quantizer: Optional[FakeQuantizer] = LearnedStepSizeFakeQuantizerPerLayer(
             quant_delay=config.act_quant_delay, num_bits=self._num_bits, neg_trunc=config.act_neg_trunc,
             symmetric=config.act_symmetric, narrow_range=config.act_narrow_range)
@@ -15,6 +15,8 @@
 """NetworkQConfig."""
 from typing import Optional
 
+from mindspore.nn import Cell
+
 from .layer_policy import LayerPolicy
 from .transformer import Transformer
 
@@ -46,3 +48,16 @@ class NetPolicy:
 
     def get_net_layer_policy(self) -> Optional[LayerPolicy]:
         return self._net_layer_policy
+
+    def fuse_cells(self, cells: [Cell]) -> Cell:
+        """
+        Create the fused cell of `cells` the same way as the fusion pattern engines do, which is used to replay fusion
+        decisions recorded by `RewriteCache`. Derived class must override it if it has fusion pattern engines.
+
+        Args:
+            cells (list[Cell]): Cells matched by fusion pattern, None for optional cell not matched.
+
+        Returns:
+            Fused cell.
+        """
+        raise NotImplementedError
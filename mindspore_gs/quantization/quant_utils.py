@@ -19,7 +19,8 @@ import numpy as np
 from mindspore.ops.operations import _quant_ops as Q
 from mindspore.nn import Cell
 
-__all__ = ["compute_kl_threshold", "fold_batchnorm", "cal_quantization_params", "get_quant_min_max"]
+__all__ = ["compute_kl_threshold", "compute_kl_thresholds", "compute_kl_threshold_from_histogram", "fold_batchnorm",
+           "cal_quantization_params", "get_quant_min_max"]
 
 
 class LinearFakeQuantCell(Cell):
@@ -180,19 +181,103 @@ def without_fold_batchnorm(weight, cell_quant):
     return weight, bias
 
 
-def compute_kl_threshold(data, bitwidth):
-    r"""
-    Using KL-J Distance to calculate the clip threshold.
+def _linspace_grid(nums, length):
+    """
+    Stack `np.linspace(0.0, 1.0, num)` for each num of `nums` as rows of a 2-D array, elements after the `num`-th
+    element of each row are filled with inf.
+    """
+    grid = np.arange(length, dtype=np.float64)[None, :] * (1.0 / (nums - 1))[:, None]
+    grid[np.arange(length)[None, :] >= (nums - 1)[:, None]] = np.inf
+    grid[np.arange(nums.shape[0]), nums - 1] = 1.0
+    return grid
+
+
+def _batch_interp(x, xp, fp):
+    """
+    Row-wise version of `np.interp` for `x` in range [0, 1], which returns the same values as `np.interp`.
 
     Args:
-        - **data** (NumpyArray) - Data observed to calculate the threshold for quantization,
-        - **bitwidth** (QuantDtype) - The datatype of quantization.
-    Outputs:
-        Tensor with Shape 1. Threshold to calculate the data.
+        x (numpy.ndarray): x-coordinates to be evaluated, with shape (rows, m) or (m,). Non-finite elements are
+            evaluated at 1.
+        xp (numpy.ndarray): increasing uniform x-coordinates of data points which start with 0 and end with 1, with
+            shape (rows, k) or (k,). Elements after 1 should be inf.
+        fp (numpy.ndarray): y-coordinates of data points, with shape (rows, k).
+
+    Returns:
+        numpy.ndarray with shape (rows, m).
+    """
+    rows, width = fp.shape
+    x = np.where(np.isfinite(x), x, 1.0)
+    row_offset = np.arange(rows)[:, None] * width
+
+    def take_xp(idx):
+        if xp.ndim == 1:
+            return xp.take(idx)
+        return xp.ravel().take(idx + row_offset)
+
+    last = np.sum(np.isfinite(xp), axis=-1, keepdims=True) - 1
+    if xp.ndim == 1:
+        last = np.full((rows, 1), last[0])
+    # xp is uniform grid on [0, 1], estimate the index of left data point and correct the rounding error.
+    left = np.minimum((x * last).astype(np.int64), last)
+    left -= take_xp(left) > x
+    np.maximum(left, 0, out=left)
+    right = np.minimum(left + 1, last)
+    left += (take_xp(right) <= x) & (right > left)
+    right = np.minimum(left + 1, last)
+    xp_left, xp_right = take_xp(left), take_xp(right)
+    fp_left, fp_right = fp.ravel().take(left + row_offset), fp.ravel().take(right + row_offset)
+    exact = (xp_left == x) | (left == right)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (fp_right - fp_left) / (xp_right - xp_left)
+        result = slope * (x - xp_left) + fp_left
+    return np.where(exact, fp_left, result)
+
+
+def _batch_kl_divergence(cumsum, bit_pow_range, candidates):
+    """
+    Compute KL-J distance of all candidate thresholds at once.
+
+    Args:
+        cumsum (numpy.ndarray): cumulative sum of normalized histograms, with shape (tensors, bins).
+        bit_pow_range (int): the number of quantization levels of positive range.
+        candidates (numpy.ndarray): indexes of candidate bins.
+
+    Returns:
+        numpy.ndarray with shape (tensors, candidates).
+    """
+    num_tensors, num_bins = cumsum.shape
+    num_candidates = candidates.shape[0]
+    # elements from the `i`-th one are not changed by interpolation, only the first max(i) columns are interpolated.
+    width = int(candidates[-1])
+    cols = np.arange(width)[None, :]
+    cumsum_rows = np.repeat(cumsum, num_candidates, axis=0)
+    candidates_rows = np.tile(candidates, num_tensors)
+    cumsum_tmp = np.where(cols >= (candidates_rows - 1)[:, None], 1.0, cumsum_rows[:, :width])
+    fwd_x = np.linspace(0.0, 1.0, bit_pow_range)
+    fwd_xp = _linspace_grid(candidates_rows, width)
+    forward_interp = _batch_interp(fwd_x, fwd_xp, cumsum_tmp)
+    backward_interp = _batch_interp(fwd_xp, fwd_x, forward_interp)
+    cumsum_tmp = np.where(cols < candidates_rows[:, None], backward_interp, cumsum_tmp)
+    kl = np.empty(cumsum_rows.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        kl[:, :width] = (cumsum_rows[:, :width] - cumsum_tmp) * np.log2(cumsum_rows[:, :width] / cumsum_tmp)
+        kl[:, width:] = (cumsum_rows[:, width:] - 1.0) * np.log2(cumsum_rows[:, width:])
+    kl = np.sum(kl, axis=-1)  # Kullback-Leibler-J
+    return kl.reshape(num_tensors, num_candidates)
+
+
+def _kl_histogram(data):
+    """
+    Compute normalized histogram of absolute value of `data`.
+
+    Returns:
+        hist (numpy.ndarray): normalized histogram, None if data is close to zero.
+        bin_edges (numpy.ndarray): bin edges of histogram.
     """
     data_max = np.abs(data).max()
     if data_max < 1e-5:
-        return 1e-5
+        return None, None
     hist, bin_edges = np.histogram(np.abs(data), bins='sqrt', range=(0, data_max), density=True)
     # For the sake of high efficiency, we limit the maximum number of bins to 1024 in `sqrt` mode, If it exceeds the
     # largest size, turn to use the default bins config.
@@ -200,36 +285,101 @@ def compute_kl_threshold(data, bitwidth):
     if hist.shape[0] > largest_bin_size:
         hist, bin_edges = np.histogram(np.abs(data), range=(0, data_max), density=True)
     hist = hist / np.sum(hist)
-    cumsum = np.cumsum(hist)
+    return hist, bin_edges
+
+
+def _fill_kl_thresholds(thresholds, histograms, bitwidth, chunk_size):
+    """
+    Compute KL thresholds of normalized histograms and fill them into `thresholds`.
+
+    Args:
+        thresholds (numpy.ndarray): thresholds to be filled.
+        histograms (list): list of 3-tuple of index in `thresholds`, normalized histogram and bin edges.
+        bitwidth (int): number of bits of quantization.
+        chunk_size (int): the maximum number of candidate thresholds evaluated together. None means no limit.
+    """
+    if chunk_size is not None and (not isinstance(chunk_size, int) or chunk_size <= 0):
+        raise ValueError(f"'chunk_size' should be a positive int or None, but got {chunk_size}.")
     bit_pow_range = pow(2, int(bitwidth) - 1)
-    threshold = []
-    scaling_factor = []
-    kl = []
-    if bit_pow_range + 1 > len(bin_edges) - 1:
-        th_layer_out = bin_edges[-1]
-        return float(th_layer_out)
-    for i in range(bit_pow_range + 1, len(bin_edges), 1):
-        threshold_tmp = (i + 0.5) * (bin_edges[1] - bin_edges[0])
-        threshold = np.concatenate((threshold, [threshold_tmp]))
-        scaling_factor_tmp = threshold_tmp / (bit_pow_range - 1)
-        scaling_factor = np.concatenate((scaling_factor, [scaling_factor_tmp]))
-        # forward interpolation
-        cumsum_tmp = np.copy(cumsum)
-        cumsum_tmp[(i - 1):] = 1
-        fwd_x = np.linspace(0.0, 1.0, bit_pow_range)
-        fwd_xp = np.linspace(0.0, 1.0, i)
-        fwd_fp = cumsum_tmp[:i]
-        forward_interp = np.interp(fwd_x, fwd_xp, fwd_fp)
-        # backward interpolation
-        bwd_x = np.linspace(0.0, 1.0, i)
-        bwd_xp = np.linspace(0.0, 1.0, bit_pow_range)
-        bwd_fp = forward_interp
-        backward_interp = np.interp(bwd_x, bwd_xp, bwd_fp)
-        cumsum_tmp[:i] = backward_interp
-        kl_tmp = np.sum((cumsum - cumsum_tmp) * np.log2(cumsum / cumsum_tmp))  # Kullback-Leibler-J
-        kl = np.concatenate((kl, [kl_tmp]))
-    th_layer_out = threshold[np.argmin(kl)]
-    threshold = float(th_layer_out)
-    if threshold < 1e-5:
-        threshold = 1e-5
-    return threshold
+    same_bins_tensors = {}
+    for idx, hist, bin_edges in histograms:
+        if bit_pow_range + 1 > len(bin_edges) - 1:
+            thresholds[idx] = float(bin_edges[-1])
+            continue
+        same_bins_tensors.setdefault(len(bin_edges), []).append((idx, hist, bin_edges))
+
+    for num_edges, tensors in same_bins_tensors.items():
+        indexes = [idx for idx, _, _ in tensors]
+        cumsum = np.cumsum(np.stack([hist for _, hist, _ in tensors]), axis=-1)
+        candidates = np.arange(bit_pow_range + 1, num_edges)
+        step = len(candidates) if chunk_size is None else max(chunk_size // len(tensors), 1)
+        kl = np.concatenate([_batch_kl_divergence(cumsum, bit_pow_range, candidates[i:i + step])
+                             for i in range(0, len(candidates), step)], axis=-1)
+        best = candidates[np.argmin(kl, axis=-1)]
+        for idx, (_, _, bin_edges), i in zip(indexes, tensors, best):
+            thresholds[idx] = max(float((int(i) + 0.5) * (bin_edges[1] - bin_edges[0])), 1e-5)
+
+
+def compute_kl_thresholds(data, bitwidth, chunk_size=64):
+    r"""
+    Using KL-J Distance to calculate the clip thresholds of a stack of tensors, for example weights of each layer or
+    each channel. All candidate thresholds of tensors with the same number of histogram bins are evaluated together.
+
+    Args:
+        - **data** (Union[NumpyArray, list[NumpyArray]]) - Data observed to calculate the thresholds for quantization,
+          each element along the first axis is a tensor.
+        - **bitwidth** (QuantDtype) - The datatype of quantization.
+        - **chunk_size** (int) - The maximum number of candidate thresholds evaluated together over all tensors,
+          which bounds the memory to about `chunk_size` * bins elements per temporary array. At least one candidate of
+          each tensor is evaluated together. None means no limit. Default: 64.
+    Outputs:
+        NumpyArray with Shape (N,). Thresholds of each tensor.
+    """
+    thresholds = np.full(len(data), 1e-5)
+    histograms = []
+    for idx, tensor in enumerate(data):
+        hist, bin_edges = _kl_histogram(tensor)
+        if hist is not None:
+            histograms.append((idx, hist, bin_edges))
+    _fill_kl_thresholds(thresholds, histograms, bitwidth, chunk_size)
+    return thresholds
+
+
+def compute_kl_threshold_from_histogram(hist, bin_edges, bitwidth, chunk_size=64):
+    r"""
+    Using KL-J Distance to calculate the clip threshold from the histogram of absolute value of data, for example
+    the histogram collected by `HistogramObserver`, so that data needs not to be kept in memory.
+
+    Args:
+        - **hist** (NumpyArray) - Counts of absolute value of data in each bin.
+        - **bin_edges** (NumpyArray) - Uniform bin edges of histogram starting from 0, with length len(hist) + 1.
+        - **bitwidth** (QuantDtype) - The datatype of quantization.
+        - **chunk_size** (int) - The maximum number of candidate thresholds evaluated together. None means no limit.
+          Default: 64.
+    Outputs:
+        Float. Threshold to calculate the data.
+    """
+    hist = np.asarray(hist, dtype=np.float64)
+    bin_edges = np.asarray(bin_edges, dtype=np.float64)
+    if len(bin_edges) != len(hist) + 1:
+        raise ValueError(f"The length of 'bin_edges' should be {len(hist) + 1}, but got {len(bin_edges)}.")
+    thresholds = np.full(1, 1e-5)
+    total = np.sum(hist)
+    if total > 0 and bin_edges[-1] >= 1e-5:
+        _fill_kl_thresholds(thresholds, [(0, hist / total, bin_edges)], bitwidth, chunk_size)
+    return float(thresholds[0])
+
+
+def compute_kl_threshold(data, bitwidth, chunk_size=64):
+    r"""
+    Using KL-J Distance to calculate the clip threshold.
+
+    Args:
+        - **data** (NumpyArray) - Data observed to calculate the threshold for quantization,
+        - **bitwidth** (QuantDtype) - The datatype of quantization.
+        - **chunk_size** (int) - The maximum number of candidate thresholds evaluated together. None means no limit.
+          Default: 64.
+    Outputs:
+        Tensor with Shape 1. Threshold to calculate the data.
+    """
+    return float(compute_kl_thresholds([data], bitwidth, chunk_size)[0])
@@ -16,15 +16,25 @@
 import copy
 from typing import Optional
 from mindspore.rewrite import Node, NodeType
-from mindspore.nn import Cell
+from mindspore.nn import Cell, SequentialCell, CellList
+from mindspore import log as logger
+from mindspore_gs.validator import Validator
 from .net_policy import NetPolicy
 from .layer_policy import LayerPolicy, layer_policy_key
 from .transformer import Transformer
 from .quantize_wrapper_cell import QuantizeWrapperCell
+from .rewrite_cache import RewriteCache, fused_cells_key
 from ..comp_algo import CompAlgo
 from ..net_transform import NetTransformer
 
 
+class _FusedCell(Cell):
+    """Placeholder of a cell which has been fused into the previous cell, returns input unchanged."""
+
+    def construct(self, x):
+        return x
+
+
 class QuantizationAwareTraining(CompAlgo):
     """
     Derived class of `CompAlgo`. Base class of QAT-algorithm.
@@ -35,80 +45,95 @@ class QuantizationAwareTraining(CompAlgo):
         self._qat_policy = None
         self._custom_transforms = None
         self._custom_layer_policy_map = None
+        self._rewrite_cache = None
         self.net_transformer = None
 
-    def _propagate_layer_policy(self, net_transformer: NetTransformer):
+    def set_rewrite_cache(self, rewrite_cache: Optional[RewriteCache]):
         """
-        Set layer_policy for every layer according to custom_layer_policy_map, layer_policy_map and net_layer_policy in
-        QuantAwareTraining. custom_layer_policy_map is in first priority, layer_policy_map is in second priority and
-        net_layer_policy is in last priority.
+        Set cache of rewrite plans. When the plan of a network is cached, `apply` replays the plan on network
+        instead of parsing and rewriting network.
 
         Args:
-            nodes (List[Node]): nodes to be checked between which may find redundant fake-quantizer
-        """
+            rewrite_cache (RewriteCache): Cache of rewrite plans, None means not caching.
 
-        # step1 apply net layer-policy first
-        net_layer_policy: Optional[LayerPolicy] = self._qat_policy.get_net_layer_policy()
-        if net_layer_policy:
-            for node in net_transformer.nodes():
-                node.set_attribute(layer_policy_key, copy.copy(net_layer_policy))
-        # step2 then apply layer-policy map, override policy if need
-        layer_policy_map = self._qat_policy.get_layer_policy_map()
-        for node in net_transformer.nodes():
-            if not isinstance(node, Node):
-                continue
-            layer_policy: LayerPolicy = self._custom_layer_policy_map.get(node.get_instance_type())
-            if layer_policy is None:
-                layer_policy = layer_policy_map.get(node.get_instance_type())
-            if isinstance(layer_policy, LayerPolicy):
-                new_layer_policy = copy.deepcopy(layer_policy)
-                new_layer_policy.set_input_number(len(node.get_inputs()))
-                node.set_attribute(layer_policy_key, new_layer_policy)
+        Raises:
+            TypeError: If `rewrite_cache` is not RewriteCache or None.
+        """
+        if rewrite_cache is not None:
+            Validator.check_value_type("rewrite_cache", rewrite_cache, [RewriteCache], self.__class__.__name__)
+        self._rewrite_cache = rewrite_cache
 
-        for node in net_transformer.nodes():
-            if node.get_node_type() == NodeType.Tree:
-                sub_net_trans = NetTransformer.create_from_tree_node(node)
-                self._propagate_layer_policy(sub_net_trans)
+    def _get_layer_policy(self, instance_type) -> Optional[LayerPolicy]:
+        """Get layer policy of `instance_type`, custom_layer_policy_map is in higher priority than layer_policy_map."""
+        layer_policy = self._custom_layer_policy_map.get(instance_type)
+        if layer_policy is None:
+            layer_policy = self._qat_policy.get_layer_policy_map().get(instance_type)
+        return layer_policy
 
-    @staticmethod
-    def _reduce_redundant_fake_quant(net_transformer: NetTransformer):
+    def _get_node_policy(self, node: Node, policies: dict) -> Optional[LayerPolicy]:
         """
-        Reduce redundant fake-quantizer node between nodes. It usually occurs when pre-node inserted output
-        fake-quantizer and post-node inserted input fake-quantizer at the same time.
+        Get layer_policy of `node` according to custom_layer_policy_map, layer_policy_map and net_layer_policy in
+        QuantAwareTraining. custom_layer_policy_map is in first priority, layer_policy_map is in second priority and
+        net_layer_policy is in last priority. Layer policy is cloned when `node` is queried for the first time, and is
+        memorized in `policies`.
 
         Args:
-            nodes (List[Node]): nodes to be checked between which may find redundant fake-quantizer
+            node (Node): Node to get layer policy.
+            policies (dict): Layer policies of nodes queried, keys are node names.
+
+        Returns:
+            Layer policy of `node`, None if `node` has no layer policy.
         """
+        name = node.get_name()
+        if name in policies:
+            return policies[name]
+        layer_policy: LayerPolicy = self._get_layer_policy(node.get_instance_type())
+        if isinstance(layer_policy, LayerPolicy):
+            layer_policy = layer_policy.clone()
+            layer_policy.set_input_number(len(node.get_inputs()))
+        else:
+            net_layer_policy: Optional[LayerPolicy] = self._qat_policy.get_net_layer_policy()
+            layer_policy = net_layer_policy.clone() if net_layer_policy else None
+        if layer_policy is not None:
+            node.set_attribute(layer_policy_key, layer_policy)
+        policies[name] = layer_policy
+        return layer_policy
 
-        for node in net_transformer.nodes():
-            if not isinstance(node, Node):
-                continue
-            if node.get_node_type() == NodeType.Tree:
-                sub_net_trans = NetTransformer.create_from_tree_node(node)
-                QuantizationAwareTraining._reduce_redundant_fake_quant(sub_net_trans)
-            cur_policy: LayerPolicy = node.get_attribute(layer_policy_key)
-            # cur-node has no quant policy, so no fq will insert into its inputs
-            if cur_policy is None:
+    def _reduce_redundant_fake_quant(self, node: Node, policies: dict) -> Optional[LayerPolicy]:
+        """
+        Reduce redundant fake-quantizer between `node` and its input nodes. It usually occurs when pre-node inserted
+        output fake-quantizer and post-node inserted input fake-quantizer at the same time.
+
+        Args:
+            node (Node): Node whose input fake-quantizers are checked.
+            policies (dict): Layer policies of nodes queried, keys are node names.
+
+        Returns:
+            Layer policy of `node`, None if `node` has no layer policy.
+        """
+        cur_policy = self._get_node_policy(node, policies)
+        # cur-node has no quant policy, so no fq will insert into its inputs
+        if cur_policy is None:
+            return None
+        cur_in_quantizer = cur_policy.get_input_quantizer()
+        # cur-node's input quantizer is None, so no fq will insert into its inputs
+        if cur_in_quantizer is None:
+            return cur_policy
+        input_nodes = node.get_inputs()
+        for i in range(0, len(input_nodes)):
+            pre_policy: LayerPolicy = self._get_node_policy(input_nodes[i], policies)
+            # pre-node has no quant policy, so no fq will insert into its outputs
+            if pre_policy is None:
                 continue
-            cur_in_quantizer = cur_policy.get_input_quantizer()
-            # cur-node's input quantizer is None, so no fq will insert into its inputs
-            if cur_in_quantizer is None:
+            pre_out_quantizer = pre_policy.get_output_quantizer()
+            # pre-node's output quantizer is None, so no fq will insert into its outputs
+            # or input fq of cur-node and output fq of pre-node are different
+            if type(pre_out_quantizer) is not type(cur_in_quantizer):
                 continue
-            input_nodes = node.get_inputs()
-            for i in range(0, len(input_nodes)):
-                input_node: Node = input_nodes[i]
-                pre_policy: LayerPolicy = input_node.get_attribute(layer_policy_key)
-                # pre-node has no quant policy, so no fq will insert into its outputs
-                if pre_policy is None:
-                    continue
-                pre_out_quantizer = pre_policy.get_output_quantizer()
-                # pre-node's output quantizer is None, so no fq will insert into its outputs
-                # or input fq of cur-node and output fq of pre-node are different
-                if type(pre_out_quantizer) is not type(cur_in_quantizer):
-                    continue
-                # input fq of cur-node and output fq of pre-node are same type
-                # so we mark input fq of cur-node as redundant
-                cur_policy.set_input_not_insert_fq(i)
+            # input fq of cur-node and output fq of pre-node are same type
+            # so we mark input fq of cur-node as redundant
+            cur_policy.set_input_not_insert_fq(i)
+        return cur_policy
 
     def _apply_fuse_patterns(self, net_transformer: NetTransformer):
         """
@@ -119,14 +144,19 @@ class QuantizationAwareTraining(CompAlgo):
             net_transformer (NetTransformer): net_transformer is used to apply transforms to graph.
         """
 
-        transformers: [Transformer] = self._qat_policy.get_transformers()
+        transformers: [Transformer] = []
+        for pattern_engine in self._qat_policy.get_transformers():
+            if isinstance(pattern_engine, Transformer):
+                transformers.append(pattern_engine)
+            else:
+                net_transformer.pattern_transform(pattern_engine)
         if isinstance(self._custom_transforms, list):
             for transform in self._custom_transforms:
                 if isinstance(transform, Transformer):
                     transformers.append(transform)
-        for transformer in transformers:
-            # Transformer always return False
-            net_transformer.pattern_transform(transformer)
+        # graph is traversed once for all Transformers, Transformer always return False
+        if transformers:
+            Transformer.apply_transformers(net_transformer.get_symbol_tree(), transformers)
 
     @staticmethod
     def _replace_node(net_transformer: NetTransformer, target_node: Node, result_cell: Cell):
@@ -138,26 +168,34 @@ class QuantizationAwareTraining(CompAlgo):
                                           target_node.get_kwargs(), node_name)
         net_transformer.replace(target_node, [node])
 
-    @staticmethod
-    def _apply_layer_policy(net_transformer: NetTransformer):
+    def _apply_layer_policies(self, net_transformer: NetTransformer, records: Optional[list] = None):
         """
-        Apply layer-policy to corresponding layer.
-        Replace layer with return value of wrap_cell of layer-policy by default.
+        Propagate layer policies, reduce redundant fake-quantizers and replace layers with return value of wrap_cell
+        of layer-policy in one traversal. Every node is visited once, the transformer of each sub-tree is created once,
+        and layer policies are cloned only for nodes queried.
 
         Args:
             net_transformer (NetTransformer): net_transformer is used to transform node according to layer policy.
+            records (list): If not None, every wrapped cell is appended to it with its node name and layer policy.
         """
-        nodes = list(net_transformer.nodes())
-        for node in nodes:
+        policies = {}
+        wrapped_nodes = []
+        for node in list(net_transformer.nodes()):
             if node.get_node_type() == NodeType.Tree:
-                sub_net_transformer = NetTransformer.create_from_tree_node(node)
-                QuantizationAwareTraining._apply_layer_policy(sub_net_transformer)
+                self._apply_layer_policies(NetTransformer.create_from_tree_node(node), records)
+                # policy of sub-tree node is only used to reduce redundant fake-quantizers of its outputs
+                self._reduce_redundant_fake_quant(node, policies)
                 continue
-            layer_policy = node.get_attribute(layer_policy_key)
+            layer_policy = self._reduce_redundant_fake_quant(node, policies)
             if isinstance(layer_policy, LayerPolicy):
-                wrapped_cell = layer_policy.wrap_cell(node.get_instance())
-                wrapped_cell.update_parameters_name(node.get_name() + '.')
-                QuantizationAwareTraining._replace_node(net_transformer, node, wrapped_cell)
+                wrapped_nodes.append((node, layer_policy))
+        # nodes are replaced after all nodes are visited, since policy of input node is needed by its outputs
+        for node, layer_policy in wrapped_nodes:
+            if records is not None:
+                records.append((node.get_instance(), node.get_name(), layer_policy))
+            wrapped_cell = layer_policy.wrap_cell(node.get_instance())
+            wrapped_cell.update_parameters_name(node.get_name() + '.')
+            QuantizationAwareTraining._replace_node(net_transformer, node, wrapped_cell)
 
     def apply(self, network: Cell) -> Cell:
         """
@@ -169,6 +207,12 @@ class QuantizationAwareTraining(CompAlgo):
         3. Reduce redundant fake quantizers when they are redundant.
         4. Apply layer policies to convert normal cell to `QuantizeWrapperCell`.
 
+        Step 2 to 4 are done in one traversal of network.
+
+        If a `RewriteCache` is set by `set_rewrite_cache` and it has the plan of `network`, the plan is replayed on a
+        deep copy of `network` by replacing cells instead, so that `network` is left unchanged and a new network is
+        returned as rewrite does.
+
         Args:
             network (Cell): Network to be quantized.
 
@@ -178,9 +222,117 @@ class QuantizationAwareTraining(CompAlgo):
 
         if not isinstance(self._qat_policy, NetPolicy):
             raise RuntimeError("Derived class should provide net policy")
+        if self._rewrite_cache is None:
+            return self._transform(network)
+        key = RewriteCache.plan_key(network, self._algo_signature())
+        source_hash = RewriteCache.source_hash(network)
+        if source_hash is None:
+            logger.info(f"Source of network '{type(network).__name__}' is not available, rewrite plan is not cached.")
+            return self._transform(network)
+        plan = self._rewrite_cache.get(key, source_hash)
+        if plan is not None:
+            return self._replay_plan(copy.deepcopy(network), plan)
+        cell_paths = {id(cell): name for name, cell in network.cells_and_names()}
+        records = []
+        net_opt = self._transform(network, records)
+        plan = self._create_plan(cell_paths, records)
+        if plan is not None:
+            self._rewrite_cache.put(key, source_hash, plan)
+        return net_opt
+
+    def _transform(self, network: Cell, records: Optional[list] = None) -> Cell:
+        """Transform `network` by rewrite, wrapped cells are recorded into `records` if it is not None."""
         self.net_transformer = NetTransformer(network)
         self._apply_fuse_patterns(self.net_transformer)
-        self._propagate_layer_policy(self.net_transformer)
-        QuantizationAwareTraining._reduce_redundant_fake_quant(self.net_transformer)
-        QuantizationAwareTraining._apply_layer_policy(self.net_transformer)
+        self._apply_layer_policies(self.net_transformer, records)
         return self.net_transformer.get_network()
+
+    def _algo_signature(self) -> str:
+        """Describe algorithm and its config, which decides the rewrite plan together with network structure."""
+        config = sorted(f"{key}={value!r}" for key, value in vars(self._config).items())
+        custom_policies = sorted(f"{getattr(layer_type, '__qualname__', layer_type)}:{type(policy).__qualname__}"
+                                 for layer_type, policy in (self._custom_layer_policy_map or {}).items())
+        custom_transforms = []
+        if isinstance(self._custom_transforms, list):
+            custom_transforms = [f"{type(transform).__qualname__}:{transform.root_type()}"
+                                 for transform in self._custom_transforms if isinstance(transform, Transformer)]
+        return "\n".join([type(self).__qualname__] + config + custom_policies + custom_transforms)
+
+    @staticmethod
+    def _get_fused_cells(net_transformer: NetTransformer) -> list:
+        """Get the fused cells and the cells fused into them of all nodes created by fusion pattern engines."""
+        fused = []
+        for node in net_transformer.nodes():
+            if node.get_node_type() == NodeType.Tree:
+                fused.extend(QuantizationAwareTraining._get_fused_cells(NetTransformer.create_from_tree_node(node)))
+                continue
+            cells = node.get_attribute(fused_cells_key)
+            if cells is not None:
+                fused.append((node.get_instance(), cells))
+        return fused
+
+    def _create_plan(self, cell_paths: dict, records: list) -> Optional[dict]:
+        """
+        Create rewrite plan from fusion decisions and wrapped cells of the last transform. Return None if network is
+        not replayable by replacing cells, for example a layer policy is applied on a node which is not a cell of
+        network.
+        """
+        if self._qat_policy.get_net_layer_policy() is not None:
+            return None
+        fusions = []
+        for fused_cell, cells in QuantizationAwareTraining._get_fused_cells(self.net_transformer):
+            paths = [cell_paths.get(id(cell)) if cell is not None else None for cell in cells]
+            if paths[0] is None or any(cell is not None and path is None for cell, path in zip(cells, paths)):
+                return None
+            cell_paths[id(fused_cell)] = paths[0]
+            fusions.append(paths)
+        layers = []
+        for cell, node_name, layer_policy in records:
+            path = cell_paths.get(id(cell))
+            if not path or path in [layer["path"] for layer in layers]:
+                logger.info(f"Node '{node_name}' is not a unique cell of network, rewrite plan is not cached.")
+                return None
+            layers.append({"path": path, "name": node_name,
+                           "inputs_insert_fq": list(layer_policy.get_input_need_insert_fq()),
+                           "output_insert_fq": layer_policy.get_output_quantizer() is not None})
+        return {"fusions": fusions, "layers": layers}
+
+    @staticmethod
+    def _get_cell(network: Cell, path: str) -> Cell:
+        cell = network
+        for name in path.split("."):
+            cell = cell.name_cells()[name]
+        return cell
+
+    @staticmethod
+    def _set_cell(network: Cell, path: str, new_cell: Cell):
+        """Replace the cell of `network` at `path` with `new_cell`."""
+        parent_path, _, name = path.rpartition(".")
+        parent = QuantizationAwareTraining._get_cell(network, parent_path) if parent_path else network
+        if isinstance(parent, (SequentialCell, CellList)):
+            parent[int(name)] = new_cell
+        else:
+            setattr(parent, name, new_cell)
+
+    def _replay_plan(self, network: Cell, plan: dict) -> Cell:
+        """Replay cached rewrite `plan` on `network` by replacing cells in place."""
+        self.net_transformer = None
+        for paths in plan["fusions"]:
+            cells = [QuantizationAwareTraining._get_cell(network, path) if path else None for path in paths]
+            QuantizationAwareTraining._set_cell(network, paths[0], self._qat_policy.fuse_cells(cells))
+            for path in paths[1:]:
+                if path:
+                    QuantizationAwareTraining._set_cell(network, path, _FusedCell())
+        for layer in plan["layers"]:
+            cell = QuantizationAwareTraining._get_cell(network, layer["path"])
+            layer_policy = self._get_layer_policy(type(cell)).clone()
+            layer_policy.set_input_number(len(layer["inputs_insert_fq"]))
+            for i, insert_fq in enumerate(layer["inputs_insert_fq"]):
+                if not insert_fq:
+                    layer_policy.set_input_not_insert_fq(i)
+            if not layer["output_insert_fq"]:
+                layer_policy.set_output_not_insert_fq()
+            wrapped_cell = layer_policy.wrap_cell(cell)
+            QuantizationAwareTraining._set_cell(network, layer["path"], wrapped_cell)
+            wrapped_cell.update_parameters_name(layer["name"] + '.')
+        return network
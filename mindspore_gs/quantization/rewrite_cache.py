@@ -0,0 +1,202 @@
+# Copyright 2023 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""RewriteCache."""
+import os
+import json
+import hashlib
+import inspect
+from typing import Optional
+
+from mindspore.nn import Cell
+from mindspore import log as logger
+from mindspore_gs.validator import Validator
+
+fused_cells_key = "fused_cells"
+
+
+class RewriteCache:
+    """
+    Cache of rewrite plans of `QuantizationAwareTraining.apply`.
+
+    Parsing and rewriting network by `SymbolTree` is slow for large networks, and is repeated for every experiment on
+    the same architecture. A rewrite plan records the fusion decisions and the layer-policy assignment of every cell
+    of a network. When `apply` is called again on a network of the same architecture with the same algorithm config,
+    the plan is replayed by replacing cells of a deep copy of network, without parsing network.
+
+    A plan is keyed by the structure of network and algorithm config, and stores the hash of the source of every cell
+    class in network. If source of any class changes, the stale plan is invalidated automatically on lookup.
+
+    Args:
+        cache_dir (str): Directory to persist plans as json files, so that plans are shared between processes. None
+            means plans are only kept in memory. Default: None.
+
+    Raises:
+        TypeError: If `cache_dir` is not str or None.
+
+    Examples:
+        >>> from mindspore_gs.quantization import SimulatedQuantizationAwareTraining, RewriteCache
+        >>> cache = RewriteCache("./rewrite_cache")
+        >>> algo = SimulatedQuantizationAwareTraining()
+        >>> algo.set_rewrite_cache(cache)
+        >>> net_opt = algo.apply(LeNet5(10))
+        >>> net_opt = algo.apply(LeNet5(10))
+        >>> print(cache.get_stats())
+        {'hits': 1, 'misses': 1, 'invalidations': 0}
+    """
+
+    version = 1
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        if cache_dir is not None:
+            Validator.check_value_type("cache_dir", cache_dir, [str], self.__class__.__name__)
+            cache_dir = os.path.realpath(cache_dir)
+            os.makedirs(cache_dir, exist_ok=True)
+        self._cache_dir = cache_dir
+        self._plans = {}
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _class_name(cls) -> str:
+        return f"{cls.__module__}.{cls.__qualname__}"
+
+    @staticmethod
+    def source_hash(network: Cell) -> Optional[str]:
+        """
+        Hash the source of every cell class in `network`.
+
+        Args:
+            network (Cell): Network to be hashed.
+
+        Returns:
+            str, hash of source, None if source of any class is not available.
+        """
+        sources = {}
+        for _, cell in network.cells_and_names():
+            for cls in type(cell).__mro__:
+                if cls is Cell or not issubclass(cls, Cell):
+                    break
+                name = RewriteCache._class_name(cls)
+                if name in sources:
+                    continue
+                try:
+                    sources[name] = inspect.getsource(cls)
+                except (OSError, TypeError):
+                    return None
+        return RewriteCache._hash("\n".join(f"{name}\n{source}" for name, source in sorted(sources.items())))
+
+    @staticmethod
+    def plan_key(network: Cell, algo_signature: str) -> str:
+        """
+        Key of rewrite plan, determined by the cell tree of `network` and `algo_signature`.
+
+        Args:
+            network (Cell): Network to be transformed.
+            algo_signature (str): Description of algorithm and its config.
+
+        Returns:
+            str, key of rewrite plan.
+        """
+        structure = [f"{name}:{RewriteCache._class_name(type(cell))}" for name, cell in network.cells_and_names()]
+        return RewriteCache._hash("\n".join([str(RewriteCache.version), algo_signature] + structure))
+
+    def _plan_file(self, key: str) -> str:
+        return os.path.join(self._cache_dir, f"{key}.json")
+
+    def _load(self, key: str) -> Optional[dict]:
+        """Load plan from memory, or from `cache_dir` if plan is not in memory."""
+        plan = self._plans.get(key)
+        if plan is not None or self._cache_dir is None:
+            return plan
+        plan_file = self._plan_file(key)
+        if not os.path.exists(plan_file):
+            return None
+        try:
+            with open(plan_file, "r", encoding="utf-8") as f:
+                plan = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load rewrite plan from {plan_file}: {e}")
+            return None
+        self._plans[key] = plan
+        return plan
+
+    def _remove(self, key: str):
+        self._plans.pop(key, None)
+        if self._cache_dir is not None and os.path.exists(self._plan_file(key)):
+            os.remove(self._plan_file(key))
+
+    def get(self, key: str, source_hash: str) -> Optional[dict]:
+        """
+        Get rewrite plan by `key`. Plan recorded from source different from `source_hash` is removed.
+
+        Args:
+            key (str): Key of rewrite plan returned by `plan_key`.
+            source_hash (str): Hash of current source returned by `source_hash`.
+
+        Returns:
+            dict, rewrite plan, None if plan is not cached or is stale.
+        """
+        plan = self._load(key)
+        if plan is not None and plan.get("source_hash") != source_hash:
+            self._remove(key)
+            self._invalidations += 1
+            plan = None
+        if plan is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return plan
+
+    def put(self, key: str, source_hash: str, plan: dict):
+        """
+        Cache rewrite `plan` under `key`.
+
+        Args:
+            key (str): Key of rewrite plan returned by `plan_key`.
+            source_hash (str): Hash of source returned by `source_hash`, which `plan` is recorded from.
+            plan (dict): Rewrite plan.
+        """
+        plan = dict(plan, source_hash=source_hash)
+        self._plans[key] = plan
+        if self._cache_dir is None:
+            return
+        plan_file = self._plan_file(key)
+        tmp_file = f"{plan_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(plan, f)
+        os.replace(tmp_file, plan_file)
+
+    def clear(self):
+        """Remove all cached plans, including plans persisted in `cache_dir`."""
+        for key in list(self._plans.keys()):
+            self._remove(key)
+        if self._cache_dir is not None:
+            for file_name in os.listdir(self._cache_dir):
+                if file_name.endswith(".json"):
+                    os.remove(os.path.join(self._cache_dir, file_name))
+
+    def get_stats(self) -> dict:
+        """
+        Get statistics of cache.
+
+        Returns:
+            dict, the number of hits, misses and invalidations of stale plans.
+        """
+        return {"hits": self._hits, "misses": self._misses, "invalidations": self._invalidations}
@@ -17,5 +17,6 @@ MindSpore golden stick simulated-quantization.
 """
 
 from .simulated_quantization_aware_training import SimulatedQuantizationAwareTraining
+from .simulated_post_training_quantization import SimulatedPostTrainingQuantization
 
-__all__ = ["SimulatedQuantizationAwareTraining"]
+__all__ = ["SimulatedQuantizationAwareTraining", "SimulatedPostTrainingQuantization"]
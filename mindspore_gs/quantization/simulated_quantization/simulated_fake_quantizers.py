@@ -23,39 +23,71 @@ from mindspore.common.tensor import Tensor
 from mindspore.common.dtype import QuantDtype
 import mindspore.context as context
 from mindspore_gs.ops.common.quant_op_utils import get_quant_dtype_num_bits
-from ..fake_quantizer import FakeQuantizer
+from mindspore_gs.ops import operations as GQ
+from mindspore_gs.ops.operations import MinMaxUpdateFakeQuantPerLayer, MinMaxUpdateFakeQuantPerChannel
+from ..fake_quantizer import FakeQuantizer, FreezableObserver
 from ..quant_utils import get_quant_min_max, cal_quantization_params, LinearFakeQuantCell
 
 
-class SimulatedFakeQuantizerPerLayer(FakeQuantizer):
+class SimulatedFakeQuantizerPerLayer(FreezableObserver, FakeQuantizer):
     """
     Implement of SimFakeQuantizer.
     1. statistic the min max value passing through this op
     2. run fake quant execution to simulate the quantize loss
+
+    If `observer_freezable` is True, after `freeze_observer` is called, range is no longer updated in training, and
+    data is fake quantized with the frozen range. Otherwise the frozen path is not built into graph.
+
+    If `bypass_quant_delay` is True and `quant_delay` is positive, data is passed through without launching any
+    observer or fake quant kernel until `enable_quant` is called, usually by `QuantDelaySwitchCallback` at step
+    `quant_delay`. Kernels are built without quant delay in this case, because their internal step counters do not
+    advance while bypassed.
     """
 
+    _per_channel = False
+
     def __init__(self, ema=False, ema_decay=0.999, symmetric=False, narrow_range=False, quant_dtype=QuantDtype.INT8,
-                 quant_delay=0):
+                 quant_delay=0, bypass_quant_delay=False, observer_freezable=False):
         super(SimulatedFakeQuantizerPerLayer, self).__init__()
         self._ema = ema
         self._ema_decay = ema_decay
         self._symmetric = symmetric
         self._quant_dtype = quant_dtype
         self._quant_delay = quant_delay
+        self._bypass_quant_delay = bypass_quant_delay and quant_delay > 0
+        self._kernel_quant_delay = 0 if self._bypass_quant_delay else quant_delay
         self._narrow_range = narrow_range
         self._num_bits = get_quant_dtype_num_bits(self._quant_dtype)
         self._signed = self._quant_dtype.value() <= 15
-        self._min_max_update_func = Q.MinMaxUpdatePerLayer(ema=self._ema, ema_decay=self._ema_decay)
         self._is_ascend = context.get_context("device_target") == "Ascend"
-        quant_func = Q.FakeQuantPerLayer
-        if context.get_context("device_target") == "GPU":
+        # MindSpore has no CPU kernels of quant ops, so GSCustom ops are used on CPU.
+        self._use_gs_ops = context.get_context("device_target") == "CPU" and \
+            self._num_bits in GQ.FakeQuantPerLayer.support_quant_bit
+        if self._use_gs_ops:
+            self._min_max_update_func = GQ.MinMaxUpdatePerLayer(ema=self._ema, ema_decay=self._ema_decay)
+            quant_func = GQ.FakeQuantPerLayer
+        else:
             self._min_max_update_func = Q.MinMaxUpdatePerLayer(ema=self._ema, ema_decay=self._ema_decay)
             quant_func = Q.FakeQuantPerLayer
         self._init_fake_quant_func(quant_func)
+        # on CPU, range update and fake quant of training are fused into one kernel which scans data once.
+        self._use_fused = self._use_gs_ops and self._num_bits in MinMaxUpdateFakeQuantPerLayer.support_quant_bit
+        self._fused_train = None
+        # per channel subclass builds its own fused op.
+        if self._use_fused and not self._per_channel:
+            self._fused_train = MinMaxUpdateFakeQuantPerLayer(num_bits=self._num_bits, ema=self._ema,
+                                                              ema_decay=self._ema_decay,
+                                                              quant_delay=self._kernel_quant_delay,
+                                                              symmetric=self._symmetric,
+                                                              narrow_range=self._narrow_range)
         self._float_min = Parameter(Tensor(np.array([-6]).astype(np.float32), mindspore.float32),
                                     name="float_min", requires_grad=False)
         self._float_max = Parameter(Tensor(np.array([6]).astype(np.float32), mindspore.float32),
                                     name="float_max", requires_grad=False)
+        self._calibrator = None
+        self._init_observer_freeze(observer_freezable)
+        self.quant_enabled = Parameter(Tensor(0 if self._bypass_quant_delay else 1, mindspore.float32),
+                                       name="quant_enabled", requires_grad=False)
 
     def _init_fake_quant_func(self, quant_func):
         """
@@ -65,7 +97,7 @@ class SimulatedFakeQuantizerPerLayer(FakeQuantizer):
             self._fake_quant_train = quant_func(num_bits=self._num_bits,
                                                 symmetric=self._symmetric,
                                                 narrow_range=self._narrow_range,
-                                                quant_delay=self._quant_delay)
+                                                quant_delay=self._kernel_quant_delay)
             self._fake_quant_infer = self._fake_quant_train
         else:
             quant_func = partial(quant_func,
@@ -74,7 +106,7 @@ class SimulatedFakeQuantizerPerLayer(FakeQuantizer):
                                  num_bits=self._num_bits,
                                  symmetric=self._symmetric,
                                  narrow_range=self._narrow_range,
-                                 quant_delay=self._quant_delay)
+                                 quant_delay=self._kernel_quant_delay)
             self._fake_quant_train = quant_func(training=True)
             self._fake_quant_infer = quant_func(training=False)
 
@@ -93,8 +125,57 @@ class SimulatedFakeQuantizerPerLayer(FakeQuantizer):
         scale, zp = cal_quantization_params(input_min, input_max, quant_min, quant_max, symmetric=self._symmetric)
         return input_min, input_max, scale, zp
 
+    def set_calibrator(self, calibrator):
+        """
+        Set calibrator which observes data passing through this quantizer. Data is not fake-quantized while a
+        calibrator is set, and calibrator can only be called in PyNative mode.
+
+        Args:
+            calibrator (Union[Callable, None]): Callable which receives the data passing through this quantizer.
+                None means leaving calibration mode.
+        """
+        self._calibrator = calibrator
+
+    def enable_quant(self):
+        """Stop bypassing data, observer and fake quant kernels are launched in later steps."""
+        self.quant_enabled.set_data(Tensor(1, mindspore.float32))
+
+    def is_quant_enabled(self):
+        """
+        Whether observer and fake quant kernels are launched, always True if quant delay is not bypassed.
+
+        Returns:
+            bool, whether observer and fake quant kernels are launched.
+        """
+        return bool(self.quant_enabled.asnumpy() != 0)
+
+    def set_min_max(self, float_min, float_max):
+        """
+        Set the float range of data to be quantized, for example the range collected by calibration.
+
+        Args:
+            float_min (numpy.ndarray): Minimum value of data, the shape is the same as `_float_min`.
+            float_max (numpy.ndarray): Maximum value of data, the shape is the same as `_float_max`.
+        """
+        self._float_min.set_data(Tensor(np.reshape(float_min, self._float_min.shape).astype(np.float32)))
+        self._float_max.set_data(Tensor(np.reshape(float_max, self._float_max.shape).astype(np.float32)))
+
     def construct(self, x):
+        if self._calibrator is not None:
+            self._calibrator(x)
+            return x
+        if self._bypass_quant_delay:
+            if self.quant_enabled == 0:
+                # still in quant delay, skip observer and fake quant.
+                return x
         if self.training:
+            if self._observer_freezable:
+                if self.observer_frozen != 0:
+                    # range is frozen, skip reduction of data.
+                    return self._fake_quant_train(x, self._float_min, self._float_max)
+            if self._use_fused:
+                out, self._float_min, self._float_max = self._fused_train(x, self._float_min, self._float_max)
+                return out
             self._float_min, self._float_max = \
                 self._min_max_update_func(x, self._float_min, self._float_max)
             out = self._fake_quant_train(x, self._float_min, self._float_max)
@@ -116,27 +197,41 @@ class SimulatedFakeQuantizerPerChannel(SimulatedFakeQuantizerPerLayer):
     Derived from SimFakeQuantizerPerLayer, perchannel version of sim fake quantizer
     """
 
+    _per_channel = True
+
     def __init__(self, num_channels=1, channel_axis=1, ema=False, ema_decay=0.999, symmetric=False, narrow_range=False,
-                 quant_dtype=QuantDtype.INT8, quant_delay=0):
+                 quant_dtype=QuantDtype.INT8, quant_delay=0, bypass_quant_delay=False, observer_freezable=False):
         super(SimulatedFakeQuantizerPerChannel, self).__init__(ema=ema, ema_decay=ema_decay, symmetric=symmetric,
                                                                narrow_range=narrow_range, quant_dtype=quant_dtype,
-                                                               quant_delay=quant_delay)
+                                                               quant_delay=quant_delay,
+                                                               bypass_quant_delay=bypass_quant_delay,
+                                                               observer_freezable=observer_freezable)
         self._channel_axis = channel_axis
         self._num_channels = num_channels
         self._float_min = Parameter(Tensor(np.array([-6] * self._num_channels).astype(np.float32), mindspore.float32),
                                     name="float_min", requires_grad=False)
         self._float_max = Parameter(Tensor(np.array([6] * self._num_channels).astype(np.float32), mindspore.float32),
                                     name="float_max", requires_grad=False)
-        self._min_max_update_func = Q.MinMaxUpdatePerChannel(channel_axis=self._channel_axis, ema=self._ema,
-                                                             ema_decay=self._ema_decay)
-        quant_func = partial(Q.FakeQuantPerChannel, channel_axis=self._channel_axis)
-        self._is_ascend = context.get_context("device_target") == "Ascend"
-        if context.get_context("device_target") == "GPU":
-            self._min_max_update_func = Q.MinMaxUpdatePerChannel(channel_axis=self._channel_axis,
-                                                                 ema=self._ema,
+        # GSCustom kernels split channels along the first axis, so they are only used for channel axis 0.
+        self._use_gs_ops = self._use_gs_ops and self._channel_axis == 0
+        if self._use_gs_ops:
+            self._min_max_update_func = GQ.MinMaxUpdatePerChannel(channel_axis=self._channel_axis, ema=self._ema,
+                                                                  ema_decay=self._ema_decay)
+            quant_func = partial(GQ.FakeQuantPerChannel, channel_axis=self._channel_axis)
+        else:
+            self._min_max_update_func = Q.MinMaxUpdatePerChannel(channel_axis=self._channel_axis, ema=self._ema,
                                                                  ema_decay=self._ema_decay)
             quant_func = partial(Q.FakeQuantPerChannel, channel_axis=self._channel_axis)
         self._init_fake_quant_func(quant_func)
+        # fused kernel splits channels along the first axis as well, so only channel axis 0 is fused.
+        self._use_fused = self._use_fused and self._use_gs_ops
+        if self._use_fused:
+            self._fused_train = MinMaxUpdateFakeQuantPerChannel(num_bits=self._num_bits, ema=self._ema,
+                                                                ema_decay=self._ema_decay,
+                                                                quant_delay=self._kernel_quant_delay,
+                                                                symmetric=self._symmetric,
+                                                                narrow_range=self._narrow_range,
+                                                                channel_axis=self._channel_axis)
 
     def extract_quant_param(self):
         quant_min, quant_max = get_quant_min_max(num_bits=self._num_bits, signed=self._signed,
@@ -0,0 +1,287 @@
+# Copyright 2023 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""SimulatedPostTrainingQuantization."""
+
+import numpy as np
+from mindspore import context
+from mindspore.nn import Cell
+from mindspore.common.tensor import Tensor
+from mindspore_gs.validator import Validator
+from mindspore_gs.ops.nn import HistogramObserver
+from mindspore_gs.ops.nn.eval_weight_cache import EvalWeightCache
+from ..quant_utils import compute_kl_thresholds
+from .simulated_quantization_aware_training import SimulatedQuantizationAwareTraining
+from .simulated_quantization_config import SimulatedPostTrainingQuantizationConfig
+from .simulated_fake_quantizers import SimulatedFakeQuantizerPerLayer, SimulatedFakeQuantizerPerChannel
+
+
+class MinMaxCalibrator:
+    """
+    Calibrator which records the minimum and maximum value of data passing through a fake quantizer.
+
+    Args:
+        channel_axis (Union[int, None]): Axis along which statistics are collected separately. None means collecting
+            statistics of the whole tensor. Default: None.
+        is_weight (bool): Whether data is weight. Weight is the same for every batch, so only statistics of the
+            latest batch are kept. Default: False.
+    """
+
+    def __init__(self, channel_axis=None, is_weight=False):
+        self._channel_axis = channel_axis
+        self._is_weight = is_weight
+        self._min = None
+        self._max = None
+
+    def _to_channels(self, x):
+        """Reshape data to a 2-D numpy array whose rows are channels."""
+        if isinstance(x, Tensor):
+            x = x.asnumpy()
+        x = np.asarray(x, dtype=np.float32)
+        if self._channel_axis is None:
+            return x.reshape(1, -1)
+        return np.moveaxis(x, self._channel_axis, 0).reshape(x.shape[self._channel_axis], -1)
+
+    def _update_min_max(self, channels):
+        """Update minimum and maximum value with data of one batch."""
+        batch_min = channels.min(axis=1)
+        batch_max = channels.max(axis=1)
+        if self._min is None or self._is_weight:
+            self._min, self._max = batch_min, batch_max
+        else:
+            self._min = np.minimum(self._min, batch_min)
+            self._max = np.maximum(self._max, batch_max)
+
+    def __call__(self, x):
+        self._update_min_max(self._to_channels(x))
+
+    def get_min_max(self):
+        """
+        Get the float range of observed data, which always contains zero.
+
+        Returns:
+            2-tuple of numpy.ndarray, minimum and maximum value of each channel.
+
+        Raises:
+            RuntimeError: If no data is observed.
+        """
+        if self._min is None:
+            raise RuntimeError("No data is observed by calibrator, please check if network is calibrated.")
+        return np.minimum(self._min, 0), np.maximum(self._max, 0)
+
+
+class KLCalibrator(MinMaxCalibrator):
+    """
+    Calibrator which clips the range of data passing through a fake quantizer by KL-J distance. Activations are
+    accumulated into a `HistogramObserver` so that memory is bounded no matter how many batches are observed, while
+    the threshold of weight is computed from weight itself by `compute_kl_thresholds`.
+
+    Args:
+        num_bits (int): Number of bits of quantization.
+        channel_axis (Union[int, None]): Axis along which statistics are collected separately. None means collecting
+            statistics of the whole tensor. Default: None.
+        is_weight (bool): Whether data is weight. Weight is the same for every batch, so only the latest batch is
+            kept. Default: False.
+    """
+
+    def __init__(self, num_bits, channel_axis=None, is_weight=False):
+        super(KLCalibrator, self).__init__(channel_axis, is_weight)
+        self._num_bits = num_bits
+        self._data = None
+        self._observer = None
+        if not is_weight and channel_axis is None:
+            self._observer = HistogramObserver()
+
+    def __call__(self, x):
+        channels = self._to_channels(x)
+        self._update_min_max(channels)
+        if self._observer is None:
+            self._data = channels
+        else:
+            self._observer.update(channels)
+
+    def get_min_max(self):
+        float_min, float_max = super(KLCalibrator, self).get_min_max()
+        if self._observer is None:
+            thresholds = compute_kl_thresholds(self._data, self._num_bits)
+        else:
+            thresholds = np.array([self._observer.get_kl_threshold()])
+        return np.maximum(float_min, -thresholds), np.minimum(float_max, thresholds)
+
+
+class SimulatedPostTrainingQuantization(SimulatedQuantizationAwareTraining):
+    """
+    Post training static quantization built on simulated quantization. Fake quantizers are inserted into network in
+    the same way as `SimulatedQuantizationAwareTraining`, but instead of training, the quantization range of each fake
+    quantizer is calibrated by running network over a few batches of dataset, and then network can be converted by
+    `convert` directly.
+
+    Args:
+        config (dict): store attributes for post training quantization, keys are attribute names, values are
+            attribute values. Besides the attributes of `SimulatedQuantizationAwareTraining`, supported attributes
+            are listed below:
+
+            - calibration_method (str): Method used to calculate quantization range of each fake quantizer, 'min_max'
+              means the minimum and maximum value of observed data, 'kl' means the range clipped by KL-J distance.
+              Default: 'min_max'.
+            - calibration_num_batches (int): The maximum number of batches used for calibration. Default: 100.
+
+    Raises:
+        TypeError: If `calibration_method` is not str.
+        TypeError: If `calibration_num_batches` is not int.
+        ValueError: If `calibration_method` is not 'min_max' or 'kl'.
+        ValueError: If `calibration_num_batches` is not positive.
+
+    Supported Platforms:
+        ``GPU`` ``CPU``
+
+    Examples:
+        >>> from mindspore_gs.quantization.simulated_quantization import SimulatedPostTrainingQuantization
+        >>> ## 1) Define network to be quantized and dataset for calibration
+        >>> net = LeNet5(10)
+        >>> dataset = create_dataset()
+        >>> ## 2) Define PTQ Algorithm
+        >>> ptq = SimulatedPostTrainingQuantization({"calibration_method": "kl", "calibration_num_batches": 200})
+        >>> ## 3) Apply PTQ algorithm to origin network
+        >>> net_opt = ptq.apply(net)
+        >>> ## 4) Calibrate quantization range with dataset
+        >>> net_opt = ptq.calibrate(net_opt, dataset)
+        >>> ## 5) Convert to quant infer network
+        >>> net_infer = ptq.convert(net_opt)
+    """
+
+    def set_calibration_method(self, calibration_method):
+        """
+        Set value of calibration_method of post training quantization `config`
+
+        Args:
+            calibration_method (str): Method used to calculate quantization range, 'min_max' or 'kl'.
+
+        Raises:
+            TypeError: If `calibration_method` is not str.
+            ValueError: If `calibration_method` is not 'min_max' or 'kl'.
+        """
+        Validator.check_value_type("calibration_method", calibration_method, [str], self.__class__.__name__)
+        Validator.check_string(calibration_method, ["min_max", "kl"], "calibration_method", self.__class__.__name__)
+        self._config.calibration_method = calibration_method
+
+    def set_calibration_num_batches(self, calibration_num_batches):
+        """
+        Set value of calibration_num_batches of post training quantization `config`
+
+        Args:
+            calibration_num_batches (int): The maximum number of batches used for calibration.
+
+        Raises:
+            TypeError: If `calibration_num_batches` is not int.
+            ValueError: If `calibration_num_batches` is not positive.
+        """
+        Validator.check_is_int(calibration_num_batches, "calibration_num_batches", self.__class__.__name__)
+        Validator.check_positive_int(calibration_num_batches, "calibration_num_batches", self.__class__.__name__)
+        self._config.calibration_num_batches = calibration_num_batches
+
+    def _create_config(self):
+        """Create SimulatedPostTrainingQuantizationConfig."""
+        self._config = SimulatedPostTrainingQuantizationConfig()
+
+    def _update_config_from_dict(self, config: dict):
+        """Create post training quantization `config` from a dict"""
+        super(SimulatedPostTrainingQuantization, self)._update_config_from_dict(config)
+        self.set_calibration_method(config.get("calibration_method", "min_max"))
+        self.set_calibration_num_batches(config.get("calibration_num_batches", 100))
+
+    def _create_calibrator(self, quantizer, is_weight):
+        """Create calibrator for `quantizer` according to `calibration_method`."""
+        channel_axis = quantizer._channel_axis if isinstance(quantizer, SimulatedFakeQuantizerPerChannel) else None
+        if self._config.calibration_method == "kl":
+            return KLCalibrator(quantizer._num_bits, channel_axis, is_weight)
+        return MinMaxCalibrator(channel_axis, is_weight)
+
+    @staticmethod
+    def _get_quantizers(net_opt: Cell):
+        """Get all simulated fake quantizers in `net_opt` and whether each of them is a weight quantizer."""
+        quantizers = {}
+        for _, cell in net_opt.cells_and_names():
+            if isinstance(cell, SimulatedFakeQuantizerPerLayer):
+                quantizers.setdefault(id(cell), (cell, False))
+            weight_quantizer = getattr(cell, "fake_quant_weight", None)
+            if isinstance(weight_quantizer, SimulatedFakeQuantizerPerLayer):
+                quantizers[id(weight_quantizer)] = (weight_quantizer, True)
+        return list(quantizers.values())
+
+    @staticmethod
+    def _create_iterator(dataset):
+        """Create iterator of batches from a MindSpore dataset or an iterable object."""
+        if hasattr(dataset, "create_tuple_iterator"):
+            return dataset.create_tuple_iterator(num_epochs=1)
+        return iter(dataset)
+
+    def calibrate(self, net_opt: Cell, dataset) -> Cell:
+        """
+        Calibrate quantization range of every fake quantizer in `net_opt` by running `net_opt` over at most
+        `calibration_num_batches` batches of `dataset`. The first column of each batch is fed into `net_opt`, and
+        other columns such as labels are ignored. Network runs in PyNative mode during calibration, and mode of
+        context is restored after calibration.
+
+        Args:
+            net_opt (Cell): Network transformed by `SimulatedPostTrainingQuantization.apply`.
+            dataset (Union[Dataset, Iterable]): Dataset for calibration, a MindSpore dataset or an iterable object
+                whose elements are batches.
+
+        Returns:
+            Calibrated network, which can be converted by `convert`.
+
+        Raises:
+            TypeError: If `net_opt` is not Cell.
+            RuntimeError: If `dataset` is empty.
+        """
+        if not isinstance(net_opt, Cell):
+            raise TypeError(
+                f'The parameter `net_opt` must be isinstance of Cell, but got {type(net_opt)}.')
+        quantizers = SimulatedPostTrainingQuantization._get_quantizers(net_opt)
+        calibrators = [self._create_calibrator(quantizer, is_weight) for quantizer, is_weight in quantizers]
+        # weight quantizers are skipped by cached eval weight, so disable cache during calibration.
+        cached_cells = [cell for _, cell in net_opt.cells_and_names()
+                        if isinstance(cell, EvalWeightCache) and cell.cache_eval_weight]
+        mode = context.get_context("mode")
+        is_training = net_opt.training
+        context.set_context(mode=context.PYNATIVE_MODE)
+        for cell in cached_cells:
+            cell.cache_eval_weight = False
+        net_opt.set_train(False)
+        try:
+            for (quantizer, _), calibrator in zip(quantizers, calibrators):
+                quantizer.set_calibrator(calibrator)
+            num_batches = 0
+            for data in SimulatedPostTrainingQuantization._create_iterator(dataset):
+                if num_batches >= self._config.calibration_num_batches:
+                    break
+                if isinstance(data, (list, tuple)):
+                    data = data[0]
+                if not isinstance(data, Tensor):
+                    data = Tensor(data)
+                net_opt(data)
+                num_batches += 1
+            if num_batches == 0:
+                raise RuntimeError("The parameter `dataset` is empty, can not calibrate network.")
+            for (quantizer, _), calibrator in zip(quantizers, calibrators):
+                quantizer.set_min_max(*calibrator.get_min_max())
+        finally:
+            for quantizer, _ in quantizers:
+                quantizer.set_calibrator(None)
+            for cell in cached_cells:
+                cell.cache_eval_weight = True
+            net_opt.set_train(is_training)
+            context.set_context(mode=mode)
+        return net_opt
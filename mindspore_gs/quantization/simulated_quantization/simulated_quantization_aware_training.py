@@ -15,15 +15,20 @@
 """SimulatedQuantizationAwareTraining."""
 
 import os
+import numpy as np
 from mindspore.nn import Cell
+from mindspore.train.callback import Callback
 from mindspore import log as logger
 from mindspore.train.serialization import load_checkpoint, load_param_into_net
 from mindspore.common.dtype import QuantDtype
 from mindspore_gs.validator import Validator, Rel
+from mindspore_gs.ops.nn.eval_weight_cache import EvalWeightCache
+from ..fake_quantizer import FreezableObserver
 from ..quantization_aware_training import QuantizationAwareTraining
 from .simulated_quantization_net_policy import SimulatedNetPolicy
 from .simulated_quantization_config import SimulatedQuantizationConfig
 from .simulated_quantization_convert import ConvertToQuantInferNetwork
+from .simulated_fake_quantizers import SimulatedFakeQuantizerPerLayer
 
 
 class SimulatedQuantizationAwareTraining(QuantizationAwareTraining):
@@ -63,16 +68,38 @@ class SimulatedQuantizationAwareTraining(QuantizationAwareTraining):
               Default: False.
             - one_conv_fold (bool): Whether to use one conv bn fold ops for simulation inference operation.
               Default: True.
+            - single_conv_bn_fold (bool): Whether Conv2dBnFoldQuant recovers batch statistics by rescaling the output
+              of its folded convolution per channel instead of running an extra convolution, which takes effect when
+              `bn_fold` is True and `one_conv_fold` is False. Default: False.
+            - pack_int8_weight (bool): Whether to store weights of Conv2d and Dense as int8 tensors with scale and zero
+              point in converted network, instead of fp32 weights with fake quant param. Default: False.
+            - cache_eval_weight (bool): Whether quant cells compute their fake quantized (and folded) weight once when
+              network is set to eval mode, and reuse it in every eval step. Default: False.
+            - freeze_observer (int): Number of steps after which quantization range of every fake quantizer is frozen,
+              so range tracking is skipped in later steps. -1 means never freezing by steps. Default: -1.
+            - freeze_observer_epoch (int): Number of epochs after which quantization range of every fake quantizer is
+              frozen. -1 means never freezing by epochs. Default: -1.
+            - freeze_observer_tolerance (float): If positive, at the end of each epoch, fake quantizer whose range
+              changes less than `freeze_observer_tolerance` relative to its range at the end of last epoch is frozen.
+              0.0 means never freezing by tolerance. Default: 0.0.
+            - bypass_quant_delay (bool): Whether fake quantizers pass data through without launching any observer or
+              fake quant kernel before `quant_delay`, so network runs as a float network in early training. Fake
+              quantizers are switched to quantization by a `QuantDelaySwitchCallback` returned from `callbacks`, and
+              quantization range is tracked from the switching step. Default: False.
 
     Raises:
-        TypeError: If `bn_fold`, `one_conv_fold` or `enable_fusion` is not bool.
-        TypeError: If `freeze_bn` is not int.
+        TypeError: If `bn_fold`, `one_conv_fold`, `single_conv_bn_fold`, `enable_fusion`, `pack_int8_weight`,
+            `cache_eval_weight` or `bypass_quant_delay` is not bool.
+        TypeError: If `freeze_bn`, `freeze_observer` or `freeze_observer_epoch` is not int.
+        TypeError: If `freeze_observer_tolerance` is not float.
         TypeError: If `quant_delay` is not int, or every element of `quant_delay` is not int.
         TypeError: If `quant_dtype` is not `QuantDtype`, or every element of `quant_dtype` is not `QuantDtype`.
         TypeError: If `per_channel` is not bool, or every element of `per_channel` is not bool.
         TypeError: If `symmetric` is not bool, or every element of `symmetric` is not bool.
         TypeError: If `narrow_range` is not bool, or every element of `narrow_range` is not bool.
         ValueError: If `freeze_bn` is less than 0.
+        ValueError: If `freeze_observer` or `freeze_observer_epoch` is less than -1.
+        ValueError: If `freeze_observer_tolerance` is less than 0 or greater than 1.
         ValueError: If the length of `quant_delay`, `quant_dtype`, `per_channel`, `symmetric` or `narrow_range` is more
             than 2.
         ValueError: If `quant_delay` is less than 0, or any element of `quant_delay` is less than 0.
@@ -191,6 +218,20 @@ class SimulatedQuantizationAwareTraining(QuantizationAwareTraining):
                            "one_conv_fold=False, this may lead to replacing Conv2d + BatchNorm2d pattern with "
                            "Conv2dBnFoldQuant which is not implemented in CPU backend!")
 
+    def set_single_conv_bn_fold(self, single_conv_bn_fold):
+        """
+        Set value of single_conv_bn_fold of quantization aware training `config`
+
+        Args:
+            single_conv_bn_fold (bool): Whether Conv2dBnFoldQuant derives batch statistics from the output of its
+                folded convolution instead of running an extra convolution.
+
+        Raises:
+            TypeError: If `single_conv_bn_fold` is not bool.
+        """
+        Validator.check_bool(single_conv_bn_fold, "single_conv_bn_fold", self.__class__.__name__)
+        self._config.single_conv_bn_fold = single_conv_bn_fold
+
     def set_act_quant_delay(self, act_quant_delay):
         """
         Set value of act_quant_delay of quantization aware training `config`
@@ -376,6 +417,94 @@ class SimulatedQuantizationAwareTraining(QuantizationAwareTraining):
                            "one_conv_fold=False, this may lead to replacing Conv2d + BatchNorm2d pattern with "
                            "Conv2dBnFoldQuant which is not implemented in CPU backend!")
 
+    def set_pack_int8_weight(self, pack_int8_weight):
+        """
+        Set value of pack_int8_weight of quantization aware training `config`
+
+        Args:
+            pack_int8_weight (bool): Whether to store weights of Conv2d and Dense as int8 tensors in converted network.
+
+        Raises:
+            TypeError: If `pack_int8_weight` is not bool.
+        """
+        Validator.check_bool(pack_int8_weight, "pack_int8_weight", self.__class__.__name__)
+        self._config.pack_int8_weight = pack_int8_weight
+
+    def set_cache_eval_weight(self, cache_eval_weight):
+        """
+        Set value of cache_eval_weight of quantization aware training `config`
+
+        Args:
+            cache_eval_weight (bool): Whether quant cells cache their fake quantized weight in eval mode.
+
+        Raises:
+            TypeError: If `cache_eval_weight` is not bool.
+        """
+        Validator.check_bool(cache_eval_weight, "cache_eval_weight", self.__class__.__name__)
+        self._config.cache_eval_weight = cache_eval_weight
+
+    def set_freeze_observer(self, freeze_observer):
+        """
+        Set value of freeze_observer of quantization aware training `config`
+
+        Args:
+            freeze_observer (int): Number of steps after which quantization range of every fake quantizer is frozen,
+                -1 means never freezing by steps.
+
+        Raises:
+            TypeError: If `freeze_observer` is not int.
+            ValueError: If `freeze_observer` is less than -1.
+        """
+        Validator.check_is_int(freeze_observer, "freeze_observer", self.__class__.__name__)
+        Validator.check_int(freeze_observer, -1, Rel.GE, "freeze_observer", self.__class__.__name__)
+        self._config.freeze_observer = freeze_observer
+
+    def set_freeze_observer_epoch(self, freeze_observer_epoch):
+        """
+        Set value of freeze_observer_epoch of quantization aware training `config`
+
+        Args:
+            freeze_observer_epoch (int): Number of epochs after which quantization range of every fake quantizer is
+                frozen, -1 means never freezing by epochs.
+
+        Raises:
+            TypeError: If `freeze_observer_epoch` is not int.
+            ValueError: If `freeze_observer_epoch` is less than -1.
+        """
+        Validator.check_is_int(freeze_observer_epoch, "freeze_observer_epoch", self.__class__.__name__)
+        Validator.check_int(freeze_observer_epoch, -1, Rel.GE, "freeze_observer_epoch", self.__class__.__name__)
+        self._config.freeze_observer_epoch = freeze_observer_epoch
+
+    def set_freeze_observer_tolerance(self, freeze_observer_tolerance):
+        """
+        Set value of freeze_observer_tolerance of quantization aware training `config`
+
+        Args:
+            freeze_observer_tolerance (float): Relative change of range in one epoch below which fake quantizer is
+                frozen, 0.0 means never freezing by tolerance.
+
+        Raises:
+            TypeError: If `freeze_observer_tolerance` is not float.
+            ValueError: If `freeze_observer_tolerance` is less than 0 or greater than 1.
+        """
+        freeze_observer_tolerance = Validator.check_float_range(freeze_observer_tolerance, 0.0, 1.0, Rel.INC_BOTH,
+                                                                "freeze_observer_tolerance", self.__class__.__name__)
+        self._config.freeze_observer_tolerance = freeze_observer_tolerance
+
+    def set_bypass_quant_delay(self, bypass_quant_delay):
+        """
+        Set value of bypass_quant_delay of quantization aware training `config`
+
+        Args:
+            bypass_quant_delay (bool): Whether fake quantizers bypass observer and fake quant kernels before
+                `quant_delay`.
+
+        Raises:
+            TypeError: If `bypass_quant_delay` is not bool.
+        """
+        Validator.check_bool(bypass_quant_delay, "bypass_quant_delay", self.__class__.__name__)
+        self._config.bypass_quant_delay = bypass_quant_delay
+
     @staticmethod
     def _convert2list(name, value):
         if not isinstance(value, list) and not isinstance(value, tuple):
@@ -422,7 +551,14 @@ class SimulatedQuantizationAwareTraining(QuantizationAwareTraining):
         self.set_enable_fusion(config.get("enable_fusion", False))
         self.set_bn_fold(config.get("bn_fold", False))
         self.set_one_conv_fold(config.get("one_conv_fold", True))
+        self.set_single_conv_bn_fold(config.get("single_conv_bn_fold", False))
         self.set_freeze_bn(config.get("freeze_bn", 10000000))
+        self.set_pack_int8_weight(config.get("pack_int8_weight", False))
+        self.set_cache_eval_weight(config.get("cache_eval_weight", False))
+        self.set_freeze_observer(config.get("freeze_observer", -1))
+        self.set_freeze_observer_epoch(config.get("freeze_observer_epoch", -1))
+        self.set_freeze_observer_tolerance(config.get("freeze_observer_tolerance", 0.0))
+        self.set_bypass_quant_delay(config.get("bypass_quant_delay", False))
 
     def apply(self, network: Cell) -> Cell:
         """
@@ -443,11 +579,49 @@ class SimulatedQuantizationAwareTraining(QuantizationAwareTraining):
             Quantized network.
         """
         self._qat_policy.build()
-        return super(SimulatedQuantizationAwareTraining, self).apply(network)
+        net_opt = super(SimulatedQuantizationAwareTraining, self).apply(network)
+        if self._config.cache_eval_weight:
+            for _, cell in net_opt.cells_and_names():
+                if isinstance(cell, EvalWeightCache):
+                    cell.enable_eval_weight_cache()
+        return net_opt
+
+    def callbacks(self, *args, **kwargs):
+        """
+        Define what task need to be done when training for SimQAT. If `freeze_observer` or `freeze_observer_epoch` is
+        not -1, or `freeze_observer_tolerance` is positive, an `ObserverFreezeCallback` is added to freeze quantization
+        range of fake quantizers. If `bypass_quant_delay` is True and `quant_delay` is positive, a
+        `QuantDelaySwitchCallback` is added to switch fake quantizers to quantization at `quant_delay`.
+
+        Args:
+            args (Union[list, tuple, optional]): Arguments passed to the function.
+            kwargs (Union[dict, optional]): The keyword arguments.
+
+        Returns:
+            List of instance of Callbacks.
+
+        Raises:
+            ValueError: If `bypass_quant_delay` is True and `freeze_observer` is not -1 and not larger than
+                `quant_delay`, fake quantizers would be frozen before tracking any range.
+        """
+        cb = []
+        bypassed_steps = 0
+        if self._config.bypass_quant_delay:
+            bypassed_steps = max(self._config.act_quant_delay, self._config.weight_quant_delay)
+        if bypassed_steps > 0:
+            cb.append(QuantDelaySwitchCallback())
+        if self._config.freeze_observer != -1 or self._config.freeze_observer_epoch != -1 or \
+                self._config.freeze_observer_tolerance > 0:
+            cb.append(ObserverFreezeCallback(self._config.freeze_observer, self._config.freeze_observer_tolerance,
+                                             self._config.freeze_observer_epoch, bypassed_steps))
+        cb.extend(super(SimulatedQuantizationAwareTraining, self).callbacks(*args, **kwargs))
+        return cb
 
     def convert(self, net_opt: Cell, ckpt_path="") -> Cell:
         """
         Define how to convert a compressed network to a standard network before exporting to MindIR.
+        If `pack_int8_weight` is True, weights of Conv2d and Dense are stored as int8 tensors and dequantized in
+        network, otherwise weights are stored as fp32 tensors with fake quant param.
 
         Args:
             net_opt (Cell): Network to be converted which is transformed by `SimulatedQuantizationAwareTraining.apply`.
@@ -476,5 +650,150 @@ class SimulatedQuantizationAwareTraining(QuantizationAwareTraining):
             else:
                 raise ValueError(
                     f'The parameter `ckpt_path` can only be empty or a valid file, but got {real_path}.')
-        exporter = ConvertToQuantInferNetwork(net_opt)
+        exporter = ConvertToQuantInferNetwork(net_opt, self._config.pack_int8_weight)
         return exporter.run()
+
+
+class ObserverFreezeCallback(Callback):
+    """
+    Callback which freezes quantization range of fake quantizers in training network, after which fake quantizers skip
+    range tracking and fake quantize data with the frozen range.
+
+    Args:
+        freeze_step (int): Number of steps after which all fake quantizers are frozen, -1 means never freezing by
+            steps. Default: -1.
+        tolerance (float): If positive, at the end of each epoch, fake quantizer whose range changes less than
+            `tolerance` relative to its range at the end of last epoch is frozen. Default: 0.0.
+        freeze_epoch (int): Number of epochs after which all fake quantizers are frozen, -1 means never freezing by
+            epochs. Default: -1.
+        quant_delay (int): Number of steps during which fake quantizers are bypassed and track no range, which
+            freezing must come after. 0 means fake quantizers are not bypassed. Default: 0.
+
+    Fake quantizers which are still bypassed are never frozen by this callback, their range has not been tracked yet.
+    Tolerance of a fake quantizer is only checked from the first epoch end after it is switched on.
+
+    Raises:
+        ValueError: If `freeze_step` is not -1 and is not larger than `quant_delay`.
+        ValueError: In `begin`, if `freeze_epoch` is not -1 and the epoch ends before step `quant_delay`.
+    """
+
+    def __init__(self, freeze_step=-1, tolerance=0.0, freeze_epoch=-1, quant_delay=0):
+        super(ObserverFreezeCallback, self).__init__()
+        if freeze_step != -1 and freeze_step <= quant_delay:
+            raise ValueError(f"For 'ObserverFreezeCallback', `freeze_observer` should be larger than quant delay "
+                             f"{quant_delay} of bypassed fake quantizers, but got {freeze_step}.")
+        self._freeze_step = freeze_step
+        self._tolerance = tolerance
+        self._freeze_epoch = freeze_epoch
+        self._quant_delay = quant_delay
+        self._all_frozen = False
+        self._last_ranges = {}
+
+    @staticmethod
+    def _get_observers(network: Cell):
+        """Get all fake quantizers in `network` whose range can be frozen, bypassed ones are included."""
+        observers = {}
+        for name, cell in network.cells_and_names():
+            if isinstance(cell, FreezableObserver) and cell.is_observer_freezable():
+                observers.setdefault(id(cell), (name, cell))
+        return list(observers.values())
+
+    @staticmethod
+    def _is_bypassed(observer):
+        return isinstance(observer, SimulatedFakeQuantizerPerLayer) and not observer.is_quant_enabled()
+
+    def _freeze_all(self, network: Cell):
+        for name, observer in ObserverFreezeCallback._get_observers(network):
+            if ObserverFreezeCallback._is_bypassed(observer):
+                logger.warning(f"Quantization range of {name} is not frozen because it is still bypassed.")
+                continue
+            if not observer.is_observer_frozen():
+                observer.freeze_observer()
+                logger.info(f"Quantization range of {name} is frozen.")
+        self._all_frozen = True
+
+    @staticmethod
+    def _range_change(last_range, cur_range):
+        """Maximum change of range relative to the largest absolute value of `last_range`."""
+        change = max(np.abs(cur - last).max() for cur, last in zip(cur_range, last_range))
+        scale = max(np.abs(last).max() for last in last_range)
+        return change / max(scale, 1e-6)
+
+    def begin(self, run_context):
+        """Check `freeze_epoch` against quant delay, and record range of fake quantizers before training."""
+        cb_params = run_context.original_args()
+        batch_num = getattr(cb_params, "batch_num", None)
+        if self._freeze_epoch != -1 and batch_num and self._freeze_epoch * batch_num <= self._quant_delay:
+            raise ValueError(f"For 'ObserverFreezeCallback', `freeze_observer_epoch` {self._freeze_epoch} ends at "
+                             f"step {self._freeze_epoch * batch_num}, which should be larger than quant delay "
+                             f"{self._quant_delay} of bypassed fake quantizers.")
+        if self._tolerance > 0:
+            self._last_ranges = {id(observer): observer.get_range()
+                                 for _, observer in ObserverFreezeCallback._get_observers(cb_params.train_network)
+                                 if not ObserverFreezeCallback._is_bypassed(observer)}
+
+    def step_end(self, run_context):
+        """Freeze all fake quantizers when `freeze_step` is reached."""
+        if self._all_frozen or self._freeze_step == -1:
+            return
+        cb_params = run_context.original_args()
+        if cb_params.cur_step_num >= self._freeze_step:
+            self._freeze_all(cb_params.train_network)
+
+    def epoch_end(self, run_context):
+        """
+        Freeze all fake quantizers when `freeze_epoch` is reached, or freeze fake quantizers whose range has converged
+        within `tolerance`.
+        """
+        if self._all_frozen:
+            return
+        cb_params = run_context.original_args()
+        network = cb_params.train_network
+        if self._freeze_epoch != -1 and cb_params.cur_epoch_num >= self._freeze_epoch:
+            self._freeze_all(network)
+            return
+        if self._tolerance <= 0:
+            return
+        for name, observer in ObserverFreezeCallback._get_observers(network):
+            if observer.is_observer_frozen():
+                continue
+            if ObserverFreezeCallback._is_bypassed(observer):
+                # range of bypassed fake quantizer stays at its initial value, compare from when it is switched on.
+                self._last_ranges.pop(id(observer), None)
+                continue
+            cur_range = observer.get_range()
+            last_range = self._last_ranges.get(id(observer))
+            self._last_ranges[id(observer)] = cur_range
+            if last_range is not None and ObserverFreezeCallback._range_change(last_range, cur_range) < self._tolerance:
+                observer.freeze_observer()
+                logger.info(f"Quantization range of {name} converges, and is frozen.")
+
+
+class QuantDelaySwitchCallback(Callback):
+    """
+    Callback which switches fake quantizers created with `bypass_quant_delay` from passing data through to
+    quantization, when the number of trained steps reaches `quant_delay` of each fake quantizer. Switching is done by
+    updating a Parameter flag, so compiled graph is not recompiled. In dataset sink mode, fake quantizers are switched
+    at the end of the sink step which reaches `quant_delay`.
+    """
+
+    def __init__(self):
+        super(QuantDelaySwitchCallback, self).__init__()
+        self._pending = None
+
+    @staticmethod
+    def _get_pending_quantizers(network: Cell):
+        """Get fake quantizers in `network` which are still bypassed, sorted by their quant delay."""
+        quantizers = {}
+        for _, cell in network.cells_and_names():
+            if isinstance(cell, SimulatedFakeQuantizerPerLayer) and not cell.is_quant_enabled():
+                quantizers.setdefault(id(cell), cell)
+        return sorted(quantizers.values(), key=lambda quantizer: quantizer._quant_delay)
+
+    def step_end(self, run_context):
+        """Enable fake quantizers whose quant delay is reached."""
+        cb_params = run_context.original_args()
+        if self._pending is None:
+            self._pending = QuantDelaySwitchCallback._get_pending_quantizers(cb_params.train_network)
+        while self._pending and cb_params.cur_step_num >= self._pending[0]._quant_delay:
+            self._pending.pop(0).enable_quant()
@@ -39,4 +39,23 @@ class SimulatedQuantizationConfig(CompAlgoConfig):
         self.act_narrow_range = False
         self.weight_narrow_range = False
         self.one_conv_fold = True
+        self.single_conv_bn_fold = False
         self.enable_fusion = False
+        self.pack_int8_weight = False
+        self.cache_eval_weight = False
+        self.freeze_observer = -1
+        self.freeze_observer_epoch = -1
+        self.freeze_observer_tolerance = 0.0
+        self.bypass_quant_delay = False
+
+
+class SimulatedPostTrainingQuantizationConfig(SimulatedQuantizationConfig):
+    """
+    Config for simulated post training quantization.
+    See more details in simulated_post_training_quantization.py
+    """
+
+    def __init__(self):
+        super(SimulatedPostTrainingQuantizationConfig, self).__init__()
+        self.calibration_method = "min_max"
+        self.calibration_num_batches = 100
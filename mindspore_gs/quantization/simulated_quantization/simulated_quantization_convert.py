@@ -18,6 +18,7 @@ import numpy as np
 
 from mindspore.nn import Cell
 from mindspore.common import Tensor
+from mindspore.common.parameter import Parameter
 from mindspore.ops import operations as P
 from mindspore.ops.operations import _quant_ops as Q
 from mindspore.common import dtype as mstype
@@ -25,7 +26,7 @@ from mindspore.common.dtype import QuantDtype
 from mindspore_gs.ops.nn import Conv2dQuant, DenseQuant, Conv2dBnFoldQuantOneConv, Conv2dBnWithoutFoldQuant, \
     Conv2dBnFoldQuant
 from ..quantize_wrapper_cell import QuantizeWrapperCell
-from ..quant_utils import fold_batchnorm, without_fold_batchnorm
+from ..quant_utils import fold_batchnorm, without_fold_batchnorm, get_quant_min_max
 from .simulated_fake_quantizers import SimulatedFakeQuantizerPerChannel
 
 
@@ -87,20 +88,80 @@ class CellBlockWithFakeWeight(Cell):
         return s
 
 
+class CellBlockWithQuantWeight(Cell):
+    """A block of Conv/Dense, activation layer with int8 weight for export MINDIR model. Weight is stored as int8
+       and dequantized by scale and zero point before computation, so weight takes a quarter of memory of fp32 weight.
+
+       Args:
+        core_op (Cell): The operation cell.
+        scale_w (numpy.ndarray): The quantization parameter scale of the weight, broadcastable to weight.
+        zp_w (numpy.ndarray): The quantization parameter zero point of the weight, broadcastable to weight.
+        weight (numpy.ndarray): The int8 weight of the cell.
+        bias (Tensor): The bias of the cell. Default: None.
+        activation (str): The regularization function applied to the output of the layer, eg. 'relu'. Default: None.
+    """
+
+    def __init__(self,
+                 core_op,
+                 scale_w,
+                 zp_w,
+                 weight,
+                 bias=None,
+                 activation=None):
+
+        super(CellBlockWithQuantWeight, self).__init__()
+        self.core_op = core_op
+        if activation is not None:
+            self.core_op.add_prim_attr(
+                "activation_name", activation.__class__.__name__)
+        if hasattr(core_op, 'pad_mode'):
+            self.core_op.add_prim_attr("pad_mode", core_op.pad_mode)
+
+        self.weight = Parameter(Tensor(weight, mstype.int8), name="weight", requires_grad=False)
+        self.weight_scale = Parameter(Tensor(scale_w, mstype.float32), name="weight_scale", requires_grad=False)
+        self.weight_zp = Parameter(Tensor(zp_w, mstype.float32), name="weight_zp", requires_grad=False)
+        self.bias = bias
+        self.has_bias = bias is not None
+        self.activation = activation
+        self.has_act = activation is not None
+        self.bias_add = P.BiasAdd()
+        self.cast = P.Cast()
+
+    def construct(self, x):
+        weight = (self.cast(self.weight, mstype.float32) - self.weight_zp) * self.weight_scale
+        x = self.core_op(x, weight)
+        if self.has_bias:
+            x = self.bias_add(x, self.bias)
+        if self.has_act:
+            x = self.activation(x)
+        return x
+
+    def extend_repr(self):
+        s = f'core_op={type(self.core_op)}, weight=shape[{self.weight.shape}], dtype=int8'
+        if self.has_bias:
+            s += f', bias=shape[{self.bias.shape}]'
+        if self.has_act:
+            s += f', activation={self.activation}'
+        return s
+
+
 class ConvertToQuantInferNetwork:
     """
     Convert quantization aware network to infer network.
 
     Args:
         network (Cell): SimulatedQuantizationAwareTraining apply network.
+        pack_int8_weight (bool): Whether to store weight of Conv/Dense as int8 instead of fp32 weight with fake quant
+            param. Default: False.
 
     Returns:
         Cell, Infer network.
     """
 
-    def __init__(self, network):
+    def __init__(self, network, pack_int8_weight=False):
         self.quant_dtype = QuantDtype.INT8
         self.network = network
+        self.pack_int8_weight = pack_int8_weight
 
     def run(self):
         """Start to convert."""
@@ -123,6 +184,12 @@ class ConvertToQuantInferNetwork:
         weight, bias = self.__get_weight_bias(cell_core)
         is_per_channel = isinstance(
             cell_core.fake_quant_weight, SimulatedFakeQuantizerPerChannel)
+        if self.pack_int8_weight:
+            weight, scale_w, zp_w = self.__get_int8_weight(cell_core, weight.asnumpy(), scale_w, zp_w, is_per_channel)
+            block = CellBlockWithQuantWeight(op_core, scale_w, zp_w, weight, bias, activation)
+            # keep parameter names unique in network, for example 'Conv2dQuant._handler.weight'.
+            block.update_parameters_name(cell_core.weight.name[:-len("weight")])
+            return block
         quant_params = {"quant_dtype": self.quant_dtype,
                         "is_per_channel": is_per_channel}
         block = CellBlockWithFakeWeight(op_core, tuple(scale_w), tuple(zp_w), weight, bias, activation, quant_params)
@@ -133,6 +200,25 @@ class ConvertToQuantInferNetwork:
         _, _, scale_w, zp_w = cell_core.fake_quant_weight.extract_quant_param()
         return scale_w, zp_w
 
+    def __get_int8_weight(self, cell_core, weight, scale_w, zp_w, is_per_channel):
+        """Quantize weight to int8, returns int8 weight, scale and zero point broadcastable to weight."""
+        fake_quant_weight = cell_core.fake_quant_weight
+        quant_min, quant_max = get_quant_min_max(num_bits=8, signed=True,
+                                                 narrow_range=fake_quant_weight._narrow_range)
+        shape = [1] * weight.ndim
+        if is_per_channel:
+            channel_axis = fake_quant_weight._channel_axis
+            # weight of Dense has been transposed for MatMul
+            if isinstance(cell_core, DenseQuant):
+                channel_axis = 1 - channel_axis
+            shape[channel_axis] = -1
+        scale_w = np.reshape(scale_w, shape).astype(np.float32)
+        zp_w = np.reshape(zp_w, shape).astype(np.float32)
+        # scale is zero only if a channel of weight is all zero, any nonzero scale gives the same int8 weight.
+        scale_w = np.where(scale_w == 0, 1, scale_w)
+        weight = np.clip(np.floor(weight / scale_w + 0.5) + zp_w, quant_min, quant_max).astype(np.int8)
+        return weight, scale_w, zp_w
+
     def __get_weight_bias(self, cell_core):
         """Get weight and bias for quantizaiton"""
         weight = cell_core.weight.data.asnumpy()
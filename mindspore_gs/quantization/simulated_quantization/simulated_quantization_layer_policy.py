@@ -35,7 +35,8 @@ class SimulatedLayerPolicy(LayerPolicy):
     Use linear perchannel fake quantizer as weight fake quantizer, linear perlayer fake quantizer as act fake quantizer.
 
     Supported Config:
-        ``quant_delay`` ``quant_dtype`` ``per_channel`` ``symmetric`` ``narrow_range`` ``one_conv_fold``.
+        ``quant_delay`` ``quant_dtype`` ``per_channel`` ``symmetric`` ``narrow_range`` ``one_conv_fold``
+        ``bypass_quant_delay``.
     """
 
     def __init__(self, weight_names: [], act_names: [],
@@ -46,32 +47,49 @@ class SimulatedLayerPolicy(LayerPolicy):
             self._num_bits = 8
         else:
             raise TypeError("Only support int8 weight quant now!")
+        # frozen path of fake quantizers is only built if observer freezing is configured.
+        self._observer_freezable = config.freeze_observer != -1 or config.freeze_observer_epoch != -1 or \
+            config.freeze_observer_tolerance > 0
         if config.weight_per_channel:
             self._weight_quantizer_partial = partial(SimulatedFakeQuantizerPerChannel,
                                                      ema=False,
                                                      symmetric=config.weight_symmetric,
                                                      quant_dtype=config.weight_quant_dtype,
                                                      quant_delay=config.weight_quant_delay,
+                                                     bypass_quant_delay=config.bypass_quant_delay,
+                                                     observer_freezable=self._observer_freezable,
                                                      narrow_range=config.weight_narrow_range)
         else:
             self._weight_quantizer_partial = partial(SimulatedFakeQuantizerPerLayer, ema=False,
                                                      symmetric=config.weight_symmetric,
                                                      quant_dtype=config.weight_quant_dtype,
                                                      quant_delay=config.weight_quant_delay,
+                                                     bypass_quant_delay=config.bypass_quant_delay,
+                                                     observer_freezable=self._observer_freezable,
                                                      narrow_range=config.weight_narrow_range)
         if config.act_per_channel:
             raise NotImplementedError("act quant only support perlayer now!")
-        self._act_quantizer: Optional[FakeQuantizer] = SimulatedFakeQuantizerPerLayer(
+        self._act_quantizer: Optional[FakeQuantizer] = None
+        self._input_quantizer: Optional[FakeQuantizer] = None
+        self._output_quantizer: Optional[FakeQuantizer] = None
+        self._create_quantizers()
+        self._weight_names = weight_names
+        self._act_names = act_names
+
+    def _create_quantizers(self):
+        config = self._config
+        self._act_quantizer = SimulatedFakeQuantizerPerLayer(
             symmetric=config.act_symmetric, quant_dtype=config.act_quant_dtype, quant_delay=config.act_quant_delay,
+            bypass_quant_delay=config.bypass_quant_delay, observer_freezable=self._observer_freezable,
             narrow_range=config.act_narrow_range)
-        self._input_quantizer: Optional[FakeQuantizer] = SimulatedFakeQuantizerPerLayer(
+        self._input_quantizer = SimulatedFakeQuantizerPerLayer(
             symmetric=config.act_symmetric, quant_dtype=config.act_quant_dtype, quant_delay=config.act_quant_delay,
+            bypass_quant_delay=config.bypass_quant_delay, observer_freezable=self._observer_freezable,
             narrow_range=config.act_narrow_range)
-        self._output_quantizer: Optional[FakeQuantizer] = SimulatedFakeQuantizerPerLayer(
+        self._output_quantizer = SimulatedFakeQuantizerPerLayer(
             symmetric=config.act_symmetric, quant_dtype=config.act_quant_dtype, quant_delay=config.act_quant_delay,
+            bypass_quant_delay=config.bypass_quant_delay, observer_freezable=self._observer_freezable,
             narrow_range=config.act_narrow_range)
-        self._weight_names = weight_names
-        self._act_names = act_names
 
     def get_weight_name_and_quantizers(self):
         return [(name, self._weight_quantizer_partial) for name in self._weight_names]
@@ -127,7 +145,8 @@ class ConvBnLayerPolicy(SimulatedLayerPolicy):
                     conv_quant = Conv2dBnFoldQuantOneConv.from_convbn(handler, self.get_quant_config())
                 else:
                     conv_quant = Conv2dBnFoldQuant.from_convbn(handler, self.get_quant_config(),
-                                                               {"freeze_bn": self._config.freeze_bn})
+                                                               {"freeze_bn": self._config.freeze_bn,
+                                                                "single_conv": self._config.single_conv_bn_fold})
             else:
                 conv_quant = Conv2dBnWithoutFoldQuant.from_convbn(handler, self.get_quant_config())
         else:
@@ -15,6 +15,7 @@
 """DefaultNetworkPolicy."""
 
 from mindspore.nn.layer import Conv2d, Dense, BatchNorm2d, ReLU, ReLU6, Sigmoid, LeakyReLU, HSigmoid, HSwish
+from mindspore.nn import Cell
 from mindspore.rewrite import PatternEngine
 from ..net_policy import NetPolicy
 from .combined import Conv2dBn
@@ -55,3 +56,6 @@ class SimulatedNetPolicy(NetPolicy):
         self._layer_policy_map[HSigmoid] = ActLayerPolicy([], [], self._config)
         self._layer_policy_map[HSwish] = ActLayerPolicy([], [], self._config)
         self._build = True
+
+    def fuse_cells(self, cells: [Cell]) -> Cell:
+        return Conv2dBnFuse.fuse_cells(*cells)
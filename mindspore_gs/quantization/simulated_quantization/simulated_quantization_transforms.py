@@ -17,6 +17,7 @@ from collections import OrderedDict
 from mindspore.rewrite import Replacement, PatternNode, Node
 from mindspore import nn
 from .combined import Conv2dBn
+from ..rewrite_cache import fused_cells_key
 
 
 class Conv2dBnFuse(Replacement):
@@ -24,6 +25,28 @@ class Conv2dBnFuse(Replacement):
     Derived class of Replacement. Define how to build a replacement from a Conv2d-BatchNorm pattern match.
     """
 
+    @staticmethod
+    def fuse_cells(conv: nn.Conv2d, bn: nn.BatchNorm2d = None) -> Conv2dBn:
+        """
+        Create a `Conv2dBn` with the same hyper-parameters as `conv` and `bn`.
+        """
+
+        kwargs = {'in_channels': conv.in_channels,
+                  'out_channels': conv.out_channels,
+                  'kernel_size': conv.kernel_size,
+                  'stride': conv.stride,
+                  'pad_mode': conv.pad_mode,
+                  'padding': conv.padding,
+                  'dilation': conv.dilation,
+                  'group': conv.group,
+                  'has_bias': conv.has_bias,
+                  }
+        if bn is not None:
+            kwargs['has_bn'] = True
+            kwargs['eps'] = bn.eps
+            kwargs['momentum'] = bn.momentum
+        return Conv2dBn(**kwargs)
+
     def build(self, pattern: PatternNode, is_chain_pattern: bool, matched: OrderedDict) -> [Node]:
         """
         Derived from Replacement. Define how to fuse conv+bn.
@@ -48,26 +71,12 @@ class Conv2dBnFuse(Replacement):
 
         bn_node: Node = matched.get(bn_pattern.name()) if bn_pattern else None
         conv_node: Node = matched.get(conv_pattern.name())
-        kwargs = {'in_channels': conv_node.get_attribute("in_channels"),
-                  'out_channels': conv_node.get_attribute("out_channels"),
-                  'kernel_size': conv_node.get_attribute("kernel_size"),
-                  'stride': conv_node.get_attribute("stride"),
-                  'pad_mode': conv_node.get_attribute("pad_mode"),
-                  'padding': conv_node.get_attribute("padding"),
-                  'dilation': conv_node.get_attribute("dilation"),
-                  'group': conv_node.get_attribute("group"),
-                  'has_bias': conv_node.get_attribute("has_bias"),
-                  }
-        if hasattr(conv_node, "weight_init"):
-            kwargs["weight_init"] = conv_node.get_attribute("weight_init")
-        if hasattr(conv_node, "bias_init"):
-            kwargs["bias_init"] = conv_node.get_attribute("bias_init")
-        if bn_node:
-            kwargs['has_bn'] = True
-            kwargs['eps'] = bn_node.get_attribute("eps")
-            kwargs['momentum'] = bn_node.get_attribute("momentum")
-        conv2d_bn_node = Node.create_call_cell(Conv2dBn(**kwargs), conv_node.get_targets(),
+        conv2d_bn = Conv2dBnFuse.fuse_cells(conv_node.get_instance(), bn_node.get_instance() if bn_node else None)
+        conv2d_bn_node = Node.create_call_cell(conv2d_bn, conv_node.get_targets(),
                                                conv_node.get_args(), conv_node.get_kwargs(), "Conv2dBn")
+        # record fused cells so that the fusion can be replayed without pattern matching, see RewriteCache
+        conv2d_bn_node.set_attribute(fused_cells_key, (conv_node.get_instance(),
+                                                       bn_node.get_instance() if bn_node else None))
         return [conv2d_bn_node]
 
 
@@ -21,9 +21,11 @@ import mindspore.context as context
 from mindspore.ops.operations import _quant_ops as Q
 from mindspore.common.parameter import Parameter
 from mindspore.common.tensor import Tensor
+from mindspore.nn import Cell
 from mindspore.ops import operations as P
 from mindspore.common.dtype import QuantDtype
 from mindspore_gs.validator import Validator
+from mindspore_gs.ops.operations import MinMaxUpdateFakeQuantPerLayer
 from ..fake_quantizer import FakeQuantizer
 from ..quant_utils import get_quant_min_max, cal_quantization_params, LinearFakeQuantCell
 
@@ -45,9 +47,9 @@ class SlbFakeQuantizerPerLayer(FakeQuantizer):
         super(SlbFakeQuantizerPerLayer, self).__init__()
         self.num_bits = Validator.check_positive_int(num_bits, "num_bits")
         self.argmax = P.Argmax()
-        self.onehot = P.OneHot()
         self.softmax = P.Softmax()
         self.sum = P.ReduceSum()
+        self.gather = P.Gather()
         self.assign = P.Assign()
         self.true_tensor = Tensor(1, mindspore.float32)
         self.false_tensor = Tensor(0, mindspore.float32)
@@ -83,26 +85,49 @@ class SlbFakeQuantizerPerLayer(FakeQuantizer):
         """
         self.assign(self.flag_temperature_end_changing, self.true_tensor)
 
+    def get_codes(self, x):
+        """
+        Get indexes of the selected weight value in `w_list` of each weight.
+
+        Args:
+            x (Tensor): The auxiliary coefficient matrix of weight.
+
+        Returns:
+            Tensor, int32 indexes of the selected weight value.
+        """
+        return self.argmax(x)
+
+    def hard_weight(self, x):
+        """
+        Select the weight value with the highest probability for each weight. The result is the same as the sum of
+        one-hot representation of argmax multiplied by `w_list`, but weight values are gathered directly, so no tensor
+        with an extra axis of weight values is materialized. Like one-hot of argmax, no gradient flows back to `x`.
+
+        Args:
+            x (Tensor): The auxiliary coefficient matrix of weight.
+
+        Returns:
+            Tensor, the selected discrete weight.
+        """
+        return self.gather(self.w_list, self.get_codes(x), 0)
+
     def construct(self, x):
         """
         SlbFakeQuantizer apply method.
         """
         is_training = self.training
         if is_training == False:
-            # Compute one-hot representation of matrix A's argmax
-            weights = self.onehot(self.argmax(x), x.shape[-1], self.true_tensor, self.false_tensor)
-        else:
-            is_temperature_end_changing = self.flag_temperature_end_changing
-            if is_temperature_end_changing == 0:
-                # Compute matrix P of probabilities (as softmax of A*T)
-                weights = self.softmax(x * self.temperature)
-            else:
-                # Compute one-hot representation of matrix A's argmax
-                weights = self.onehot(self.argmax(x), x.shape[-1], self.true_tensor, self.false_tensor)
-        # Compute continuous weights
-        weights = weights * self.w_list
-        out = self.sum(weights, -1)
-        return out
+            # Select weight value of matrix A's argmax
+            return self.hard_weight(x)
+        is_temperature_end_changing = self.flag_temperature_end_changing
+        if is_temperature_end_changing == 0:
+            # Compute matrix P of probabilities (as softmax of A*T)
+            weights = self.softmax(x * self.temperature)
+            # Compute continuous weights
+            weights = weights * self.w_list
+            return self.sum(weights, -1)
+        # Select weight value of matrix A's argmax
+        return self.hard_weight(x)
 
     def extend_repr(self):
         """Display instance object as string."""
@@ -110,6 +135,107 @@ class SlbFakeQuantizerPerLayer(FakeQuantizer):
         return s
 
 
+class SlbSoftWeight(Cell):
+    r"""
+    Fused softmax-weighted reduction of `SlbCompactFakeQuantizerPerLayer`. Probability of weight value :math:`w_k` is
+    :math:`softmax_k(-T((x - w_k) / \delta)^2)`, where :math:`\delta` is the interval of weight values, and the output
+    is the expectation of weight values. Weight values are accumulated one by one and gradient is computed in closed
+    form :math:`\frac{2T}{\delta^2}Var(w)`, so no tensor with an extra axis of weight values is materialized in
+    forward or backward.
+
+    Args:
+        w_list (numpy.ndarray): Uniformly spaced weight values.
+    """
+
+    def __init__(self, w_list):
+        super(SlbSoftWeight, self).__init__()
+        self.w_list = tuple(float(w) for w in w_list)
+        self.inv_delta_square = 1.0 / (self.w_list[1] - self.w_list[0]) ** 2
+        self.exp = P.Exp()
+        self.maximum = P.Maximum()
+        self.relu = P.ReLU()
+        self.zeros_like = P.ZerosLike()
+
+    def _moments(self, x, scale):
+        """Compute the first and second moment of weight values."""
+        max_logit = -scale * (x - self.w_list[0]) * (x - self.w_list[0])
+        for w in self.w_list[1:]:
+            max_logit = self.maximum(max_logit, -scale * (x - w) * (x - w))
+        sum_p = self.zeros_like(x)
+        sum_pw = self.zeros_like(x)
+        sum_pw2 = self.zeros_like(x)
+        for w in self.w_list:
+            p = self.exp(-scale * (x - w) * (x - w) - max_logit)
+            sum_p = sum_p + p
+            sum_pw = sum_pw + p * w
+            sum_pw2 = sum_pw2 + p * (w * w)
+        return sum_pw / sum_p, sum_pw2 / sum_p
+
+    def construct(self, x, temperature):
+        mean, _ = self._moments(x, temperature * self.inv_delta_square)
+        return mean
+
+    def bprop(self, x, temperature, out, dout):
+        scale = temperature * self.inv_delta_square
+        mean, mean_square = self._moments(x, scale)
+        dx = dout * 2 * scale * self.relu(mean_square - mean * mean)
+        return dx, self.zeros_like(temperature)
+
+
+class SlbCompactFakeQuantizerPerLayer(SlbFakeQuantizerPerLayer):
+    r"""
+    Implement of SlbFakeQuantizer with compact auxiliary weight. Instead of an auxiliary coefficient for each weight
+    value, each weight has only one latent value :math:`x`, and coefficient of weight value :math:`w_k` is
+    :math:`-((x - w_k) / \delta)^2`, where :math:`\delta` is the interval of weight values. So auxiliary weight and its
+    optimizer states take 1 / 2^num_bits memory of `SlbFakeQuantizerPerLayer`, and the weight value with the highest
+    probability is the one nearest to :math:`x`. Temperature is scheduled in the same way as `SlbFakeQuantizerPerLayer`.
+
+    Args:
+        num_bits (int): The quant bit of weight, Default: 1.
+
+    Raises:
+        TypeError: If `num_bits` is not an int.
+    """
+    def __init__(self, num_bits=1):
+        super(SlbCompactFakeQuantizerPerLayer, self).__init__(num_bits)
+        self.soft_weight = SlbSoftWeight(self.w_list_init)
+        self.w_min = float(self.w_list_init[0])
+        self.inv_delta = 1.0 / float(self.w_list_init[1] - self.w_list_init[0])
+        self.code_max = Tensor(2 ** self.num_bits - 1, mindspore.float32)
+        self.round = P.Round()
+        self.minimum = P.Minimum()
+        self.relu = P.ReLU()
+        self.cast = P.Cast()
+
+    def get_codes(self, x):
+        """
+        Get indexes of the weight value nearest to latent weight.
+
+        Args:
+            x (Tensor): The latent weight.
+
+        Returns:
+            Tensor, int32 indexes of the selected weight value.
+        """
+        codes = self.minimum(self.relu(self.round((x - self.w_min) * self.inv_delta)), self.code_max)
+        return self.cast(codes, mindspore.int32)
+
+    def construct(self, x):
+        """
+        SlbCompactFakeQuantizer apply method.
+        """
+        is_training = self.training
+        if is_training == False:
+            # Select the nearest weight value
+            return self.hard_weight(x)
+        is_temperature_end_changing = self.flag_temperature_end_changing
+        if is_temperature_end_changing == 0:
+            # Compute expectation of weight values over probabilities
+            return self.soft_weight(x, self.temperature)
+        # Select the nearest weight value
+        return self.hard_weight(x)
+
+
 class SlbActQuantizer(FakeQuantizer):
     """
     Implement of SlbActQuantizer.
@@ -129,6 +255,14 @@ class SlbActQuantizer(FakeQuantizer):
         self._is_ascend = context.get_context("device_target") == "Ascend"
         quant_func = Q.FakeQuantPerLayer
         self._init_fake_quant_func(quant_func)
+        # on CPU, range update and fake quant of training are fused into one kernel which scans data once.
+        self._use_fused = context.get_context("device_target") == "CPU" and \
+            self._num_bits in MinMaxUpdateFakeQuantPerLayer.support_quant_bit
+        if self._use_fused:
+            self._fused_train = MinMaxUpdateFakeQuantPerLayer(num_bits=self._num_bits, ema=self._ema,
+                                                              ema_decay=self._ema_decay, quant_delay=self._quant_delay,
+                                                              symmetric=self._symmetric,
+                                                              narrow_range=self._narrow_range)
         self._float_min = Parameter(Tensor(np.array([-6]).astype(np.float32), mindspore.float32),
                                     name="float_min", requires_grad=False)
         self._float_max = Parameter(Tensor(np.array([6]).astype(np.float32), mindspore.float32),
@@ -172,6 +306,9 @@ class SlbActQuantizer(FakeQuantizer):
 
     def construct(self, x):
         if self.training:
+            if self._use_fused:
+                out, self._float_min, self._float_max = self._fused_train(x, self._float_min, self._float_max)
+                return out
             self._float_min, self._float_max = \
                 self._min_max_update_func(x, self._float_min, self._float_max)
             out = self._fake_quant_train(x, self._float_min, self._float_max)
@@ -22,7 +22,7 @@ from mindspore_gs.ops.common.quant_op_utils import get_quant_dtype_num_bits
 from ..layer_policy import LayerPolicy
 from ..quantize_wrapper_cell import QuantizeWrapperCell
 from ..fake_quantizer import FakeQuantizer
-from .slb_fake_quantizer import SlbFakeQuantizerPerLayer, SlbActQuantizer
+from .slb_fake_quantizer import SlbFakeQuantizerPerLayer, SlbCompactFakeQuantizerPerLayer, SlbActQuantizer
 from .slb_quant import Conv2dSlbQuant
 from .slb_quant_config import SlbQuantConfig
 
@@ -33,7 +33,7 @@ class SlbLayerPolicy(LayerPolicy):
     Use slb perlayer fake quantizer as weight fake quantizer, linear perlayer fake quantizer as act fake quantizer.
 
     Supported Config:
-        ``quant_dtype``.
+        ``quant_dtype``, ``compact_weight``.
     """
 
     def __init__(self, weight_names: [], act_names: [], config: SlbQuantConfig = SlbQuantConfig()):
@@ -46,20 +46,24 @@ class SlbLayerPolicy(LayerPolicy):
         if act_num_bits not in [8]:
             raise ValueError("Only support int8 activation quant now!")
 
-        self._weight_quantizer_partial = partial(SlbFakeQuantizerPerLayer, num_bits=weight_num_bits)
-        if config.enable_act_quant:
-            self._act_quantizer: Optional[FakeQuantizer] = SlbActQuantizer(num_bits=act_num_bits)
-            self._input_quantizer: Optional[FakeQuantizer] = SlbActQuantizer(num_bits=act_num_bits)
-            self._output_quantizer: Optional[FakeQuantizer] = SlbActQuantizer(num_bits=act_num_bits)
-        else:
-            self._act_quantizer: Optional[FakeQuantizer] = None
-            self._input_quantizer: Optional[FakeQuantizer] = None
-            self._output_quantizer: Optional[FakeQuantizer] = None
+        weight_quantizer = SlbCompactFakeQuantizerPerLayer if config.compact_weight else SlbFakeQuantizerPerLayer
+        self._weight_quantizer_partial = partial(weight_quantizer, num_bits=weight_num_bits)
+        self._act_num_bits = act_num_bits
+        self._act_quantizer: Optional[FakeQuantizer] = None
+        self._input_quantizer: Optional[FakeQuantizer] = None
+        self._output_quantizer: Optional[FakeQuantizer] = None
+        self._create_quantizers()
         self._weight_names = weight_names
         self._act_names = act_names
         self._input_num = 0
         self._inputs_insert_fq = []
 
+    def _create_quantizers(self):
+        if self._config.enable_act_quant:
+            self._act_quantizer = SlbActQuantizer(num_bits=self._act_num_bits)
+            self._input_quantizer = SlbActQuantizer(num_bits=self._act_num_bits)
+            self._output_quantizer = SlbActQuantizer(num_bits=self._act_num_bits)
+
     def get_weight_name_and_quantizers(self):
         return [(name, self._weight_quantizer_partial) for name in self._weight_names]
 
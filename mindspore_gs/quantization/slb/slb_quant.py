@@ -26,14 +26,15 @@ from mindspore.common.dtype import QuantDtype
 from mindspore_gs.validator import Validator, twice
 from mindspore_gs.ops.nn.fake_quant_with_min_max_observer import QuantConfig as OpQuantConfig
 from mindspore_gs.ops.common.quant_op_utils import get_quant_dtype_num_bits
-from .slb_fake_quantizer import SlbFakeQuantizerPerLayer
+from mindspore_gs.ops.nn.eval_weight_cache import EvalWeightCache
+from .slb_fake_quantizer import SlbFakeQuantizerPerLayer, SlbCompactFakeQuantizerPerLayer
 
 
 quant_config_slb_default = OpQuantConfig(weight=partial(SlbFakeQuantizerPerLayer, num_bits=1),
                                          activation=None)
 
 
-class Conv2dSlbQuant(nn.Cell):
+class Conv2dSlbQuant(EvalWeightCache, nn.Cell):
     r"""
     2D convolution with fake quantized operation layer.
 
@@ -111,6 +112,7 @@ class Conv2dSlbQuant(nn.Cell):
                  quant_dtype=QuantDtype.INT1):
         """Initialize Conv2dSlbQuant."""
         super(Conv2dSlbQuant, self).__init__()
+        self._init_eval_weight_cache()
         self.in_channels = Validator.check_positive_int(in_channels, "in_channels", self.cls_name)
         self.out_channels = Validator.check_positive_int(out_channels, "out_channels", self.cls_name)
         self.has_bias = has_bias
@@ -142,8 +144,13 @@ class Conv2dSlbQuant(nn.Cell):
         self._num_bits = get_quant_dtype_num_bits(quant_dtype)
         self._weight_num = 2**self._num_bits
 
+        self.fake_quant_weight = quant_config.weight()
+
         weight_init = init.HeNormal(mode='fan_out', nonlinearity='relu')
-        weight_shape = [out_channels, in_channels // group, *self.kernel_size, self._weight_num]
+        weight_shape = [out_channels, in_channels // group, *self.kernel_size]
+        # compact quantizer keeps one latent value for each weight instead of one coefficient for each weight value.
+        if not isinstance(self.fake_quant_weight, SlbCompactFakeQuantizerPerLayer):
+            weight_shape.append(self._weight_num)
         self.weight = Parameter(initializer(weight_init, weight_shape, mindspore.float32),
                                 name='weight', requires_grad=True)
 
@@ -163,8 +170,6 @@ class Conv2dSlbQuant(nn.Cell):
                              dilation=self.dilation,
                              group=self.group)
 
-        self.fake_quant_weight = quant_config.weight()
-
     @classmethod
     def from_float(cls, conv: Conv2d, quant_config: OpQuantConfig, weight_quant_dtype: QuantDtype):
         """
@@ -203,8 +208,21 @@ class Conv2dSlbQuant(nn.Cell):
             quant_dtype=weight_quant_dtype)
         return conv_quant
 
+    def _eval_weight_shape(self):
+        """Shape of discrete weight, the last axis of weight values is reduced by fake quantizer."""
+        if isinstance(self.fake_quant_weight, SlbCompactFakeQuantizerPerLayer):
+            return self.weight.shape
+        return self.weight.shape[:-1]
+
+    def _quant_weight(self):
+        """Fake quantized weight."""
+        return self.fake_quant_weight(self.weight)
+
     def construct(self, x):
-        weight = self.fake_quant_weight(self.weight)
+        if self.cache_eval_weight and not self.training:
+            weight = self._cached_eval_weight()
+        else:
+            weight = self._quant_weight()
         out = self.conv(x, weight)
         if self.has_bias:
             return self.bias_add(out, self.bias)
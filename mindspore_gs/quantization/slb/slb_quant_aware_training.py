@@ -23,8 +23,10 @@ from mindspore.train.serialization import load_checkpoint, load_param_into_net
 from mindspore.common.dtype import QuantDtype
 from mindspore_gs.ops.common.quant_op_utils import get_quant_dtype_num_bits
 from mindspore_gs.validator import Validator, Rel
+from mindspore_gs.ops.nn.eval_weight_cache import EvalWeightCache
 from ..quantization_aware_training import QuantizationAwareTraining
 from .slb_net_policy import SlbNetPolicy
+from .slb_fake_quantizer import SlbFakeQuantizerPerLayer
 from .slb_quant_config import SlbQuantConfig
 from .slb_quant_convert import ConvertToQuantInferNetwork
 
@@ -67,10 +69,18 @@ class SlbQuantAwareTraining(QuantizationAwareTraining):
               Default: 0.6.
             - t_factor (float): Multiplicative factor of temperature hyperparameters changing.
               Default: 1.2.
+            - pack_weight (bool): Whether to store weights of converted network as bit-packed codes, which takes
+              8, 4 or 2 weights per byte for int1, int2 or int4 weights, instead of float32 weights. Default: False.
+            - compact_weight (bool): Whether to keep one latent value for each weight instead of one auxiliary
+              coefficient for each weight value, which saves 2^num_bits times of memory of weight and its optimizer
+              states while training. Default: False.
+            - cache_eval_weight (bool): Whether quant convolutions select their discrete weights once when network is
+              set to eval mode, and reuse them in every eval step. Default: False.
 
     Raises:
         TypeError: If `quant_dtype` is not `QuantDtype`, or every element of `quant_dtype` is not `QuantDtype`.
-        TypeError: If `enable_act_quant` or `enable_bn_calibration` is not bool.
+        TypeError: If `enable_act_quant`, `enable_bn_calibration`, `pack_weight`, `compact_weight` or
+            `cache_eval_weight` is not bool.
         ValueError: If the length of `quant_dtype` is greater than 2.
         TypeError: If `epoch_size` or `has_trained_epoch` is not an int.
         TypeError: If `t_start_val`, `t_start_time`, `t_end_time` or `t_factor` is not float.
@@ -333,6 +343,47 @@ class SlbQuantAwareTraining(QuantizationAwareTraining):
         t_factor = Validator.check_positive_float(t_factor, "t_factor", self.__class__.__name__)
         self._config.t_factor = t_factor
 
+    def set_pack_weight(self, pack_weight=False):
+        """
+        Set value of pack_weight of quantization aware training `config`
+
+        Args:
+            pack_weight (bool): Whether to store weights of converted network as bit-packed codes, default is False.
+
+        Raises:
+            TypeError: If `pack_weight` is not bool.
+        """
+        pack_weight = Validator.check_bool(pack_weight, "pack_weight", self.__class__.__name__)
+        self._config.pack_weight = pack_weight
+
+    def set_compact_weight(self, compact_weight=False):
+        """
+        Set value of compact_weight of quantization aware training `config`
+
+        Args:
+            compact_weight (bool): Whether to keep one latent value for each weight instead of one auxiliary
+                coefficient for each weight value, default is False.
+
+        Raises:
+            TypeError: If `compact_weight` is not bool.
+        """
+        compact_weight = Validator.check_bool(compact_weight, "compact_weight", self.__class__.__name__)
+        self._config.compact_weight = compact_weight
+
+    def set_cache_eval_weight(self, cache_eval_weight=False):
+        """
+        Set value of cache_eval_weight of quantization aware training `config`
+
+        Args:
+            cache_eval_weight (bool): Whether quant convolutions select their discrete weights once when network is
+                set to eval mode, default is False.
+
+        Raises:
+            TypeError: If `cache_eval_weight` is not bool.
+        """
+        cache_eval_weight = Validator.check_bool(cache_eval_weight, "cache_eval_weight", self.__class__.__name__)
+        self._config.cache_eval_weight = cache_eval_weight
+
     @staticmethod
     def _convert2list(name, value):
         if not isinstance(value, list) and not isinstance(value, tuple):
@@ -368,6 +419,9 @@ class SlbQuantAwareTraining(QuantizationAwareTraining):
         self.set_t_start_time(config.get("t_start_time", 0.2))
         self.set_t_end_time(config.get("t_end_time", 0.6))
         self.set_t_factor(config.get("t_factor", 1.2))
+        self.set_pack_weight(config.get("pack_weight", False))
+        self.set_compact_weight(config.get("compact_weight", False))
+        self.set_cache_eval_weight(config.get("cache_eval_weight", False))
 
     def callbacks(self, model: Model, dataset: Dataset) -> [Callback]:
         """
@@ -436,7 +490,12 @@ class SlbQuantAwareTraining(QuantizationAwareTraining):
         """
 
         self._qat_policy.build()
-        return super(SlbQuantAwareTraining, self).apply(network)
+        net_opt = super(SlbQuantAwareTraining, self).apply(network)
+        if self._config.cache_eval_weight:
+            for _, cell in net_opt.cells_and_names():
+                if isinstance(cell, EvalWeightCache):
+                    cell.enable_eval_weight_cache()
+        return net_opt
 
     def convert(self, net_opt: Cell, ckpt_path="") -> Cell:
         """
@@ -469,7 +528,8 @@ class SlbQuantAwareTraining(QuantizationAwareTraining):
             not_load_param = load_param_into_net(net_opt, param_dict)
             if not_load_param:
                 raise RuntimeError("Load param into net fail.")
-        exporter = ConvertToQuantInferNetwork(net_opt, get_quant_dtype_num_bits(self._config.weight_quant_dtype))
+        exporter = ConvertToQuantInferNetwork(net_opt, get_quant_dtype_num_bits(self._config.weight_quant_dtype),
+                                              self._config.pack_weight)
         return exporter.run()
 
 
@@ -515,7 +575,7 @@ class TemperatureScheduler(Callback):
             t *= self.t_factor ** (min(epoch, t_end_epoch) - t_start_epoch)
         # Assign new value to temperature parameter
         for _, cell in self.model.train_network.cells_and_names():
-            if cell.cls_name == 'SlbFakeQuantizerPerLayer':  # for SLB
+            if isinstance(cell, SlbFakeQuantizerPerLayer):  # for SLB
                 cell.set_temperature(t)
                 if epoch >= t_end_epoch:
                     cell.set_temperature_end_flag()
@@ -36,3 +36,6 @@ class SlbQuantConfig(CompAlgoConfig):
         self.t_start_time = 0.2
         self.t_end_time = 0.6
         self.t_factor = 1.2
+        self.pack_weight = False
+        self.compact_weight = False
+        self.cache_eval_weight = False
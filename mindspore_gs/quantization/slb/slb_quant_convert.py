@@ -24,6 +24,7 @@ from mindspore.common import dtype as mstype
 from mindspore.common.dtype import QuantDtype
 from ..quantize_wrapper_cell import QuantizeWrapperCell
 from .slb_quant import Conv2dSlbQuant
+from .slb_fake_quantizer import SlbCompactFakeQuantizerPerLayer
 
 
 class CellBlockWithFakeWeight(Cell):
@@ -86,18 +87,149 @@ class CellBlockWithFakeWeight(Cell):
         return s
 
 
+def pack_weight_codes(codes, num_bits):
+    """
+    Pack codes of low-bit weight into bytes, every byte holds 8 // `num_bits` codes from the lowest bits.
+
+    Args:
+        codes (numpy.ndarray): Codes of weight, each code is in range [0, 2 ** `num_bits`).
+        num_bits (int): Number of bits of each code, 1, 2 or 4.
+
+    Returns:
+        numpy.ndarray, packed 1-D uint8 array.
+    """
+    codes_per_byte = 8 // num_bits
+    codes = np.asarray(codes, dtype=np.uint8).ravel()
+    codes = np.pad(codes, (0, -codes.size % codes_per_byte)).reshape(-1, codes_per_byte)
+    shifts = np.arange(codes_per_byte, dtype=np.uint8) * num_bits
+    return np.bitwise_or.reduce(codes << shifts, axis=1).astype(np.uint8)
+
+
+def unpack_weight_codes(packed, num_bits, size):
+    """
+    Unpack codes of low-bit weight packed by `pack_weight_codes`.
+
+    Args:
+        packed (numpy.ndarray): Packed 1-D uint8 array.
+        num_bits (int): Number of bits of each code, 1, 2 or 4.
+        size (int): Number of codes.
+
+    Returns:
+        numpy.ndarray, 1-D uint8 array of codes.
+    """
+    codes_per_byte = 8 // num_bits
+    shifts = np.arange(codes_per_byte, dtype=np.uint8) * num_bits
+    codes = (np.asarray(packed, dtype=np.uint8)[:, None] >> shifts) & ((1 << num_bits) - 1)
+    return codes.ravel()[:size]
+
+
+class CellBlockWithPackedWeight(Cell):
+    """A block of Conv, activation layer with bit-packed low-bit weight for export MINDIR model. Every weight is stored
+       as a `num_bits` code which indexes `w_list`, and codes are unpacked in graph before computation, so weight
+       takes 1 / 32, 1 / 16 or 1 / 8 of memory of fp32 weight for 1, 2 or 4 bits weight.
+
+       Args:
+        core_op (Cell): The operation cell.
+        scale_w (tuple): The quantization parameter scale of the weight.
+        zp_w (tuple): The quantization parameter zero point of the weight.
+        packed_weight (numpy.ndarray): The codes of weight packed by `pack_weight_codes`.
+        weight_shape (tuple): The shape of the weight.
+        w_list (numpy.ndarray): The weight value of each code.
+        bias (Tensor): The bias of the cell. Default: None.
+        activation (str): The regularization function applied to the output of the layer, eg. 'relu'. Default: None.
+        param_dict (dict): The information of the cell.
+    """
+
+    def __init__(self,
+                 core_op,
+                 scale_w,
+                 zp_w,
+                 packed_weight,
+                 weight_shape,
+                 w_list,
+                 bias=None,
+                 activation=None,
+                 param_dict=None):
+
+        super(CellBlockWithPackedWeight, self).__init__()
+        self.core_op = core_op
+        if activation is not None:
+            self.core_op.add_prim_attr(
+                "activation_name", activation.__class__.__name__)
+        if hasattr(core_op, 'pad_mode'):
+            self.core_op.add_prim_attr("pad_mode", core_op.pad_mode)
+
+        self.num_bits = param_dict["num_bits"]
+        self.weight_shape = tuple(weight_shape)
+        self.weight_size = int(np.prod(weight_shape))
+        self.packed_weight = Parameter(Tensor(packed_weight, mstype.uint8), name="packed_weight", requires_grad=False)
+        self.w_list = Tensor(w_list, mstype.float32)
+        codes_per_byte = 8 // self.num_bits
+        self.shifts = Tensor(2 ** (np.arange(codes_per_byte) * self.num_bits).reshape(1, -1), mstype.int32)
+        self.code_mask = Tensor(2 ** self.num_bits, mstype.int32)
+        self.bias = bias
+        self.has_bias = bias is not None
+        self.activation = activation
+        self.has_act = activation is not None
+        self.bias_add = P.BiasAdd()
+        self.cast = P.Cast()
+        self.reshape = P.Reshape()
+        self.expand_dims = P.ExpandDims()
+        self.floor_div = P.FloorDiv()
+        self.floor_mod = P.FloorMod()
+        self.gather = P.Gather()
+        self.fake_weight = Q.FakeQuantParam.linear_quant_param(quant_dtype=param_dict["quant_dtype"],
+                                                               scale=scale_w, zp=zp_w,
+                                                               is_per_channel=param_dict["is_per_channel"])
+
+    def unpack_weight(self):
+        """
+        Unpack weight on host, for example to load weight into a network with fp32 weight.
+
+        Returns:
+            numpy.ndarray, fp32 weight.
+        """
+        codes = unpack_weight_codes(self.packed_weight.asnumpy(), self.num_bits, self.weight_size)
+        return self.w_list.asnumpy()[codes].reshape(self.weight_shape)
+
+    def construct(self, x):
+        packed = self.expand_dims(self.cast(self.packed_weight, mstype.int32), 1)
+        codes = self.floor_mod(self.floor_div(packed, self.shifts), self.code_mask)
+        codes = self.reshape(codes, (-1,))[:self.weight_size]
+        weight = self.reshape(self.gather(self.w_list, codes, 0), self.weight_shape)
+        weight = self.fake_weight(weight)
+        if self.has_bias:
+            x = self.core_op(x, weight)
+            x = self.bias_add(x, self.bias)
+        else:
+            x = self.core_op(x, weight)
+        if self.has_act:
+            x = self.activation(x)
+        return x
+
+    def extend_repr(self):
+        s = f'core_op={type(self.core_op)}, weight=shape[{self.weight_shape}], num_bits={self.num_bits}'
+        if self.has_bias:
+            s += f', bias=shape[{self.bias.shape}]'
+        if self.has_act:
+            s += f', activation={self.activation}'
+        return s
+
+
 class ConvertToQuantInferNetwork:
     """
     Convert quantization aware network to infer network.
 
     Args:
         network (Cell): SlbQuantAwareTraining apply network.
+        weight_quant_bit (int): Number of bits of weight.
+        pack_weight (bool): Whether to store bit-packed weight instead of fp32 weight. Default: False.
 
     Returns:
         Cell, Infer network.
     """
 
-    def __init__(self, network, weight_quant_bit):
+    def __init__(self, network, weight_quant_bit, pack_weight=False):
         if weight_quant_bit == 1:
             self.quant_dtype = QuantDtype.INT1
         elif weight_quant_bit == 2:
@@ -107,6 +239,7 @@ class ConvertToQuantInferNetwork:
         else:
             raise ValueError("Only support int4|int2|int1 weight quant now!")
         self.weight_quant_bit = weight_quant_bit
+        self.pack_weight = pack_weight
         self.network = network
 
     def run(self):
@@ -122,6 +255,18 @@ class ConvertToQuantInferNetwork:
         # get op
         op_core = cell_core.conv
 
+        if self.pack_weight:
+            codes, bias = self.__get_weight_codes_bias(cell_core)
+            quant_params = {"quant_dtype": self.quant_dtype,
+                            "is_per_channel": False,
+                            "num_bits": self.weight_quant_bit}
+            block = CellBlockWithPackedWeight(op_core, tuple(scale_w), tuple(zp_w),
+                                              pack_weight_codes(codes, self.weight_quant_bit), codes.shape,
+                                              self.__get_w_list(), bias, activation, quant_params)
+            # keep parameter names unique in network, for example 'Conv2dSlbQuant._handler.packed_weight'.
+            block.update_parameters_name(cell_core.weight.name[:-len("weight")])
+            return block
+
         # get the `weight` and `bias`
         weight, bias = self.__get_weight_bias(cell_core)
         quant_params = {"quant_dtype": self.quant_dtype,
@@ -136,6 +281,20 @@ class ConvertToQuantInferNetwork:
         zp_w = np.zeros(1)
         return scale_w, zp_w
 
+    def __get_w_list(self):
+        """Get weight value of each code"""
+        if self.weight_quant_bit == 1:
+            return np.array([-1, 1], np.float32)
+        return np.linspace(-1, 1, 2**self.weight_quant_bit).astype(np.float32)
+
+    def __get_weight_codes_bias(self, cell_core):
+        """Get codes of weight, which are indexes of the selected weight value, and bias"""
+        codes = cell_core.fake_quant_weight.get_codes(cell_core.weight).asnumpy()
+        bias = None
+        if cell_core.has_bias:
+            bias = Tensor(cell_core.bias.data.asnumpy(), mstype.float32)
+        return codes, bias
+
     def __convert_weight5d_to_weight4d(self, cell_core):
         """Convert slb 5d weight to normal 4d weight"""
         argmax = P.Argmax()
@@ -143,15 +302,9 @@ class ConvertToQuantInferNetwork:
         reduce_sum = P.ReduceSum()
         true_tensor = Tensor(1, mstype.float32)
         false_tensor = Tensor(0, mstype.float32)
-        num_bits = self.weight_quant_bit
 
-        if num_bits == 1:
-            w_list = Parameter(Tensor([-1, 1], mstype.float32).view(1, 1, 1, 1, -1),
-                               name='w_list', requires_grad=False)
-        else:
-            w_list_init = np.linspace(-1, 1, 2**num_bits)
-            w_list = Parameter(Tensor(w_list_init, mstype.float32).view(1, 1, 1, 1, -1),
-                               name='w_list', requires_grad=False)
+        w_list = Parameter(Tensor(self.__get_w_list(), mstype.float32).view(1, 1, 1, 1, -1),
+                           name='w_list', requires_grad=False)
 
         # Convert 5d weight to 4d weight
         conv2dquant_weights5d = cell_core.weight
@@ -165,7 +318,11 @@ class ConvertToQuantInferNetwork:
 
     def __get_weight_bias(self, cell_core):
         """Get weight and bias for quantizaiton"""
-        weight_tensor = self.__convert_weight5d_to_weight4d(cell_core)
+        if isinstance(cell_core.fake_quant_weight, SlbCompactFakeQuantizerPerLayer):
+            codes = cell_core.fake_quant_weight.get_codes(cell_core.weight).asnumpy()
+            weight_tensor = Tensor(self.__get_w_list()[codes], mstype.float32)
+        else:
+            weight_tensor = self.__convert_weight5d_to_weight4d(cell_core)
         bias = None
         if isinstance(cell_core, Conv2dSlbQuant):
             if cell_core.has_bias:
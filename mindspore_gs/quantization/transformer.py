@@ -13,6 +13,7 @@
 # limitations under the License.
 # ============================================================================
 """Transformer."""
+from collections import deque
 from typing import List, Union
 from mindspore.rewrite import PatternEngine, PatternNode, Node, SymbolTree
 from .layer_policy import LayerPolicy, layer_policy_key
@@ -32,11 +33,34 @@ class Transformer(PatternEngine):
     def _set_node_visited(self, node: Node):
         node.set_attribute(self._node_visited_key, True)
 
-    def _get_inputs_of_matched(self, matched_dict):
+    def root_type(self):
+        """
+        Get the instance type of the root node of pattern.
+
+        Returns:
+            Instance type of root node, None if root node of pattern matches nodes of any type.
+        """
+        pattern_type = getattr(self._pattern, "type", None)
+        root_type = pattern_type() if callable(pattern_type) else None
+        return root_type if isinstance(root_type, type) else None
+
+    def _try_match(self, node: Node):
+        """Match pattern at `node`, return matched dict, or None if not matched or overlapped with matched nodes."""
+        matched, matched_dict = self._match(self._pattern, node)
+        if not matched or not PatternEngine._check_match(self._pattern, matched_dict):
+            return None
+        for matched_node in matched_dict.values():
+            if self._is_node_visited(matched_node):
+                return None
+        return matched_dict
+
+    @staticmethod
+    def _get_inputs_of_matched(matched_dict):
         inputs_of_matched: [Node] = []
-        for _, matched_node in matched_dict.items():
-            for node_input in matched_node.inputs:
-                if node_input in matched_dict.values():
+        matched_list = list(matched_dict.values())
+        for matched_node in matched_list:
+            for node_input in matched_node.get_inputs():
+                if node_input in matched_list:
                     continue
                 inputs_of_matched.append(node_input)
         return inputs_of_matched
@@ -45,12 +69,13 @@ class Transformer(PatternEngine):
         """remove fake quant if nodes are not inputs or outputs of pattern"""
         matched_list = list(matched_dict.values())
         output = matched_dict.get(self._pattern.name())
+        inputs_of_matched = Transformer._get_inputs_of_matched(matched_dict)
         inputs: [] = []
         for matched_node in matched_list:
-            node_inputs = matched_node.inputs
+            node_inputs = matched_node.get_inputs()
             is_input_node = False
             for node_input in node_inputs:
-                if node_input in matched_dict.values():
+                if node_input in matched_list:
                     continue
                 is_input_node = True
             if is_input_node:
@@ -72,39 +97,68 @@ class Transformer(PatternEngine):
             if is_output and not is_input:
                 node_policy.set_input_not_insert_fq()
                 continue
-            for i in range(0, len(matched_node.inputs)):
-                node_input = matched_node.inputs[i]
+            node_inputs = matched_node.get_inputs()
+            for i in range(0, len(node_inputs)):
+                node_input = node_inputs[i]
                 if node_input in inputs_of_matched:
                     continue
                 node_policy.set_input_not_insert_fq(i)
 
-    def apply(self, symbol_tree: SymbolTree) -> bool:
-        """transform origin net for quantization algorithm"""
+    @staticmethod
+    def _index_nodes_by_type(symbol_tree: SymbolTree):
+        """
+        Traverse nodes from return node to inputs once, every node is visited once.
+
+        Returns:
+            List of nodes in order of traversal, and dict which groups these nodes by instance type in the same order.
+        """
         root: Node = symbol_tree.get_return_node()
-        # IR match
-        queue: [Node] = [root]
+        queue = deque([root])
+        enqueued = {root.get_name()}
+        nodes: [Node] = []
         while queue:
-            cur_node: Node = queue.pop(0)
-            cur_node_inputs = cur_node.get_inputs()
-            matched, matched_dict = self._match(self._pattern, cur_node)
-            if not matched or not PatternEngine._check_match(self._pattern, matched_dict):
-                for cur_node_input in cur_node_inputs:
-                    queue.append(cur_node_input)
-                continue
-            matched_list = list(matched_dict.values())
-            overlapped = False
-            for matched_node in matched_list:
-                if self._is_node_visited(matched_node):
-                    overlapped = True
-                    break
-            if overlapped:
-                for cur_node_input in cur_node_inputs:
-                    queue.append(cur_node_input)
-                continue
-            for matched_node in matched_list:
-                self._set_node_visited(matched_node)
+            cur_node: Node = queue.popleft()
+            nodes.append(cur_node)
+            for next_node in cur_node.get_inputs():
+                if next_node.get_name() in enqueued:
+                    continue
+                enqueued.add(next_node.get_name())
+                queue.append(next_node)
+        type_index: {type: [Node]} = {}
+        for node in nodes:
+            type_index.setdefault(node.get_instance_type(), []).append(node)
+        return nodes, type_index
+
+    @staticmethod
+    def apply_transformers(symbol_tree: SymbolTree, transformers: ["Transformer"]) -> bool:
+        """
+        Apply several transformers on `symbol_tree`, result is the same as applying them one by one in order of
+        `transformers`: a transformer in front of `transformers` takes effect on its matched nodes, and later
+        transformers can not match these nodes again. `symbol_tree` is traversed only once, nodes are indexed by their
+        instance type, and every transformer only tries to match at nodes of its root type in order of traversal.
 
-            inputs_of_matched = self._get_inputs_of_matched(matched_dict)
-            self._remove_inner_node_fake_quantitizer(inputs_of_matched)
-            queue.extends(inputs_of_matched)
+        Args:
+            symbol_tree (SymbolTree): SymbolTree to be transformed.
+            transformers (list[Transformer]): Transformers to be applied, in order of priority.
+
+        Returns:
+            False, Transformer only modifies layer policies of nodes and never modifies `symbol_tree`.
+        """
+        nodes, type_index = Transformer._index_nodes_by_type(symbol_tree)
+        for transformer in transformers:
+            root_type = transformer.root_type()
+            candidates = nodes if root_type is None else type_index.get(root_type, [])
+            for node in candidates:
+                if transformer._is_node_visited(node):
+                    continue
+                matched_dict = transformer._try_match(node)
+                if matched_dict is None:
+                    continue
+                for matched_node in matched_dict.values():
+                    transformer._set_node_visited(matched_node)
+                transformer._remove_inner_node_fake_quantitizer(matched_dict)
         return False
+
+    def apply(self, symbol_tree: SymbolTree) -> bool:
+        """transform origin net for quantization algorithm"""
+        return Transformer.apply_transformers(symbol_tree, [self])
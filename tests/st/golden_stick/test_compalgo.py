@@ -14,9 +14,14 @@
 # ============================================================================
 """test CompAlgo."""
 
+import os
+import types
 import pytest
+import numpy as np
 
-from mindspore.nn import Cell
+import mindspore
+from mindspore import context, Tensor
+from mindspore.nn import Cell, Dense
 from mindspore_gs.comp_algo import ExportMindIRCallBack
 from mindspore_gs import CompAlgo
 
@@ -103,3 +108,134 @@ def test_set_save_mindir_path():
     except ValueError:
         pass
     assert not has_error
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_set_defer_export():
+    """
+    Feature: defer_export and save_mindir_interval config of CompAlgo.
+    Description: Set config by constructor and setters, and input invalid value.
+    Expectation: Config is passed to export callback, and invalid value raises error.
+    """
+    algo = ExampleAlgo({"save_mindir": True, "defer_export": True, "save_mindir_interval": 2})
+    cb = algo.callbacks()[0]
+    assert cb._defer_export
+    assert cb._save_mindir_interval == 2
+    algo = ExampleAlgo({"save_mindir": True})
+    assert not algo._config.defer_export
+    assert algo._config.save_mindir_interval == 0
+    with pytest.raises(TypeError):
+        algo.set_defer_export(1)
+    with pytest.raises(TypeError):
+        algo.set_save_mindir_interval(True)
+    with pytest.raises(ValueError):
+        algo.set_save_mindir_interval(-1)
+
+
+class _ConvertCountAlgo(ExampleAlgo):
+    """ExampleAlgo counting times of convert."""
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.num_convert = 0
+
+    def convert(self, net_opt: Cell, ckpt_path="") -> Cell:
+        self.num_convert += 1
+        return net_opt
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("defer_export", [False, True])
+def test_export_callback_periodic(tmp_path, defer_export):
+    """
+    Feature: ExportMindIRCallBack periodic export.
+    Description: Export MindIR every epoch at the end of epochs or after training, parameters are not changed in
+        some epochs.
+    Expectation: MindIR is exported for every epoch with parameters of that epoch, network with identical parameters
+        is converted only once. Deferred exports keep only checkpoint files of distinct parameters during training,
+        and these files are removed after MindIRs are exported at train end.
+    """
+    context.set_context(mode=context.GRAPH_MODE, device_target="CPU")
+    mindir_path = os.path.join(str(tmp_path), "dense")
+    algo = _ConvertCountAlgo({"save_mindir": True, "save_mindir_path": mindir_path, "defer_export": defer_export,
+                              "save_mindir_interval": 1})
+    cb = algo.callbacks()[0]
+    network = Dense(4, 2)
+    cb_params = types.SimpleNamespace(network=network, train_dataset=Tensor(np.ones((1, 4), np.float32)),
+                                      cur_epoch_num=0, epoch_num=3)
+    run_context = types.SimpleNamespace(original_args=lambda: cb_params)
+    for epoch in range(1, 4):
+        cb_params.cur_epoch_num = epoch
+        if epoch == 3:
+            network.weight.set_data(Tensor(np.ones((2, 4), np.float32)))
+        cb.on_train_epoch_end(run_context)
+    deferred_ckpts = [name for name in os.listdir(str(tmp_path)) if name.endswith(".deferred.ckpt")]
+    if defer_export:
+        # exporting compiles network, it is not run concurrently with training.
+        assert algo.num_convert == 0
+        assert not [name for name in os.listdir(str(tmp_path)) if name.endswith(".mindir")]
+        # parameters of epoch 2 are identical to epoch 1, only one checkpoint is kept and no array is kept in memory.
+        assert deferred_ckpts == ["dense_epoch1.deferred.ckpt"]
+        assert all(not isinstance(item, np.ndarray) for entry in cb._deferred for item in entry)
+    else:
+        assert algo.num_convert == 1
+        assert not deferred_ckpts
+    cb.on_train_end(run_context)
+    for file_name in ["dense_epoch1.mindir", "dense_epoch2.mindir", "dense.mindir"]:
+        assert os.path.exists(os.path.join(str(tmp_path), file_name))
+    assert not os.path.exists(os.path.join(str(tmp_path), "dense_epoch3.mindir"))
+    assert not [name for name in os.listdir(str(tmp_path)) if name.endswith(".deferred.ckpt")]
+    assert not cb._deferred
+    assert algo.num_convert == 2
+    graph = mindspore.load(mindir_path + ".mindir")
+    assert graph is not None
+
+
+class _ConvertErrorAlgo(ExampleAlgo):
+    """ExampleAlgo whose convert fails except for the first time."""
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.num_convert = 0
+
+    def convert(self, net_opt: Cell, ckpt_path="") -> Cell:
+        self.num_convert += 1
+        if self.num_convert > 1:
+            raise ValueError("convert failed")
+        return net_opt
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_export_callback_deferred_error(tmp_path):
+    """
+    Feature: ExportMindIRCallBack deferred export.
+    Description: Export MindIR of epochs after training with `defer_export`, and converting of some epoch fails.
+    Expectation: Error is raised from on_train_end, other deferred MindIRs and MindIR of trained network are still
+        exported.
+    """
+    context.set_context(mode=context.GRAPH_MODE, device_target="CPU")
+    mindir_path = os.path.join(str(tmp_path), "dense")
+    algo = _ConvertErrorAlgo({"save_mindir": True, "save_mindir_path": mindir_path, "defer_export": True,
+                              "save_mindir_interval": 1})
+    cb = algo.callbacks()[0]
+    network = Dense(4, 2)
+    cb_params = types.SimpleNamespace(network=network, train_dataset=Tensor(np.ones((1, 4), np.float32)),
+                                      cur_epoch_num=0, epoch_num=3)
+    run_context = types.SimpleNamespace(original_args=lambda: cb_params)
+    for epoch, value in zip(range(1, 4), [1, 2, 1]):
+        cb_params.cur_epoch_num = epoch
+        network.weight.set_data(Tensor(np.full((2, 4), value, np.float32)))
+        cb.on_train_epoch_end(run_context)
+    with pytest.raises(RuntimeError):
+        cb.on_train_end(run_context)
+    assert os.path.exists(os.path.join(str(tmp_path), "dense_epoch1.mindir"))
+    assert not os.path.exists(os.path.join(str(tmp_path), "dense_epoch2.mindir"))
+    # trained network has the same parameters as epoch 1, so MindIR of epoch 1 is copied.
+    assert os.path.exists(os.path.join(str(tmp_path), "dense.mindir"))
+    assert not [name for name in os.listdir(str(tmp_path)) if name.endswith(".deferred.ckpt")]
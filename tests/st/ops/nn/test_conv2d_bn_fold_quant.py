@@ -38,3 +38,56 @@ def test_conv2d_bn_fold_quant():
     expect_output = np.array([[5.9296875, 13.8359375], [11.859375, 17.78125]]).astype(np.float32)
     result = conv2d_bnfold(x).asnumpy()
     assert np.allclose(expect_output, result, 0.001, 0.001)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("has_bias", [False, True])
+def test_conv2d_bn_fold_quant_single_conv(has_bias):
+    """
+    Feature: Test nn ops Conv2dBnFoldQuant with single_conv.
+    Description: Train Conv2dBnFoldQuant without fake quant in single convolution mode and in two convolution mode.
+    Expectation: Outputs, moving mean and moving variance of two modes are the same.
+    """
+    np.random.seed(1)
+    x = Tensor(np.random.normal(size=(4, 3, 8, 8)), mindspore.float32)
+    weight = Tensor(np.random.normal(size=(6, 3, 3, 3)), mindspore.float32)
+    gamma = Tensor(np.random.uniform(0.5, 1.5, size=(6,)), mindspore.float32)
+    var = Tensor(np.random.uniform(0.5, 1.5, size=(6,)), mindspore.float32)
+    results = []
+    for single_conv in (False, True):
+        conv2d_bnfold = Conv2dBnFoldQuant(3, 6, kernel_size=3, has_bias=has_bias, bias_init="ones", weight_init=weight,
+                                          gamma_init=gamma, var_init=var, fake=False,
+                                          quant_config=create_quant_config(), single_conv=single_conv)
+        conv2d_bnfold.set_train()
+        output = conv2d_bnfold(x).asnumpy()
+        results.append((output, conv2d_bnfold.moving_mean.asnumpy(), conv2d_bnfold.moving_variance.asnumpy()))
+    for expect, result in zip(*results):
+        assert np.allclose(expect, result, 1e-4, 1e-4)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_conv2d_bn_fold_quant_single_conv_zero_gamma():
+    """
+    Feature: Test nn ops Conv2dBnFoldQuant with single_conv.
+    Description: Train Conv2dBnFoldQuant in single convolution mode and in two convolution mode with gamma of some
+        channels being 0.
+    Expectation: Outputs and moving statistics of single convolution mode are finite and close to two convolution mode.
+    """
+    np.random.seed(1)
+    x = Tensor(np.random.normal(size=(4, 3, 8, 8)), mindspore.float32)
+    weight = Tensor(np.random.normal(size=(6, 3, 3, 3)), mindspore.float32)
+    gamma = Tensor(np.array([1.0, 0.0, 0.5, -0.0, -1.0, 1.5]), mindspore.float32)
+    results = []
+    for single_conv in (False, True):
+        conv2d_bnfold = Conv2dBnFoldQuant(3, 6, kernel_size=3, weight_init=weight, gamma_init=gamma, fake=False,
+                                          quant_config=create_quant_config(), single_conv=single_conv)
+        conv2d_bnfold.set_train()
+        output = conv2d_bnfold(x).asnumpy()
+        results.append((output, conv2d_bnfold.moving_mean.asnumpy(), conv2d_bnfold.moving_variance.asnumpy()))
+    for expect, result in zip(*results):
+        assert np.isfinite(result).all()
+        assert np.allclose(expect, result, 1e-3, 1e-3)
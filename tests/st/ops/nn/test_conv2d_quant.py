@@ -38,3 +38,30 @@ def test_conv2d_quant():
     result = conv2d_quant(x).asnumpy()
     expect_output = np.array([[5.9296875, 13.8359375], [11.859375, 17.78125]]).astype(np.float32)
     assert np.allclose(expect_output, result, 0.001, 0.001)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_gpu_training
+@pytest.mark.env_onecard
+def test_conv2d_quant_eval_weight_cache():
+    """
+    Feature: Eval weight cache of nn ops Conv2dQuant.
+    Description: Enable eval weight cache, change weight in train mode and then set to eval mode again.
+    Expectation: Output in eval mode is the same as without cache, and cache is refreshed by `set_train(False)`.
+    """
+    qconfig = create_quant_config()
+    conv2d_quant = Conv2dQuant(1, 1, kernel_size=(2, 2), stride=(1, 1), pad_mode="valid",
+                               weight_init='ones', quant_config=qconfig)
+    x = Tensor(np.array([[[[1, 0, 3], [1, 4, 7], [2, 5, 2]]]]), mindspore.float32)
+    conv2d_quant.set_train(False)
+    expect_output = conv2d_quant(x).asnumpy()
+    conv2d_quant.enable_eval_weight_cache()
+    assert np.allclose(conv2d_quant.eval_weight.asnumpy(), conv2d_quant._quant_weight().asnumpy())
+    assert np.allclose(conv2d_quant(x).asnumpy(), expect_output)
+
+    cached_weight = conv2d_quant.eval_weight.asnumpy()
+    conv2d_quant.set_train(True)
+    conv2d_quant.weight.set_data(Tensor(np.full((1, 1, 2, 2), 2), mindspore.float32))
+    conv2d_quant.set_train(False)
+    assert not np.allclose(conv2d_quant.eval_weight.asnumpy(), cached_weight)
+    assert np.allclose(conv2d_quant.eval_weight.asnumpy(), conv2d_quant._quant_weight().asnumpy())
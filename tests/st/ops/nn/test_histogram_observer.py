@@ -0,0 +1,94 @@
+# Copyright 2023 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""test_histogram_observer"""
+import pytest
+import numpy as np
+
+import mindspore
+from mindspore import Tensor, context
+from mindspore_gs.ops.nn import HistogramObserver
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_histogram_observer():
+    """
+    Feature: Test nn ops HistogramObserver.
+    Description: Feed data into HistogramObserver.
+    Expectation: Data is returned unchanged and histogram is the same as numpy histogram.
+    """
+    context.set_context(mode=context.PYNATIVE_MODE, device_target="CPU")
+    observer = HistogramObserver(bins=8)
+    x = Tensor(np.array([[1, 2, 1], [-2, 0, -1]]), mindspore.float32)
+    result = observer(x).asnumpy()
+    assert np.array_equal(result, x.asnumpy())
+    assert np.array_equal(observer.histogram.asnumpy(), [0, 0, 1, 1, 1, 2, 1, 0])
+    assert observer.get_min_max() == (-2.0, 2.0)
+
+    with pytest.raises(ValueError):
+        HistogramObserver(bins=10)
+    with pytest.raises(RuntimeError):
+        HistogramObserver().get_min_max()
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_histogram_observer_merge():
+    """
+    Feature: Test nn ops HistogramObserver.
+    Description: Feed batches with growing range into observers and merge observers of different shards.
+    Expectation: Histogram is the same as observing all data at once.
+    """
+    np.random.seed(1)
+    batches = [np.random.normal(size=1000).astype(np.float32) * scale for scale in (0.1, 1, 10, 3, 100, 0.01)]
+    expect = HistogramObserver(bins=64)
+    expect.update(np.concatenate(batches))
+    streaming = HistogramObserver(bins=64)
+    for batch in batches:
+        streaming.update(batch)
+    shard0, shard1 = HistogramObserver(bins=64), HistogramObserver(bins=64)
+    for batch in batches[:3]:
+        shard0.update(batch)
+    for batch in batches[3:]:
+        shard1.update(batch)
+    shard0.merge(shard1)
+    for observer in (streaming, shard0):
+        assert np.array_equal(observer.histogram.asnumpy(), expect.histogram.asnumpy())
+        assert observer.get_min_max() == expect.get_min_max()
+
+    with pytest.raises(ValueError):
+        shard0.merge(HistogramObserver(bins=32))
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_histogram_observer_thresholds():
+    """
+    Feature: Test nn ops HistogramObserver.
+    Description: Compute percentile, KL and MSE thresholds of normal distributed data from histogram.
+    Expectation: Thresholds are close to the ones computed from data.
+    """
+    np.random.seed(1)
+    x = np.random.normal(size=200000).astype(np.float32)
+    observer = HistogramObserver()
+    observer.update(x)
+    lower, upper = observer.get_percentile_min_max(99.9)
+    assert np.allclose([lower, upper], np.percentile(x, [0.05, 99.95]), atol=0.01)
+    assert observer.get_percentile_min_max(100) == observer.get_min_max()
+    assert 3.5 < observer.get_kl_threshold() < 4.1
+    assert 3 < observer.get_mse_threshold() < 5
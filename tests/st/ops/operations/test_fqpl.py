@@ -26,10 +26,10 @@ import mindspore_gs.ops.operations as custom_Q
 class FakeQuantPerLayerNet(Cell):
     """Net."""
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         """Init."""
         super(FakeQuantPerLayerNet, self).__init__()
-        self.program = custom_Q.FakeQuantPerLayer()
+        self.program = custom_Q.FakeQuantPerLayer(**kwargs)
 
     def construct(self, x, min_val, max_val):
         """Construct."""
@@ -49,6 +49,27 @@ class MSNet(Cell):
         return self.program(x, min_val, max_val)
 
 
+def _nudge_ref(x_min, x_max, num_bits, symmetric, narrow_range):
+    """NumPy reference of nudging quantization range."""
+    quant_min = np.float32(1 if narrow_range else 0)
+    quant_max = np.float32(2 ** num_bits - 1)
+    if symmetric:
+        x_min, x_max = np.where(np.abs(x_min) < x_max, -x_max, x_min), np.where(np.abs(x_min) < x_max, x_max, -x_min)
+    scale = (x_max - x_min) / (quant_max - quant_min)
+    zero_point = np.clip(np.floor(quant_min - x_min / scale + np.float32(0.5)), quant_min, quant_max)
+    return (quant_min - zero_point) * scale, (quant_max - zero_point) * scale, scale
+
+
+def _fake_quant_ref(x, x_min, x_max, num_bits, symmetric, narrow_range):
+    """NumPy reference of fake quantization and its gradient, channels are split along the first axis of `x`."""
+    channels = x.reshape(x_min.size, -1)
+    nudge_min, nudge_max, scale = [value.reshape(-1, 1) for value in
+                                   _nudge_ref(x_min.reshape(-1), x_max.reshape(-1), num_bits, symmetric, narrow_range)]
+    out = np.floor((np.clip(channels, nudge_min, nudge_max) - nudge_min) / scale + np.float32(0.5)) * scale + nudge_min
+    grad = ((channels >= nudge_min) & (channels <= nudge_max)).astype(np.float32)
+    return out.reshape(x.shape), grad.reshape(x.shape)
+
+
 @pytest.mark.level0
 @pytest.mark.platform_x86_gpu_training
 @pytest.mark.env_onecard
@@ -77,3 +98,31 @@ def test_fqpl_gpu(mode):
     expect_bprop_out = ops.GradOperation(sens_param=True, get_all=True)(ms_net)(
         Tensor(x), Tensor(min_val), Tensor(max_val), Tensor(sens))[0].asnumpy()
     assert np.allclose(expect_bprop_out, bprop_out, 0.001, 0.001)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("num_bits", [4, 8])
+@pytest.mark.parametrize("symmetric", [True, False])
+@pytest.mark.parametrize("narrow_range", [True, False])
+def test_fqpl_cpu(num_bits, symmetric, narrow_range):
+    """
+    Feature: Test ops FakeQuantPerLayer on CPU.
+    Description: Run forward and backward of FakeQuantPerLayer with CPU kernel.
+    Expectation: Output and gradient are the same as NumPy reference.
+    """
+    context.set_context(mode=context.GRAPH_MODE, device_target='CPU')
+    np.random.seed(1)
+    x = (np.random.normal(size=(8, 3, 16, 16)) * 3).astype(np.float32)
+    min_val = np.random.uniform(-4, -0.5, size=1).astype(np.float32)
+    max_val = np.random.uniform(0.5, 4, size=1).astype(np.float32)
+    sens = np.random.normal(size=(8, 3, 16, 16)).astype(np.float32)
+    expect, expect_grad = _fake_quant_ref(x, min_val, max_val, num_bits, symmetric, narrow_range)
+
+    net = FakeQuantPerLayerNet(num_bits=num_bits, symmetric=symmetric, narrow_range=narrow_range)
+    output = net(Tensor(x), Tensor(min_val), Tensor(max_val)).asnumpy()
+    assert np.allclose(expect, output, 1e-5, 1e-5)
+    bprop_out = ops.GradOperation(sens_param=True, get_all=True)(net)(
+        Tensor(x), Tensor(min_val), Tensor(max_val), Tensor(sens))[0].asnumpy()
+    assert np.allclose(expect_grad * sens, bprop_out, 1e-5, 1e-5)
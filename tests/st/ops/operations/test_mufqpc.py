@@ -0,0 +1,99 @@
+# Copyright 2023 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test MinMaxUpdateFakeQuantPerChannel ops."""
+import pytest
+import numpy as np
+
+from mindspore import context, Tensor
+from mindspore.nn import Cell
+import mindspore.ops as ops
+import mindspore_gs.ops.operations as custom_Q
+
+
+class FusedNet(Cell):
+    """Net with fused min max update and fake quant."""
+
+    def __init__(self, **kwargs):
+        """Init."""
+        super(FusedNet, self).__init__()
+        self.program = custom_Q.MinMaxUpdateFakeQuantPerChannel(**kwargs)
+
+    def construct(self, x, min_val, max_val):
+        """Construct."""
+        return self.program(x, min_val, max_val)
+
+
+class UnfusedNet(Cell):
+    """Net with separated min max update and fake quant."""
+
+    def __init__(self, ema=False, ema_decay=0.999, **kwargs):
+        """Init."""
+        super(UnfusedNet, self).__init__()
+        self.min_max_update = custom_Q.MinMaxUpdatePerChannel(ema=ema, ema_decay=ema_decay, channel_axis=0)
+        self.fake_quant = custom_Q.FakeQuantPerChannel(ema=ema, ema_decay=ema_decay, channel_axis=0, **kwargs)
+
+    def construct(self, x, min_val, max_val):
+        """Construct."""
+        new_min, new_max = self.min_max_update(x, min_val, max_val)
+        return self.fake_quant(x, new_min, new_max), new_min, new_max
+
+
+class FakeQuantOutput(Cell):
+    """Take fake quant output of net."""
+
+    def __init__(self, net):
+        """Init."""
+        super(FakeQuantOutput, self).__init__()
+        self.net = net
+
+    def construct(self, x, min_val, max_val):
+        """Construct."""
+        return self.net(x, min_val, max_val)[0]
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("ema", [True, False])
+@pytest.mark.parametrize("symmetric", [True, False])
+@pytest.mark.parametrize("narrow_range", [True, False])
+def test_mufqpc_cpu(ema, symmetric, narrow_range):
+    """
+    Feature: Test ops MinMaxUpdateFakeQuantPerChannel on CPU.
+    Description: Run forward and backward of MinMaxUpdateFakeQuantPerChannel with CPU kernel.
+    Expectation: Output, updated range and gradient are the same as MinMaxUpdatePerChannel followed by
+        FakeQuantPerChannel.
+    """
+    context.set_context(mode=context.GRAPH_MODE, device_target='CPU')
+    np.random.seed(1)
+    x = (np.random.normal(size=(16, 8, 3, 3)) * np.random.uniform(0.5, 4, size=(16, 1, 1, 1))).astype(np.float32)
+    min_val = np.random.uniform(-4, -0.5, size=16).astype(np.float32)
+    max_val = np.random.uniform(0.5, 4, size=16).astype(np.float32)
+    sens = np.random.normal(size=(16, 8, 3, 3)).astype(np.float32)
+    kwargs = {"ema": ema, "ema_decay": 0.9, "symmetric": symmetric, "narrow_range": narrow_range}
+
+    inputs = (Tensor(x), Tensor(min_val), Tensor(max_val))
+    outputs = FusedNet(**kwargs)(*inputs)
+    expects = UnfusedNet(**kwargs)(*inputs)
+    for output, expect in zip(outputs, expects):
+        assert np.allclose(expect.asnumpy(), output.asnumpy(), 1e-5, 1e-5)
+
+    grad_op = ops.GradOperation(sens_param=True)
+    grad = grad_op(FakeQuantOutput(FusedNet(**kwargs)))(*inputs, Tensor(sens)).asnumpy()
+    expect_grad = grad_op(FakeQuantOutput(UnfusedNet(**kwargs)))(*inputs, Tensor(sens)).asnumpy()
+    assert np.allclose(expect_grad, grad, 1e-5, 1e-5)
+
+    with pytest.raises(ValueError):
+        custom_Q.MinMaxUpdateFakeQuantPerChannel(channel_axis=1)
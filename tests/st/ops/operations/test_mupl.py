@@ -26,10 +26,10 @@ import mindspore_gs.ops.operations as custom_Q
 class MinmaxUpdateLayerNet(Cell):
     """Net."""
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         """Init."""
         super(MinmaxUpdateLayerNet, self).__init__()
-        self.program = custom_Q.MinMaxUpdatePerLayer()
+        self.program = custom_Q.MinMaxUpdatePerLayer(**kwargs)
 
     def construct(self, x, min_val, max_val):
         """Construct."""
@@ -78,3 +78,27 @@ def test_mupl_gpu(mode):
     assert np.allclose(out_x_ms.asnumpy(), out_x.asnumpy(), 0.00001, 0.00001)
     assert np.allclose(out_min_ms.asnumpy(), out_min.asnumpy(), 0.00001, 0.00001)
     assert np.allclose(out_max_ms.asnumpy(), out_max.asnumpy(), 0.00001, 0.00001)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("ema", [True, False])
+def test_mupl_cpu(ema):
+    """
+    Feature: Test ops MinMaxUpdatePerLayer on CPU.
+    Description: Run MinMaxUpdatePerLayer with CPU kernel.
+    Expectation: Updated min and max are the same as NumPy reference.
+    """
+    context.set_context(mode=context.GRAPH_MODE, device_target='CPU')
+    np.random.seed(1)
+    x = np.random.normal(size=(64, 1000)).astype(np.float32)
+    min_val = np.random.uniform(-1, 0, size=1).astype(np.float32)
+    max_val = np.random.uniform(0, 1, size=1).astype(np.float32)
+    ema_decay = np.float32(0.9)
+    x_min, x_max = x.min(axis=None), x.max(axis=None)
+    if ema:
+        x_min = ema_decay * x_min + (1 - ema_decay) * min_val
+        x_max = ema_decay * x_max + (1 - ema_decay) * max_val
+    out = MinmaxUpdateLayerNet(ema=ema, ema_decay=0.9)(Tensor(x), Tensor(min_val), Tensor(max_val))
+    assert np.allclose(out.asnumpy(), np.minimum(x_min, 0) + np.maximum(x_max, 0), 1e-5, 1e-5)
@@ -15,7 +15,9 @@
 """test qat."""
 
 import pytest
-from mindspore_gs.pruner.scop.scop_pruner import PrunerFtCompressAlgo
+import numpy as np
+import mindspore.dataset as ds
+from mindspore_gs.pruner.scop.scop_pruner import PrunerFtCompressAlgo, PrunerKfCompressAlgo, KfCallback
 
 
 @pytest.mark.level0
@@ -61,3 +63,34 @@ def test_constructor_error():
     with pytest.raises(ValueError, match="For 'PrunerFtCompressAlgo', the 'prune_rate' must be in range of "
                                          "\\[0.0, 1.0\\), but got 1.1 with type 'float'."):
         PrunerFtCompressAlgo(config)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_knockoff_dataset():
+    """
+    Feature: SCOP knockoff data in dataset pipeline.
+    Description: Generate knockoff data of a batched dataset by `knockoff_dataset`.
+    Expectation: Each batch is followed by a permutation of itself, images and labels are permuted in the same way,
+        and KfCallback is not returned by `callbacks`.
+    """
+
+    algo = PrunerKfCompressAlgo({})
+    assert isinstance(algo.callbacks()[0], KfCallback)
+    image = np.arange(32 * 3).reshape(32, 3).astype(np.float32)
+    label = np.arange(32).astype(np.int32)
+    dataset = ds.NumpySlicesDataset({"image": image, "label": label}, shuffle=False).batch(8)
+    dataset = algo.knockoff_dataset(dataset)
+    assert not any(isinstance(cb, KfCallback) for cb in algo.callbacks())
+    num_batches = 0
+    for batch in dataset.create_dict_iterator(output_numpy=True):
+        batch_image, batch_label = batch["image"], batch["label"]
+        assert batch_image.shape == (16, 3) and batch_label.shape == (16,)
+        assert np.array_equal(batch_image[:8], image[num_batches * 8:(num_batches + 1) * 8])
+        assert sorted(batch_label[8:].tolist()) == batch_label[:8].tolist()
+        assert np.array_equal(batch_image[8:], image[batch_label[8:]])
+        num_batches += 1
+    assert num_batches == 4
+    with pytest.raises(TypeError):
+        algo.knockoff_dataset(dataset, "image")
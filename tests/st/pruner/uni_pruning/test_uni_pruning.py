@@ -16,11 +16,16 @@
 
 import os
 import sys
+import copy
 import types
+import numpy as np
 import mindspore
 from mindspore import context
 import pytest
 from mindspore_gs.pruner.uni_pruning import UniPruner
+from mindspore_gs.pruner.uni_pruning.graph_analyzer import GraphAnalyzer
+from mindspore_gs.pruner.uni_pruning.utils import get_channel_importances, get_mask, MaskSearcher, PruningExecutor, \
+    find_ms_cell, get_expanded_mask, AsyncExporter
 
 sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), '../../../models/official/cv/'))
 
@@ -92,6 +97,162 @@ def test_callback(run_mode):
     print("============== test uni pruning callback success ==============")
 
 
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_linear_search_graph_analyzer():
+    """
+    Feature: UniPruning graph analyzer.
+    Description: Analyze resnet with linear search and with path enumeration.
+    Expectation: Both analyzers return the same groups.
+    """
+    sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), '../../'))
+    from models.resnet import resnet50
+    mindspore.context.set_context(mode=context.GRAPH_MODE)
+
+    network = resnet50(10)
+    fake_input = mindspore.Tensor(np.ones([16, 3, 224, 224]).astype(np.float32))
+    analyzer = GraphAnalyzer(network, fake_input)
+    expect_analyzer = GraphAnalyzer(network, fake_input, linear_search=False)
+    assert len(analyzer.groups) == len(expect_analyzer.groups)
+    for group, expect_group in zip(analyzer.groups, expect_analyzer.groups):
+        assert set(group.ms_starts.keys()) == set(expect_group.ms_starts.keys())
+        assert set(group.ms_middles.keys()) == set(expect_group.ms_middles.keys())
+        assert set(group.ms_ends.keys()) == set(expect_group.ms_ends.keys())
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("pruning_step, target_sparsity", [(32, 0.75), (16, 0.5)])
+def test_mask_searcher(pruning_step, target_sparsity):
+    """
+    Feature: UniPruning mask search.
+    Description: Compute pruning mask of resnet by MaskSearcher and by get_mask.
+    Expectation: Both masks are the same.
+    """
+    sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), '../../'))
+    from models.resnet import resnet50
+    mindspore.context.set_context(mode=context.GRAPH_MODE)
+
+    network = resnet50(10)
+    config = {
+        "exp_name": 'mask_search_test',
+        "frequency": 1,
+        "target_sparsity": target_sparsity,
+        "pruning_step": pruning_step,
+        "filter_lower_threshold": 32,
+        "input_size": [16, 3, 224, 224],
+        "output_path": './',
+        "prune_flag": 1,
+        "rank": 0,
+        "device_target": 'GPU'
+    }
+    algo = UniPruner(config)
+    algo.apply(network)
+    groups = algo.graph_anaylzer.groups
+    norms = get_channel_importances(groups, 32)
+    expect_mask = get_mask(groups, copy.deepcopy(norms), pruning_step, 32, target_sparsity)
+    mask = MaskSearcher(groups, norms, pruning_step, 32, target_sparsity).search()
+    assert list(mask.keys()) == list(expect_mask.keys())
+    for key, value in expect_mask.items():
+        assert np.array_equal(mask[key], value)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_pruning_executor():
+    """
+    Feature: UniPruning PruningExecutor.
+    Description: Zero and prune resnet by PruningExecutor with a searched mask.
+    Expectation: Masked channels of every layer are zeroed and then erased, other channels are kept.
+    """
+    sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), '../../'))
+    from models.resnet import resnet50
+    mindspore.context.set_context(mode=context.GRAPH_MODE)
+
+    network = resnet50(10)
+    config = {
+        "exp_name": 'executor_test',
+        "frequency": 1,
+        "target_sparsity": 0.75,
+        "pruning_step": 32,
+        "filter_lower_threshold": 32,
+        "input_size": [16, 3, 224, 224],
+        "output_path": './',
+        "prune_flag": 1,
+        "rank": 0,
+        "device_target": 'GPU'
+    }
+    algo = UniPruner(config)
+    algo.apply(network)
+    groups = algo.graph_anaylzer.groups
+    mask = MaskSearcher(groups, get_channel_importances(groups, 32), 32, 32, 0.75).search()
+    expanded_mask = get_expanded_mask(groups, mask)
+    executor = PruningExecutor(groups)
+    origin_params = {}
+    expanded_mask = {key: value for key, value in expanded_mask.items() if value['type'] in ['conv', 'fc', 'bn']}
+    for key in expanded_mask:
+        cell = executor.find_cell(key)
+        assert cell is find_ms_cell(groups, key)
+        origin_params[key] = {name: param.asnumpy() for name, param in cell.parameters_and_names()}
+
+    executor.zero(mask)
+    for key, layer_mask in expanded_mask.items():
+        cell = executor.find_cell(key)
+        for name, param in cell.parameters_and_names():
+            expect = origin_params[key][name].copy()
+            if layer_mask.get('cin') and name.endswith('weight'):
+                expect[:, layer_mask['cin_idx']] = 0
+            if layer_mask['cout']:
+                expect[layer_mask['cout_idx']] = 0
+            assert np.array_equal(param.asnumpy(), expect)
+
+    executor.prune(mask)
+    for key, layer_mask in expanded_mask.items():
+        cell = executor.find_cell(key)
+        for name, param in cell.parameters_and_names():
+            expect = origin_params[key][name]
+            if layer_mask.get('cin') and name.endswith('weight'):
+                expect = np.delete(expect, layer_mask['cin_idx'], axis=1)
+            if layer_mask['cout']:
+                expect = np.delete(expect, layer_mask['cout_idx'], axis=0)
+            assert param.shape == expect.shape
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_async_exporter(tmp_path):
+    """
+    Feature: UniPruning AsyncExporter.
+    Description: Submit saves of a network, change its parameters after each submit, and flush.
+    Expectation: Each checkpoint holds parameters at its submit, masks and deferred model are saved, and parameters
+        of network are restored after flush.
+    """
+    mindspore.context.set_context(mode=context.GRAPH_MODE)
+    network = mindspore.nn.Dense(4, 2)
+    output_path = str(tmp_path)
+    exporter = AsyncExporter(max_pending=1)
+    expect_weights = []
+    for epoch in range(3):
+        expect_weights.append(network.weight.asnumpy().copy())
+        exporter.submit(network, output_path, 'exporter_test', epoch, (1, 4), 'CPU', save_model=epoch == 1,
+                        mask={'dense': np.array([epoch])})
+        network.weight.set_data(mindspore.Tensor(np.full((2, 4), epoch + 1, np.float32)))
+    exporter.flush(network)
+    for epoch, expect_weight in enumerate(expect_weights):
+        ckpt = mindspore.load_checkpoint(os.path.join(output_path, f'exporter_test_epoch{epoch}.ckpt'))
+        assert np.array_equal(ckpt[network.weight.name].asnumpy(), expect_weight)
+        assert os.path.exists(os.path.join(output_path, f'exporter_test_epoch{epoch}_mask.json'))
+    assert os.path.exists(os.path.join(output_path, 'exporter_test_epoch1.mindir'))
+    assert not os.path.exists(os.path.join(output_path, 'exporter_test_epoch0.mindir'))
+    assert np.array_equal(network.weight.asnumpy(), np.full((2, 4), 3, np.float32))
+    stats = exporter.get_stats()
+    assert stats['blocked_time'] > 0 and stats['overlapped_time'] > 0
+
+
 @pytest.mark.platform_x86_gpu_training
 @pytest.mark.env_onecard
 @pytest.mark.parametrize("run_mode", [context.GRAPH_MODE, context.PYNATIVE_MODE])
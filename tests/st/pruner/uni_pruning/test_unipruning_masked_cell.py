@@ -13,11 +13,13 @@
 # limitations under the License.
 # ============================================================================
 """ST-Test for unipruning_masked_layer of Pruning algorithm."""
+import time
 import pytest
 import numpy as np
 import mindspore
 from mindspore import nn, Parameter
-from mindspore_gs.pruner.uni_pruning.unipruning_masked_layer import UniPruningMaskedDense, UniPruningMaskedConv2d
+from mindspore_gs.pruner.uni_pruning.unipruning_masked_layer import UniPruningMaskedDense, UniPruningMaskedConv2d, \
+    zeroing_network, prune_network, _prune_coci_weight
 
 
 @pytest.mark.level0
@@ -348,3 +350,109 @@ def test_unipruningmaskeddense_prune():
     assert mask_dense.handler.bias.shape == (1,)
     assert mask_dense.handler.in_channels == 2
     assert mask_dense.handler.out_channels == 1
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_unipruning_masked_network():
+    """
+    Feature: mindspore_gs.prune.unipruning.unipruning_masked_layer.zeroing_network and prune_network.
+    Description: zero and prune a network with a masked Conv2d and a masked Dense.
+    Expectation: Weights are the same as zeroing and deleting masked channels one by one.
+    """
+    class Net(nn.Cell):
+        def __init__(self):
+            super(Net, self).__init__()
+            self.conv = UniPruningMaskedConv2d(nn.Conv2d(4, 6, (3, 3), has_bias=True))
+            self.dense = UniPruningMaskedDense(nn.Dense(6, 3))
+
+        def construct(self, x):
+            return self.dense(self.conv(x))
+
+    net = Net()
+    in_mask = np.array([1, 0, 1, 1], np.int8)
+    out_mask = np.array([0, 1, 1, 0, 1, 1], np.int8)
+    net.conv.set_in_mask(in_mask)
+    net.conv.set_out_mask(out_mask)
+    net.dense.set_in_mask(out_mask)
+    conv_weight = net.conv.handler.weight.asnumpy()
+    conv_bias = net.conv.handler.bias.asnumpy()
+    dense_weight = net.dense.handler.weight.asnumpy()
+
+    zeroing_network(net)
+    expect_weight = conv_weight.copy()
+    expect_weight[out_mask == 0] = 0
+    expect_weight[:, in_mask == 0] = 0
+    assert (net.conv.handler.weight.asnumpy() == expect_weight).all()
+    assert (net.conv.handler.bias.asnumpy()[out_mask == 0] == 0).all()
+    assert (net.dense.handler.weight.asnumpy()[:, out_mask == 0] == 0).all()
+
+    prune_network(net)
+    assert isinstance(net.conv, nn.Conv2d)
+    assert isinstance(net.dense, nn.Dense)
+    expect_weight = np.delete(np.delete(conv_weight, [1], axis=1), [0, 3], axis=0)
+    assert (net.conv.weight.asnumpy() == expect_weight).all()
+    assert (net.conv.bias.asnumpy() == np.delete(conv_bias, [0, 3])).all()
+    assert (net.dense.weight.asnumpy() == np.delete(dense_weight, [0, 3], axis=1)).all()
+    assert net.conv.out_channels == 4 and net.conv.in_channels == 3
+    assert net.dense.in_channels == 4 and net.dense.out_channels == 3
+
+
+def _prune_coci_weight_by_loop(in_mask, out_mask, weight):
+    """Prune weight by deleting masked channels one by one, which is the implementation before vectorization."""
+    for co in range(weight.shape[0] - 1, -1, -1):
+        if out_mask[co] != 1:
+            weight = np.delete(weight, co, axis=0)
+    for ci in range(weight.shape[1] - 1, -1, -1):
+        if in_mask[ci] != 1:
+            weight = np.delete(weight, ci, axis=1)
+    return weight
+
+
+def _best_time(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+@pytest.mark.level1
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_prune_weight_benchmark():
+    """
+    Feature: vectorized pruning of mindspore_gs.prune.unipruning.unipruning_masked_layer.
+    Description: Prune a [256, 256, 3, 3] weight by gathering kept channels and by deleting masked channels one by
+        one, prune a [2048, 2048, 3, 3] weight by gathering, and prune a masked Conv2d of 2048 channels.
+    Expectation: Results are the same. Timings are only printed for comparison and are not asserted, since they depend
+        on the machine.
+    """
+    np.random.seed(1)
+    weight = np.random.normal(size=(256, 256, 3, 3)).astype(np.float32)
+    in_mask = (np.random.uniform(size=256) > 0.5).astype(np.int8)
+    out_mask = (np.random.uniform(size=256) > 0.5).astype(np.int8)
+    assert (_prune_coci_weight(in_mask, out_mask, weight) ==
+            _prune_coci_weight_by_loop(in_mask, out_mask, weight)).all()
+    loop_time = _best_time(lambda: _prune_coci_weight_by_loop(in_mask, out_mask, weight))
+    gather_time = _best_time(lambda: _prune_coci_weight(in_mask, out_mask, weight))
+    print(f"prune 256 channels, loop: {loop_time * 1000:.2f}ms, gather: {gather_time * 1000:.2f}ms")
+
+    weight = np.random.normal(size=(2048, 2048, 3, 3)).astype(np.float32)
+    in_mask = (np.random.uniform(size=2048) > 0.5).astype(np.int8)
+    out_mask = (np.random.uniform(size=2048) > 0.5).astype(np.int8)
+    gather_time = _best_time(lambda: _prune_coci_weight(in_mask, out_mask, weight))
+    print(f"prune 2048 channels, gather: {gather_time * 1000:.2f}ms")
+
+    conv = UniPruningMaskedConv2d(nn.Conv2d(2048, 2048, (3, 3)))
+    conv.handler.weight.set_data(mindspore.Tensor(weight))
+    conv.set_in_mask(in_mask)
+    conv.set_out_mask(out_mask)
+    start = time.perf_counter()
+    pruned = conv.prune()
+    cell_time = time.perf_counter() - start
+    print(f"prune masked Conv2d of 2048 channels: {cell_time * 1000:.2f}ms")
+    assert pruned.weight.shape == (out_mask.sum(), in_mask.sum(), 3, 3)
+    assert (pruned.weight.asnumpy() == _prune_coci_weight(in_mask, out_mask, weight)).all()
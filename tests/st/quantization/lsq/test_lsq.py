@@ -51,6 +51,12 @@ def test_construct():
     LearnedQAT(config)
     # add assert for compare
 
+    # learned range is updated by optimizer, observer freezing is not supported.
+    for config in [{"freeze_observer": 100}, {"freeze_observer_epoch": 2}, {"freeze_observer_tolerance": 0.01}]:
+        with pytest.raises(ValueError):
+            LearnedQAT(config)
+    assert not LearnedQAT().callbacks()
+
 
 @pytest.mark.level0
 @pytest.mark.platform_x86_cpu
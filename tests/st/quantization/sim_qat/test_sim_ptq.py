@@ -0,0 +1,142 @@
+# Copyright 2023 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""test simulated post training quantization."""
+
+import os
+import sys
+from collections import OrderedDict
+import pytest
+import numpy as np
+import mindspore
+from mindspore import context
+import mindspore.dataset as ds
+from mindspore_gs.quantization.simulated_quantization import SimulatedPostTrainingQuantization as SimPTQ
+from mindspore_gs.quantization.simulated_quantization.simulated_fake_quantizers import SimulatedFakeQuantizerPerLayer
+from mindspore_gs.quantization.quantize_wrapper_cell import QuantizeWrapperCell
+from mindspore_gs.ops.nn import HistogramObserver
+
+
+def _create_dataset(shape, num_batches=4):
+    np.random.seed(1)
+    data = np.random.normal(size=(num_batches * shape[0],) + shape[1:]).astype(np.float32)
+    label = np.zeros(num_batches * shape[0]).astype(np.int32)
+    return ds.NumpySlicesDataset({"data": data, "label": label}, shuffle=False).batch(shape[0]), data
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_constructor():
+    """
+    Feature: SimPTQ algorithm.
+    Description: Call constructor of SimulatedPostTrainingQuantization with valid and invalid config.
+    Expectation: Config is updated according to argument `config` of constructor, and invalid config raises error.
+    """
+
+    ptq = SimPTQ({"calibration_method": "kl", "calibration_num_batches": 10, "per_channel": [False, True]})
+    assert ptq._config.calibration_method == "kl"
+    assert ptq._config.calibration_num_batches == 10
+    assert ptq._config.weight_per_channel
+    ptq = SimPTQ()
+    assert ptq._config.calibration_method == "min_max"
+    assert ptq._config.calibration_num_batches == 100
+
+    with pytest.raises(TypeError):
+        SimPTQ({"calibration_method": 1})
+    with pytest.raises(ValueError):
+        SimPTQ({"calibration_method": "mse"})
+    with pytest.raises(TypeError):
+        SimPTQ({"calibration_num_batches": True})
+    with pytest.raises(ValueError):
+        SimPTQ({"calibration_num_batches": 0})
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("calibration_method", ["min_max", "kl"])
+def test_lenet_calibrate(calibration_method):
+    """
+    Feature: SimPTQ calibrate function.
+    Description: Calibrate LeNet with a dataset and convert it, export to MindIR.
+    Expectation: Quantization range of input quantizer is the same as the statistics of calibration data, and
+        calibrated network is converted and exported successfully.
+    """
+
+    from ....models.research.cv.lenet.src.lenet import LeNet5
+    context.set_context(mode=context.GRAPH_MODE, device_target="CPU")
+    network = LeNet5(10)
+    ptq = SimPTQ({"per_channel": [False, True], "symmetric": [False, True], "calibration_num_batches": 3,
+                  "calibration_method": calibration_method})
+    new_network = ptq.apply(network)
+    dataset, data = _create_dataset((8, 1, 32, 32))
+    new_network = ptq.calibrate(new_network, dataset)
+    assert context.get_context("mode") == context.GRAPH_MODE
+
+    cells: OrderedDict = new_network.name_cells()
+    conv_quant: QuantizeWrapperCell = cells.get("Conv2dQuant")
+    assert isinstance(conv_quant, QuantizeWrapperCell)
+    input_quantizer = conv_quant._input_quantizer
+    assert isinstance(input_quantizer, SimulatedFakeQuantizerPerLayer)
+    calibration_data = data[:24]
+    float_min, float_max = calibration_data.min(), calibration_data.max()
+    if calibration_method == "kl":
+        observer = HistogramObserver()
+        observer.update(calibration_data)
+        threshold = observer.get_kl_threshold()
+        float_min, float_max = max(float_min, -threshold), min(float_max, threshold)
+    assert np.allclose(input_quantizer._float_min.asnumpy(), [float_min])
+    assert np.allclose(input_quantizer._float_max.asnumpy(), [float_max])
+    weight = conv_quant._handler.weight.asnumpy().reshape(6, -1)
+    weight_quantizer = conv_quant._handler.fake_quant_weight
+    assert np.allclose(weight_quantizer._float_max.asnumpy(), np.maximum(weight.max(axis=1), 0))
+    assert input_quantizer._calibrator is None
+
+    new_network = ptq.convert(new_network)
+    data_in = mindspore.Tensor(np.ones([1, 1, 32, 32]), mindspore.float32)
+    file_name = "./lenet_ptq.mindir"
+    mindspore.export(new_network, data_in, file_name=file_name, file_format="MINDIR")
+    graph = mindspore.load(file_name)
+    mindspore.nn.GraphCell(graph)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_resnet_calibrate():
+    """
+    Feature: SimPTQ calibrate function.
+    Description: Calibrate ResNet18 with an iterable of numpy batches and convert it.
+    Expectation: All fake quantizers are calibrated and calibrated network is converted successfully.
+    """
+
+    sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), '../../'))
+    from tests.st.models.resnet import resnet18
+    context.set_context(mode=context.GRAPH_MODE, device_target="CPU")
+    network = resnet18(10)
+    ptq = SimPTQ({"calibration_num_batches": 2})
+    new_network = ptq.apply(network)
+    _, data = _create_dataset((2, 3, 224, 224), 3)
+    new_network = ptq.calibrate(new_network, [(data[i:i + 2],) for i in range(0, 6, 2)])
+    for _, cell in new_network.cells_and_names():
+        if isinstance(cell, SimulatedFakeQuantizerPerLayer):
+            float_min = cell._float_min.asnumpy()
+            float_max = cell._float_max.asnumpy()
+            assert (float_min <= 0).all() and (float_max >= 0).all()
+            assert not np.allclose(float_max, 6)
+    ptq.convert(new_network)
+
+    with pytest.raises(RuntimeError, match="is empty"):
+        ptq.calibrate(ptq.apply(resnet18(10)), [])
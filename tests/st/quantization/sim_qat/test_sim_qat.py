@@ -15,15 +15,31 @@
 """test interfaces of sim_qat."""
 import os
 import sys
+import importlib.util
+import time
+import types
 from collections import OrderedDict
 import pytest
-from mindspore import nn
+import numpy as np
+from mindspore import nn, context, Tensor, save_checkpoint, load_checkpoint, load_param_into_net, export
+from mindspore.common import dtype as mstype
 from mindspore.common.dtype import QuantDtype
+from mindspore.rewrite import NodeType
 from mindspore_gs.quantization.simulated_quantization import SimulatedQuantizationAwareTraining as SimQAT
+from mindspore_gs.quantization.simulated_quantization.simulated_quantization_aware_training import \
+    ObserverFreezeCallback, QuantDelaySwitchCallback
 from mindspore_gs.quantization.simulated_quantization.simulated_fake_quantizers import SimulatedFakeQuantizerPerLayer, \
     SimulatedFakeQuantizerPerChannel
 from mindspore_gs.quantization.quantize_wrapper_cell import QuantizeWrapperCell
+from mindspore_gs.quantization.rewrite_cache import RewriteCache
+from mindspore_gs.net_transform import NetTransformer
+from mindspore_gs.ops.nn import Conv2dQuant, DenseQuant
+from mindspore_gs.ops.nn.eval_weight_cache import EvalWeightCache
+from mindspore_gs.ops.operations import MinMaxUpdateFakeQuantPerLayer, MinMaxUpdateFakeQuantPerChannel
 from mindspore_gs.quantization.simulated_quantization.simulated_quantization_config import SimulatedQuantizationConfig
+from mindspore_gs.quantization.simulated_quantization.simulated_quantization_layer_policy import ConvLayerPolicy
+from mindspore_gs.quantization.simulated_quantization.simulated_quantization_convert import CellBlockWithFakeWeight, \
+    CellBlockWithQuantWeight
 
 sys.path.append(os.path.join(os.path.abspath(os.path.dirname(__file__)), '../../'))
 # pylint: disable=wrong-import-position
@@ -55,7 +71,9 @@ def test_constructor():
     assert qat_config_compare(quant_config, config)
 
     config = {"quant_delay": 100, "quant_dtype": QuantDtype.INT8, "per_channel": False, "symmetric": True,
-              "narrow_range": True, "enable_fusion": True, "freeze_bn": 100, "bn_fold": True, "one_conv_fold": False}
+              "narrow_range": True, "enable_fusion": True, "freeze_bn": 100, "bn_fold": True, "one_conv_fold": False,
+              "single_conv_bn_fold": True, "cache_eval_weight": True, "freeze_observer": 1000,
+              "freeze_observer_tolerance": 0.01, "freeze_observer_epoch": 3, "bypass_quant_delay": True}
     qat = SimQAT(config)
     quant_config: SimulatedQuantizationConfig = qat._config
     assert qat_config_compare(quant_config, config)
@@ -116,6 +134,38 @@ def test_constructor_error():
                                         "but got int."):
         SimQAT(config)
 
+    config = {"single_conv_bn_fold": 1}
+    with pytest.raises(TypeError, match="For 'SimulatedQuantizationAwareTraining', the 'single_conv_bn_fold' must be a "
+                                        "bool, but got int."):
+        SimQAT(config)
+
+    config = {"cache_eval_weight": 1}
+    with pytest.raises(TypeError, match="For 'SimulatedQuantizationAwareTraining', the 'cache_eval_weight' must be a "
+                                        "bool, but got int."):
+        SimQAT(config)
+
+    config = {"bypass_quant_delay": 1}
+    with pytest.raises(TypeError, match="For 'SimulatedQuantizationAwareTraining', the 'bypass_quant_delay' must be a "
+                                        "bool, but got int."):
+        SimQAT(config)
+
+    config = {"freeze_observer": 1.0}
+    with pytest.raises(TypeError, match="For 'SimulatedQuantizationAwareTraining', the 'freeze_observer' must be a "
+                                        "int, but got float."):
+        SimQAT(config)
+
+    config = {"freeze_observer": -2}
+    with pytest.raises(ValueError):
+        SimQAT(config)
+
+    config = {"freeze_observer_epoch": -2}
+    with pytest.raises(ValueError):
+        SimQAT(config)
+
+    config = {"freeze_observer_tolerance": 2.0}
+    with pytest.raises(ValueError):
+        SimQAT(config)
+
     config = {"quant_dtype": [1, 1]}
     with pytest.raises(TypeError, match="The parameter `act quant dtype` must be isinstance of QuantDtype, but got 1."):
         SimQAT(config)
@@ -262,6 +312,295 @@ def test_apply():
     assert act_fake_quant._quant_delay == 900
 
 
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("mode", [context.GRAPH_MODE, context.PYNATIVE_MODE])
+@pytest.mark.parametrize("per_channel", [False, True])
+def test_fake_quantizer_cpu(mode, per_channel):
+    """
+    Feature: simulated fake quantizers on CPU.
+    Description: Run fake quantizer in train mode, then in eval mode with the same data.
+    Expectation: GSCustom ops are used, eval output is the same as train output, and data is quantized with the
+        updated range.
+    """
+    context.set_context(mode=mode, device_target="CPU")
+    if per_channel:
+        quantizer = SimulatedFakeQuantizerPerChannel(num_channels=4, channel_axis=0, symmetric=True)
+    else:
+        quantizer = SimulatedFakeQuantizerPerLayer()
+    assert quantizer._use_gs_ops
+    np.random.seed(1)
+    data = np.random.normal(size=(4, 3, 5, 5)).astype(np.float32)
+    quantizer.set_train(True)
+    train_output = quantizer(Tensor(data)).asnumpy()
+    quantizer.set_train(False)
+    eval_output = quantizer(Tensor(data)).asnumpy()
+    assert np.allclose(train_output, eval_output)
+    float_range = quantizer._float_max.asnumpy() - quantizer._float_min.asnumpy()
+    scale = (float_range / 255).reshape(-1, 1, 1, 1) if per_channel else float_range / 255
+    assert not np.allclose(eval_output, data)
+    assert (np.abs(eval_output - data) <= scale + 1e-5).all()
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_fake_quantizer_fused_op():
+    """
+    Feature: fused range update and fake quant of simulated fake quantizers on CPU.
+    Description: Create per layer fake quantizer and per channel fake quantizers with different channel axes.
+    Expectation: Each fake quantizer only holds the fused op of its own granularity, and no fused op is held when
+        fusion is not supported.
+    """
+    context.set_context(device_target="CPU")
+    assert isinstance(SimulatedFakeQuantizerPerLayer()._fused_train, MinMaxUpdateFakeQuantPerLayer)
+    quantizer = SimulatedFakeQuantizerPerChannel(num_channels=4, channel_axis=0)
+    assert quantizer._use_fused
+    assert isinstance(quantizer._fused_train, MinMaxUpdateFakeQuantPerChannel)
+    quantizer = SimulatedFakeQuantizerPerChannel(num_channels=4, channel_axis=1)
+    assert not quantizer._use_fused
+    assert quantizer._fused_train is None
+
+
+def _get_act_quantizers(network):
+    return [cell for _, cell in network.cells_and_names() if isinstance(cell, SimulatedFakeQuantizerPerLayer) and
+            not isinstance(cell, SimulatedFakeQuantizerPerChannel)]
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("mode", [context.GRAPH_MODE, context.PYNATIVE_MODE])
+def test_freeze_observer(mode):
+    """
+    Feature: observer freezing of SimQAT.
+    Description: Freeze fake quantizers by ObserverFreezeCallback at `freeze_observer` step, and run network with data
+        of larger range.
+    Expectation: Callback is added and frozen path of fake quantizers is built only if observer freezing is enabled,
+        and range of frozen fake quantizers is not changed by training.
+    """
+    context.set_context(mode=mode, device_target="CPU")
+    assert not [cb for cb in SimQAT().callbacks() if isinstance(cb, ObserverFreezeCallback)]
+    for quantizer in _get_act_quantizers(SimQAT().apply(NetToQuant())):
+        assert not quantizer.is_observer_freezable()
+        with pytest.raises(RuntimeError):
+            quantizer.freeze_observer()
+    qat = SimQAT({"freeze_observer": 2})
+    callbacks = [cb for cb in qat.callbacks() if isinstance(cb, ObserverFreezeCallback)]
+    assert len(callbacks) == 1
+    new_network = qat.apply(NetToQuant())
+    new_network.set_train(True)
+    quantizers = _get_act_quantizers(new_network)
+    assert quantizers
+    assert all(quantizer.is_observer_freezable() for quantizer in quantizers)
+
+    cb_params = types.SimpleNamespace(train_network=new_network, cur_step_num=0)
+    run_context = types.SimpleNamespace(original_args=lambda: cb_params)
+    np.random.seed(1)
+    data = np.random.normal(size=(2, 5, 8, 8)).astype(np.float32)
+    for step in range(1, 3):
+        new_network(Tensor(data))
+        cb_params.cur_step_num = step
+        callbacks[0].step_end(run_context)
+        assert all(quantizer.is_observer_frozen() == (step >= 2) for quantizer in quantizers)
+    ranges = [quantizer.get_range() for quantizer in quantizers]
+    new_network(Tensor(data * 10))
+    for quantizer, (float_min, float_max) in zip(quantizers, ranges):
+        assert np.allclose(quantizer._float_min.asnumpy(), float_min)
+        assert np.allclose(quantizer._float_max.asnumpy(), float_max)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_freeze_observer_epoch():
+    """
+    Feature: observer freezing of SimQAT.
+    Description: Freeze fake quantizers by ObserverFreezeCallback at `freeze_observer_epoch` epoch.
+    Expectation: All fake quantizers are frozen at the end of `freeze_observer_epoch` epoch, not at step ends.
+    """
+    context.set_context(mode=context.PYNATIVE_MODE, device_target="CPU")
+    qat = SimQAT({"freeze_observer_epoch": 2})
+    cb = [cb for cb in qat.callbacks() if isinstance(cb, ObserverFreezeCallback)][0]
+    new_network = qat.apply(NetToQuant())
+    new_network.set_train(True)
+    quantizers = _get_act_quantizers(new_network)
+
+    cb_params = types.SimpleNamespace(train_network=new_network, cur_step_num=100, cur_epoch_num=1)
+    run_context = types.SimpleNamespace(original_args=lambda: cb_params)
+    cb.step_end(run_context)
+    cb.epoch_end(run_context)
+    assert not any(quantizer.is_observer_frozen() for quantizer in quantizers)
+    cb_params.cur_epoch_num = 2
+    cb.epoch_end(run_context)
+    assert all(quantizer.is_observer_frozen() for quantizer in quantizers)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_freeze_observer_tolerance():
+    """
+    Feature: observer freezing of SimQAT.
+    Description: Check convergence of range of fake quantizers by ObserverFreezeCallback at the end of each epoch.
+    Expectation: Fake quantizers are frozen only after their range changes less than tolerance in one epoch.
+    """
+    context.set_context(mode=context.PYNATIVE_MODE, device_target="CPU")
+    qat = SimQAT({"freeze_observer_tolerance": 0.01})
+    cb = [cb for cb in qat.callbacks() if isinstance(cb, ObserverFreezeCallback)][0]
+    new_network = qat.apply(NetToQuant())
+    new_network.set_train(True)
+    quantizers = _get_act_quantizers(new_network)
+
+    cb_params = types.SimpleNamespace(train_network=new_network, cur_step_num=0, cur_epoch_num=1)
+    run_context = types.SimpleNamespace(original_args=lambda: cb_params)
+    np.random.seed(1)
+    data = np.random.normal(size=(2, 5, 8, 8)).astype(np.float32)
+    cb.begin(run_context)
+    new_network(Tensor(data))
+    cb.epoch_end(run_context)
+    assert not any(quantizer.is_observer_frozen() for quantizer in quantizers)
+    new_network(Tensor(data))
+    cb.epoch_end(run_context)
+    assert all(quantizer.is_observer_frozen() for quantizer in quantizers)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("mode", [context.GRAPH_MODE, context.PYNATIVE_MODE])
+def test_bypass_quant_delay(mode):
+    """
+    Feature: bypass of fake quantizers before quant delay.
+    Description: Train network with `bypass_quant_delay`, and switch fake quantizers by QuantDelaySwitchCallback.
+    Expectation: Network outputs the same as float network and range is not tracked before quant delay, fake
+        quantizers are switched at their own quant delay without rebuilding network.
+    """
+    context.set_context(mode=mode, device_target="CPU")
+    qat = SimQAT({"quant_delay": [3, 2]})
+    assert not [cb for cb in qat.callbacks() if isinstance(cb, QuantDelaySwitchCallback)]
+    qat.set_bypass_quant_delay(True)
+    callbacks = [cb for cb in qat.callbacks() if isinstance(cb, QuantDelaySwitchCallback)]
+    assert len(callbacks) == 1
+    new_network = qat.apply(NetToQuant())
+    new_network.set_train(True)
+    conv_quant: QuantizeWrapperCell = new_network.name_cells().get("Conv2dQuant")
+    act_quantizer = conv_quant._output_quantizer
+    weight_quantizer = conv_quant._handler.fake_quant_weight
+    assert act_quantizer._kernel_quant_delay == 0
+    assert not act_quantizer.is_quant_enabled() and not weight_quantizer.is_quant_enabled()
+
+    cb_params = types.SimpleNamespace(train_network=new_network, cur_step_num=0)
+    run_context = types.SimpleNamespace(original_args=lambda: cb_params)
+    np.random.seed(1)
+    data = Tensor(np.random.normal(size=(2, 5, 8, 8)).astype(np.float32))
+    float_conv = nn.Conv2d(5, 6, 5, pad_mode='valid')
+    float_conv.weight.set_data(Tensor(conv_quant._handler.weight.asnumpy()))
+    assert np.allclose(new_network(data).asnumpy(), float_conv(data).asnumpy(), atol=1e-5)
+    assert np.allclose(act_quantizer._float_max.asnumpy(), [6])
+    for step in range(1, 4):
+        cb_params.cur_step_num = step
+        callbacks[0].step_end(run_context)
+        assert weight_quantizer.is_quant_enabled() == (step >= 2)
+        assert act_quantizer.is_quant_enabled() == (step >= 3)
+    new_network(data)
+    assert not np.allclose(act_quantizer._float_max.asnumpy(), [6])
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_freeze_observer_with_bypass():
+    """
+    Feature: observer freezing of SimQAT together with bypass of fake quantizers before quant delay.
+    Description: Freeze fake quantizers at or before quant delay, and check tolerance of fake quantizers which are
+        still bypassed.
+    Expectation: Freezing at or before quant delay is rejected, and bypassed fake quantizers are not frozen by
+        tolerance, whose range is compared only from the first epoch end after they are switched on.
+    """
+    context.set_context(mode=context.PYNATIVE_MODE, device_target="CPU")
+    config = {"quant_delay": [3, 2], "bypass_quant_delay": True}
+    with pytest.raises(ValueError):
+        SimQAT(dict(config, freeze_observer=3)).callbacks()
+    assert [cb for cb in SimQAT(dict(config, freeze_observer=4)).callbacks() if isinstance(cb, ObserverFreezeCallback)]
+    qat = SimQAT(dict(config, freeze_observer_epoch=1))
+    cb = [cb for cb in qat.callbacks() if isinstance(cb, ObserverFreezeCallback)][0]
+    network = qat.apply(NetToQuant())
+    with pytest.raises(ValueError):
+        cb.begin(types.SimpleNamespace(original_args=lambda: types.SimpleNamespace(train_network=network,
+                                                                                     batch_num=3)))
+
+    qat = SimQAT(dict(config, freeze_observer_tolerance=0.01))
+    callbacks = qat.callbacks()
+    switch_cb = [cb for cb in callbacks if isinstance(cb, QuantDelaySwitchCallback)][0]
+    freeze_cb = [cb for cb in callbacks if isinstance(cb, ObserverFreezeCallback)][0]
+    new_network = qat.apply(NetToQuant())
+    new_network.set_train(True)
+    quantizers = _get_act_quantizers(new_network)
+    cb_params = types.SimpleNamespace(train_network=new_network, cur_step_num=0, cur_epoch_num=1, batch_num=1)
+    run_context = types.SimpleNamespace(original_args=lambda: cb_params)
+    np.random.seed(1)
+    data = Tensor(np.random.normal(size=(2, 5, 8, 8)).astype(np.float32))
+    freeze_cb.begin(run_context)
+    for step in range(1, 4):
+        new_network(data)
+        cb_params.cur_step_num = step
+        switch_cb.step_end(run_context)
+        freeze_cb.epoch_end(run_context)
+        assert not any(quantizer.is_observer_frozen() for quantizer in quantizers)
+    assert all(quantizer.is_quant_enabled() for quantizer in quantizers)
+    new_network(data)
+    freeze_cb.epoch_end(run_context)
+    assert not any(quantizer.is_observer_frozen() for quantizer in quantizers)
+    new_network(data)
+    freeze_cb.epoch_end(run_context)
+    assert all(quantizer.is_observer_frozen() for quantizer in quantizers)
+
+
+def _train_step_time(network, data, label, steps):
+    """Average time of one training step of `network`, time of graph compiling is excluded."""
+    loss = nn.SoftmaxCrossEntropyWithLogits(sparse=True, reduction="mean")
+    opt = nn.Momentum(network.trainable_params(), learning_rate=0.01, momentum=0.9)
+    train_network = nn.TrainOneStepCell(nn.WithLossCell(network, loss), opt)
+    train_network.set_train(True)
+    for _ in range(3):
+        train_network(data, label).asnumpy()
+    start = time.perf_counter()
+    for _ in range(steps):
+        train_network(data, label).asnumpy()
+    return (time.perf_counter() - start) / steps
+
+
+@pytest.mark.level1
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_bypass_quant_delay_throughput():
+    """
+    Feature: bypass of fake quantizers before quant delay.
+    Description: Train float LeNet, and LeNet applied SimQAT with and without `bypass_quant_delay` before quant delay
+        in GRAPH_MODE.
+    Expectation: Bypassed network is trained faster than network which launches observer and fake quant kernels before
+        quant delay, and its step time is within 20% of float network, so that one graph switched by a Parameter flag
+        is enough and float graph is not needed to be compiled separately before quant delay.
+    """
+    context.set_context(mode=context.GRAPH_MODE, device_target="CPU")
+    np.random.seed(1)
+    data = Tensor(np.random.normal(size=(32, 1, 32, 32)).astype(np.float32))
+    label = Tensor(np.random.randint(0, 10, size=(32,)).astype(np.int32))
+    steps = 50
+    float_time = _train_step_time(_create_network("lenet")[0], data, label, steps)
+    qat_config = {"quant_delay": 100000}
+    qat_time = _train_step_time(SimQAT(qat_config).apply(_create_network("lenet")[0]), data, label, steps)
+    qat_config["bypass_quant_delay"] = True
+    bypass_time = _train_step_time(SimQAT(qat_config).apply(_create_network("lenet")[0]), data, label, steps)
+    print(f"step time, float: {float_time * 1000:.3f}ms, qat: {qat_time * 1000:.3f}ms, bypass: "
+          f"{bypass_time * 1000:.3f}ms")
+    assert bypass_time < qat_time
+    # only the branch on `quant_enabled` of each fake quantizer is left in bypassed network.
+    assert bypass_time < 1.2 * float_time
+
+
 @pytest.mark.level0
 @pytest.mark.platform_x86_cpu
 @pytest.mark.env_onecard
@@ -304,3 +643,366 @@ def test_convert_error():
 
     with pytest.raises(ValueError, match="The parameter `ckpt_path` can only be empty or a valid file"):
         qat.convert(new_network, "file_path")
+
+
+def _create_network(network_name):
+    if network_name == "lenet":
+        from ....models.research.cv.lenet.src.lenet import LeNet5
+        return LeNet5(10), np.random.normal(size=(2, 1, 32, 32)).astype(np.float32)
+    from tests.st.models.resnet import resnet18
+    return resnet18(10), np.random.normal(size=(2, 3, 224, 224)).astype(np.float32)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_eval_weight_cache_multi_layers(tmp_path):
+    """
+    Feature: eval weight cache of SimQAT.
+    Description: Apply SimQAT with `cache_eval_weight` on LeNet which has several quant layers, run it in eval mode in
+        GRAPH_MODE, and save it into checkpoint.
+    Expectation: Cached weights have unique names, network compiles and outputs the same as network without cache,
+        and cached weights are not saved into checkpoint.
+    """
+    context.set_context(mode=context.GRAPH_MODE, device_target="CPU")
+    np.random.seed(1)
+    network, data = _create_network("lenet")
+    new_network = SimQAT({"cache_eval_weight": True}).apply(network)
+    caches = [cell.eval_weight for _, cell in new_network.cells_and_names() if isinstance(cell, EvalWeightCache)]
+    assert len(caches) >= 2
+    new_network.check_names()
+    new_network.set_train(False)
+    names = [cache.name for cache in caches]
+    assert len(set(names)) == len(names)
+    assert all(name.endswith("_eval_cache") for name in names)
+
+    ref_network = SimQAT().apply(_create_network("lenet")[0])
+    load_param_into_net(ref_network, new_network.parameters_dict())
+    ref_network.set_train(False)
+    assert np.allclose(new_network(Tensor(data)).asnumpy(), ref_network(Tensor(data)).asnumpy(), atol=1e-5)
+
+    ckpt_file = os.path.join(str(tmp_path), "lenet_cache.ckpt")
+    save_checkpoint(new_network, ckpt_file)
+    param_dict = load_checkpoint(ckpt_file)
+    assert not [name for name in param_dict if name.endswith("_eval_cache")]
+    assert set(param_dict.keys()) == set(ref_network.parameters_dict().keys())
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_eval_weight_cache_load_checkpoint(tmp_path):
+    """
+    Feature: eval weight cache of SimQAT.
+    Description: Apply SimQAT with `cache_eval_weight` on LeNet, run it in eval mode in GRAPH_MODE, then load a
+        checkpoint of different weights into it by `load_param_into_net` while it stays in eval mode.
+    Expectation: Output changes after loading, and is the same as network without cache loaded from the checkpoint.
+    """
+    context.set_context(mode=context.GRAPH_MODE, device_target="CPU")
+    np.random.seed(1)
+    network, data = _create_network("lenet")
+    new_network = SimQAT({"cache_eval_weight": True}).apply(network)
+    new_network.set_train(False)
+    old_output = new_network(Tensor(data)).asnumpy()
+
+    ref_network = SimQAT().apply(_create_network("lenet")[0])
+    for param in ref_network.trainable_params():
+        param.set_data(Tensor(np.random.normal(scale=0.1, size=param.shape).astype(np.float32)))
+    ckpt_file = os.path.join(str(tmp_path), "lenet_new_weight.ckpt")
+    save_checkpoint(ref_network, ckpt_file)
+    not_load_param = load_param_into_net(new_network, load_checkpoint(ckpt_file))
+    assert not not_load_param
+    new_output = new_network(Tensor(data)).asnumpy()
+    assert not np.allclose(new_output, old_output)
+    ref_network.set_train(False)
+    assert np.allclose(new_output, ref_network(Tensor(data)).asnumpy(), atol=1e-5)
+
+
+def _calibrate_weight_quantizers(network):
+    """Set range of weight fake quantizers to the range of weights, as if network is trained."""
+    for _, cell in network.cells_and_names():
+        fake_quant_weight = getattr(cell, "fake_quant_weight", None)
+        if isinstance(fake_quant_weight, SimulatedFakeQuantizerPerChannel):
+            weight = cell.weight.asnumpy().reshape(cell.weight.shape[0], -1)
+            fake_quant_weight.set_min_max(np.minimum(weight.min(axis=1), 0), np.maximum(weight.max(axis=1), 0))
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("network_name", ["lenet", "resnet"])
+def test_convert_pack_int8_weight(network_name, tmp_path):
+    """
+    Feature: simulated quantization convert function with pack_int8_weight.
+    Description: Convert a compressed network with weights packed into int8 and with fp32 weights, save them into
+        checkpoint and export them to MindIR.
+    Expectation: Weights are stored as int8, parameters take a quarter of memory, checkpoint and MindIR files shrink,
+        and outputs are close to outputs of network with fp32 weights.
+    """
+    context.set_context(mode=context.GRAPH_MODE, device_target="CPU")
+    np.random.seed(1)
+    network, data = _create_network(network_name)
+    qat = SimQAT({"per_channel": [False, True], "symmetric": [False, True]})
+    fake_network = qat.apply(network)
+    _calibrate_weight_quantizers(fake_network)
+    ckpt_path = os.path.join(str(tmp_path), f"{network_name}_pack_int8_weight.ckpt")
+    save_checkpoint(fake_network, ckpt_path)
+    fake_network = qat.convert(fake_network)
+
+    network, _ = _create_network(network_name)
+    qat = SimQAT({"per_channel": [False, True], "symmetric": [False, True], "pack_int8_weight": True})
+    assert qat._config.pack_int8_weight
+    packed_network = qat.convert(qat.apply(network), ckpt_path)
+
+    blocks = [cell for _, cell in packed_network.cells_and_names() if isinstance(cell, CellBlockWithQuantWeight)]
+    assert blocks
+    for block in blocks:
+        assert block.weight.dtype == mstype.int8
+    fake_blocks = [cell for _, cell in fake_network.cells_and_names() if isinstance(cell, CellBlockWithFakeWeight)]
+    fake_nbytes = sum(block.weight.asnumpy().nbytes for block in fake_blocks)
+    packed_nbytes = sum(param.asnumpy().nbytes for block in blocks for param in block.get_parameters())
+    assert packed_nbytes < fake_nbytes / 3.5
+
+    fake_output = fake_network(Tensor(data)).asnumpy()
+    packed_output = packed_network(Tensor(data)).asnumpy()
+    assert np.linalg.norm(packed_output - fake_output) < 0.05 * np.linalg.norm(fake_output)
+
+    file_sizes = {}
+    for name, net in [("fake", fake_network), ("packed", packed_network)]:
+        file_name = os.path.join(str(tmp_path), f"{network_name}_{name}")
+        save_checkpoint(net, file_name + ".ckpt")
+        export(net, Tensor(data), file_name=file_name, file_format="MINDIR")
+        file_sizes[name] = (os.path.getsize(file_name + ".ckpt"), os.path.getsize(file_name + ".mindir"))
+    # weights of conv and dense dominate the size of files, so packed files take less than half of the size.
+    assert file_sizes["packed"][0] < 0.5 * file_sizes["fake"][0]
+    assert file_sizes["packed"][1] < 0.5 * file_sizes["fake"][1]
+
+
+def _wrapped_handler_types(network):
+    return sorted(type(cell.get_handler()).__name__ for _, cell in network.cells_and_names()
+                  if isinstance(cell, QuantizeWrapperCell))
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("network_name", ["lenet", "resnet"])
+@pytest.mark.parametrize("enable_fusion", [False, True])
+def test_apply_with_rewrite_cache(network_name, enable_fusion, tmp_path):
+    """
+    Feature: SimQAT apply with RewriteCache.
+    Description: Apply SimQAT on two networks of the same architecture with a persistent RewriteCache.
+    Expectation: The second apply replays cached plan on a copy of network and leaves input network unchanged, wraps
+        the same cells as rewrite, parameters have the same names, and the output is the same as the output of
+        rewritten network with or without fusion.
+    """
+    context.set_context(mode=context.GRAPH_MODE, device_target="CPU")
+    np.random.seed(1)
+    config = {"per_channel": [False, True], "symmetric": [False, True], "enable_fusion": enable_fusion}
+    network, data = _create_network(network_name)
+    same_network, _ = _create_network(network_name)
+    load_param_into_net(same_network, {param.name: param.clone() for param in network.get_parameters()})
+    qat = SimQAT(config)
+    qat.set_rewrite_cache(RewriteCache(str(tmp_path)))
+    rewritten_network = qat.apply(network)
+    assert qat._rewrite_cache.get_stats() == {"hits": 0, "misses": 1, "invalidations": 0}
+
+    qat = SimQAT(config)
+    qat.set_rewrite_cache(RewriteCache(str(tmp_path)))
+    replayed_network = qat.apply(same_network)
+    assert replayed_network is not same_network
+    assert qat._rewrite_cache.get_stats() == {"hits": 1, "misses": 0, "invalidations": 0}
+    assert not _wrapped_handler_types(same_network)
+    assert _wrapped_handler_types(replayed_network) == _wrapped_handler_types(rewritten_network)
+    # parameters created by fusion are randomly initialized, so they are synchronized before comparing outputs.
+    not_load_param = load_param_into_net(replayed_network, rewritten_network.parameters_dict())
+    assert not not_load_param
+    rewritten_network.set_train(False)
+    replayed_network.set_train(False)
+    assert np.allclose(replayed_network(Tensor(data)).asnumpy(), rewritten_network(Tensor(data)).asnumpy())
+
+    with pytest.raises(TypeError):
+        qat.set_rewrite_cache("./rewrite_cache")
+
+
+def _conv_bn_relu_lines(with_bn):
+    """Source of ConvBnReLUNet, BatchNorm2d is used in construct only if `with_bn` is True."""
+    lines = ["from mindspore import nn", "", "", "class ConvBnReLUNet(nn.Cell):", "    def __init__(self):",
+             "        super().__init__()", "        self.conv = nn.Conv2d(1, 4, 3)",
+             "        self.bn = nn.BatchNorm2d(4)", "        self.relu = nn.ReLU()", "", "    def construct(self, x):",
+             "        x = self.conv(x)"]
+    if with_bn:
+        lines.append("        x = self.bn(x)")
+    lines += ["        return self.relu(x)", ""]
+    return lines
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_rewrite_cache_source_changed(tmp_path, monkeypatch):
+    """
+    Feature: SimQAT apply with RewriteCache.
+    Description: Apply SimQAT with fusion on a network, then change source of network so that Conv2d and BatchNorm2d
+        can not be fused any more while cells of network are not changed, and apply again with the same cache.
+    Expectation: Plan of old source is invalidated, network is rewritten again, and the result is the same as applying
+        without cache.
+    """
+    context.set_context(mode=context.GRAPH_MODE, device_target="CPU")
+    np.random.seed(1)
+    config = {"enable_fusion": True, "bn_fold": True}
+    cache_dir = os.path.join(str(tmp_path), "rewrite_cache")
+    module = _import_module_from_source(monkeypatch, tmp_path, "rewrite_cache_net", _conv_bn_relu_lines(True))
+    qat = SimQAT(config)
+    qat.set_rewrite_cache(RewriteCache(cache_dir))
+    fused_network = qat.apply(module.ConvBnReLUNet())
+    qat.apply(module.ConvBnReLUNet())
+    assert qat._rewrite_cache.get_stats() == {"hits": 1, "misses": 1, "invalidations": 0}
+
+    module = _import_module_from_source(monkeypatch, tmp_path, "rewrite_cache_net", _conv_bn_relu_lines(False))
+    qat = SimQAT(config)
+    qat.set_rewrite_cache(RewriteCache(cache_dir))
+    network = module.ConvBnReLUNet()
+    cached_network = qat.apply(network)
+    assert qat._rewrite_cache.get_stats() == {"hits": 0, "misses": 1, "invalidations": 1}
+    assert cached_network is not network
+
+    expect_network = SimQAT(config).apply(module.ConvBnReLUNet())
+    assert _wrapped_handler_types(cached_network) == _wrapped_handler_types(expect_network)
+    assert _wrapped_handler_types(cached_network) != _wrapped_handler_types(fused_network)
+    not_load_param = load_param_into_net(expect_network, cached_network.parameters_dict())
+    assert not not_load_param
+    data = Tensor(np.random.normal(size=(2, 1, 8, 8)).astype(np.float32))
+    cached_network.set_train(False)
+    expect_network.set_train(False)
+    assert np.allclose(cached_network(data).asnumpy(), expect_network(data).asnumpy())
+
+
+def _count_tree_nodes(net_transformer):
+    count = 0
+    for node in net_transformer.nodes():
+        if node.get_node_type() == NodeType.Tree:
+            count += 1 + _count_tree_nodes(NetTransformer.create_from_tree_node(node))
+    return count
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_apply_visits_sub_trees_once(monkeypatch):
+    """
+    Feature: SimQAT apply.
+    Description: Apply SimQAT on ResNet18 which has nested sub-trees, and count the transformers created for sub-trees.
+    Expectation: Transformer of each sub-tree is created only once, and Conv2d and Dense layers are wrapped.
+    """
+    context.set_context(mode=context.GRAPH_MODE, device_target="CPU")
+    network, _ = _create_network("resnet")
+    num_tree_nodes = _count_tree_nodes(NetTransformer(network))
+    assert num_tree_nodes > 0
+
+    created = []
+    create_from_tree_node = NetTransformer.create_from_tree_node
+
+    def counted_create_from_tree_node(node):
+        created.append(node.get_name())
+        return create_from_tree_node(node)
+
+    monkeypatch.setattr(NetTransformer, "create_from_tree_node", staticmethod(counted_create_from_tree_node))
+    network, _ = _create_network("resnet")
+    new_network = SimQAT().apply(network)
+    assert len(created) == num_tree_nodes
+    wrapped = [cell for _, cell in new_network.cells_and_names() if isinstance(cell, QuantizeWrapperCell)]
+    assert any(isinstance(cell.get_handler(), Conv2dQuant) for cell in wrapped)
+    assert any(isinstance(cell.get_handler(), DenseQuant) for cell in wrapped)
+
+
+def _import_module_from_source(monkeypatch, tmp_path, module_name, lines):
+    """Write `lines` into a python file under `tmp_path` and import it, module is registered in `sys.modules` by
+    `monkeypatch` so that source of its classes can be got by inspect, and is removed after the test."""
+    file_path = os.path.join(str(tmp_path), module_name + ".py")
+    with open(file_path, "w") as f:
+        f.write("\n".join(lines))
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, module_name, module)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _create_nested_network_type(monkeypatch, tmp_path, depth):
+    """Create type of network nested `depth` levels deep, each level is a Conv2d-BatchNorm2d-ReLU block which wraps
+    the block of the level below as a sub-cell, so that every level is a sub-tree for rewrite. Its source is written
+    into a file under `tmp_path` so that it can be parsed by rewrite."""
+    lines = ["from mindspore import nn", ""]
+    for i in range(depth):
+        lines += ["", f"class NestedBlock{i}(nn.Cell):", "    def __init__(self):", "        super().__init__()",
+                  "        self.conv = nn.Conv2d(4, 4, 3)", "        self.bn = nn.BatchNorm2d(4)",
+                  "        self.relu = nn.ReLU()"]
+        if i > 0:
+            lines.append(f"        self.inner = NestedBlock{i - 1}()")
+        lines += ["", "    def construct(self, x):", "        x = self.conv(x)", "        x = self.bn(x)",
+                  "        x = self.relu(x)"]
+        if i > 0:
+            lines.append("        x = self.inner(x)")
+        lines += ["        return x", ""]
+    module = _import_module_from_source(monkeypatch, tmp_path, f"nested_net_{depth}", lines)
+    return getattr(module, f"NestedBlock{depth - 1}")
+
+
+def _apply_time(network_type, repeat=3):
+    """Minimal time of applying SimQAT with fusion on a new network of `network_type`."""
+    times = []
+    for _ in range(repeat):
+        net = network_type()
+        start = time.perf_counter()
+        SimQAT({"enable_fusion": True, "bn_fold": True}).apply(net)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+@pytest.mark.level1
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_apply_time_scales_linearly(tmp_path, monkeypatch):
+    """
+    Feature: SimQAT apply.
+    Description: Apply SimQAT on networks nested 10 and 40 levels deep, each level a Conv2d-BatchNorm2d-ReLU block
+        wrapping the level below, and measure time of apply which is pure python on CPU.
+    Expectation: Time of apply grows linearly with nesting depth: 4 times of depth takes less than 8 times of time,
+        while walking sub-trees again from every level above would take about 16 times.
+    """
+    context.set_context(mode=context.GRAPH_MODE, device_target="CPU")
+    small_time = _apply_time(_create_nested_network_type(monkeypatch, tmp_path, 10))
+    large_time = _apply_time(_create_nested_network_type(monkeypatch, tmp_path, 40))
+    print(f"apply time, depth 10: {small_time * 1000:.1f}ms, depth 40: {large_time * 1000:.1f}ms")
+    assert large_time < 8 * small_time
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_layer_policy_clone():
+    """
+    Feature: LayerPolicy clone.
+    Description: Clone a SimQAT layer policy for two nodes and modify per-node state of one of them.
+    Expectation: Config and weight quantizer factory are shared, quantizers and per-node state are not.
+    """
+    policy = ConvLayerPolicy([], [], SimulatedQuantizationConfig())
+    policy1 = policy.clone()
+    policy2 = policy.clone()
+    assert policy1._config is policy._config
+    assert policy1._weight_quantizer_partial is policy._weight_quantizer_partial
+    assert isinstance(policy1.get_input_quantizer(), SimulatedFakeQuantizerPerLayer)
+    assert policy1.get_input_quantizer() is not policy2.get_input_quantizer()
+    assert policy1.get_output_quantizer() is not policy.get_output_quantizer()
+    assert not hasattr(policy1._state, "__dict__")
+
+    policy1.set_input_number(2)
+    policy2.set_input_number(1)
+    policy1.set_input_not_insert_fq(1)
+    policy1.set_output_not_insert_fq()
+    assert policy1.get_input_need_insert_fq() == [True, False]
+    assert policy2.get_input_need_insert_fq() == [True]
+    assert policy1.get_output_quantizer() is None
+    assert policy2.get_output_quantizer() is not None
+    assert policy.get_input_need_insert_fq() == []
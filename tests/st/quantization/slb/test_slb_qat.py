@@ -18,13 +18,19 @@ import os
 import sys
 from collections import OrderedDict
 import pytest
-from mindspore import nn, context
+import numpy as np
+from mindspore import nn, context, ops, Tensor, save_checkpoint, load_checkpoint, load_param_into_net
+from mindspore.common import dtype as mstype
 from mindspore import Model
 from mindspore.common.dtype import QuantDtype
 from mindspore_gs.quantization.slb import SlbQuantAwareTraining as SlbQAT
 from mindspore_gs.quantization.slb.slb_fake_quantizer import SlbActQuantizer
 from mindspore_gs.quantization.slb.slb_fake_quantizer import SlbFakeQuantizerPerLayer
+from mindspore_gs.quantization.slb.slb_fake_quantizer import SlbCompactFakeQuantizerPerLayer
 from mindspore_gs.quantization.quantize_wrapper_cell import QuantizeWrapperCell
+from mindspore_gs.quantization.slb.slb_quant import Conv2dSlbQuant
+from mindspore_gs.quantization.slb.slb_quant_convert import CellBlockWithFakeWeight, CellBlockWithPackedWeight, \
+    pack_weight_codes, unpack_weight_codes
 
 
 class NetToQuant(nn.Cell):
@@ -43,6 +49,24 @@ class NetToQuant(nn.Cell):
         return x
 
 
+class TwoConvNetToQuant(nn.Cell):
+    """
+    Network with two conv2d to be quanted.
+    """
+
+    def __init__(self):
+        super(TwoConvNetToQuant, self).__init__()
+        self.conv1 = nn.Conv2d(1, 6, 5, pad_mode='valid')
+        self.bn1 = nn.BatchNorm2d(6)
+        self.conv2 = nn.Conv2d(6, 8, 3, pad_mode='valid')
+        self.bn2 = nn.BatchNorm2d(8)
+
+    def construct(self, x):
+        x = self.bn1(self.conv1(x))
+        x = self.bn2(self.conv2(x))
+        return x
+
+
 @pytest.mark.level0
 @pytest.mark.platform_x86_cpu
 @pytest.mark.env_onecard
@@ -121,6 +145,205 @@ def test_convert(enable_act_quant):
     assert not isinstance(act_fake_quant, SlbActQuantizer)
 
 
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("num_bits", [1, 2, 4])
+def test_pack_weight_codes(num_bits):
+    """
+    Feature: pack_weight_codes and unpack_weight_codes.
+    Description: Pack codes whose number is not a multiple of codes per byte, and unpack them.
+    Expectation: Every byte holds 8 / num_bits codes, and unpacked codes are the same as origin codes.
+    """
+
+    np.random.seed(1)
+    codes = np.random.randint(0, 2 ** num_bits, size=(6, 1, 5, 5))
+    packed = pack_weight_codes(codes, num_bits)
+    assert packed.dtype == np.uint8
+    assert packed.size == -(-codes.size * num_bits // 8)
+    assert (unpack_weight_codes(packed, num_bits, codes.size) == codes.ravel()).all()
+    assert (pack_weight_codes(np.array([1, 0, 1, 1, 0, 0, 0, 1, 1]), 1) == [0b10001101, 1]).all()
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("quant_dtype, num_bits", [(QuantDtype.INT1, 1), (QuantDtype.INT2, 2), (QuantDtype.INT4, 4)])
+def test_convert_pack_weight(quant_dtype, num_bits):
+    """
+    Feature: SLB convert function with bit-packed weight.
+    Description: Convert the same compressed network with and without `pack_weight`.
+    Expectation: Packed weight is 8, 4 or 2 weights per byte, and unpacked weight and output of network are exactly
+        the same as converting without `pack_weight`.
+    """
+
+    context.set_context(mode=context.GRAPH_MODE, device_target="CPU")
+    qat = SlbQAT({"quant_dtype": [QuantDtype.INT8, quant_dtype]})
+    network = qat.apply(NetToQuant())
+    ckpt_path = "./slb_pack_weight.ckpt"
+    save_checkpoint(network, ckpt_path)
+    network.set_train(False)
+    fake_network = qat.convert(network)
+    fake_block = fake_network.name_cells().get("Conv2dSlbQuant")._handler
+    assert isinstance(fake_block, CellBlockWithFakeWeight)
+
+    packed_qat = SlbQAT({"quant_dtype": [QuantDtype.INT8, quant_dtype], "pack_weight": True})
+    assert packed_qat._config.pack_weight
+    packed_network = packed_qat.apply(NetToQuant())
+    packed_network.set_train(False)
+    packed_network = packed_qat.convert(packed_network, ckpt_path)
+    packed_block = packed_network.name_cells().get("Conv2dSlbQuant")._handler
+    assert isinstance(packed_block, CellBlockWithPackedWeight)
+    assert packed_block.packed_weight.dtype == mstype.uint8
+    weight = fake_block.weight.asnumpy()
+    assert packed_block.packed_weight.size == -(-weight.size * num_bits // 8)
+    assert (packed_block.unpack_weight() == weight).all()
+
+    data = Tensor(np.random.normal(size=(2, 1, 32, 32)), mstype.float32)
+    assert (packed_network(data).asnumpy() == fake_network(data).asnumpy()).all()
+
+    with pytest.raises(TypeError):
+        SlbQAT({"pack_weight": 1})
+
+
+def _soft_weight(latent, w_list, temperature):
+    """Reference of `SlbSoftWeight` which materializes probabilities of all weight values."""
+    delta = w_list[1] - w_list[0]
+    logits = -temperature * ((latent[..., None] - w_list) / delta) ** 2
+    probs = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    probs = probs / probs.sum(axis=-1, keepdims=True)
+    return (probs * w_list).sum(axis=-1)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("quant_dtype, num_bits", [(QuantDtype.INT1, 1), (QuantDtype.INT2, 2), (QuantDtype.INT4, 4)])
+def test_compact_weight(quant_dtype, num_bits):
+    """
+    Feature: SLB QAT-algorithm with compact weight.
+    Description: Apply SLB with `compact_weight`, run weight quantizer in training and evaluation, and convert.
+    Expectation: Weight has no axis of weight values, soft weight and its gradient are the same as materializing
+        probabilities of all weight values, and the nearest weight value is selected in evaluation and convert.
+    """
+
+    context.set_context(mode=context.GRAPH_MODE, device_target="CPU")
+    qat = SlbQAT({"quant_dtype": [QuantDtype.INT8, quant_dtype], "compact_weight": True})
+    assert qat._config.compact_weight
+    network = qat.apply(NetToQuant())
+    conv_quant = network.name_cells().get("Conv2dSlbQuant")._handler
+    quantizer = conv_quant.fake_quant_weight
+    assert isinstance(quantizer, SlbCompactFakeQuantizerPerLayer)
+    assert conv_quant.weight.shape == (6, 1, 5, 5)
+
+    np.random.seed(1)
+    latent = np.random.uniform(-1.2, 1.2, size=(6, 1, 5, 5))
+    conv_quant.weight.set_data(Tensor(latent, mstype.float32))
+    w_list = quantizer.w_list_init
+    quantizer.set_temperature(2.0)
+    quantizer.set_train(True)
+    weight = Tensor(latent, mstype.float32)
+    assert np.allclose(quantizer(weight).asnumpy(), _soft_weight(latent, w_list, 2.0), atol=1e-5)
+    eps = 1e-6
+    grad = (_soft_weight(latent + eps, w_list, 2.0) - _soft_weight(latent - eps, w_list, 2.0)) / (2 * eps)
+    assert np.allclose(ops.GradOperation()(quantizer)(weight).asnumpy(), grad, rtol=1e-3, atol=1e-4)
+
+    hard_weight = w_list[np.abs(latent[..., None] - w_list).argmin(axis=-1)]
+    quantizer.set_train(False)
+    assert np.allclose(quantizer(weight).asnumpy(), hard_weight)
+    network = qat.convert(network)
+    assert np.allclose(network.name_cells().get("Conv2dSlbQuant")._handler.weight.asnumpy(), hard_weight)
+
+    with pytest.raises(TypeError):
+        SlbQAT({"compact_weight": 1})
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("compact_weight", [False, True])
+def test_hard_weight_cache(compact_weight):
+    """
+    Feature: SLB QAT-algorithm with eval weight cache.
+    Description: Apply SLB with `cache_eval_weight`, run weight quantizer after temperature annealing ends, and switch
+        network to eval mode.
+    Expectation: Selected weight is the weight value with the highest probability and has no gradient, and discrete
+        weight is cached when network is set to eval mode and refreshed when set to eval mode again.
+    """
+
+    context.set_context(mode=context.GRAPH_MODE, device_target="CPU")
+    qat = SlbQAT({"quant_dtype": [QuantDtype.INT8, QuantDtype.INT2], "compact_weight": compact_weight,
+                  "cache_eval_weight": True})
+    assert qat._config.cache_eval_weight
+    network = qat.apply(NetToQuant())
+    conv_quant = network.name_cells().get("Conv2dSlbQuant")._handler
+    quantizer = conv_quant.fake_quant_weight
+    assert conv_quant.eval_weight.shape == (6, 1, 5, 5)
+
+    np.random.seed(1)
+    w_list = quantizer.w_list_init
+    if compact_weight:
+        latent = np.random.uniform(-1.2, 1.2, size=(6, 1, 5, 5))
+        hard_weight = w_list[np.abs(latent[..., None] - w_list).argmin(axis=-1)]
+    else:
+        latent = np.random.normal(size=(6, 1, 5, 5, 4))
+        hard_weight = w_list[latent.argmax(axis=-1)]
+    weight = Tensor(latent, mstype.float32)
+    quantizer.set_train(True)
+    quantizer.set_temperature_end_flag()
+    assert np.allclose(quantizer(weight).asnumpy(), hard_weight)
+    assert np.allclose(ops.GradOperation()(quantizer)(weight).asnumpy(), 0)
+
+    network.set_train(True)
+    conv_quant.weight.set_data(weight)
+    network.set_train(False)
+    assert np.allclose(conv_quant.eval_weight.asnumpy(), hard_weight)
+    network.set_train(True)
+    conv_quant.weight.set_data(Tensor(-latent, mstype.float32))
+    network.set_train(False)
+    assert not np.allclose(conv_quant.eval_weight.asnumpy(), hard_weight)
+    assert np.allclose(conv_quant.eval_weight.asnumpy(), quantizer(Tensor(-latent, mstype.float32)).asnumpy())
+
+    with pytest.raises(TypeError):
+        SlbQAT({"cache_eval_weight": 1})
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("compact_weight", [False, True])
+def test_hard_weight_cache_multi_layers(compact_weight, tmp_path):
+    """
+    Feature: SLB QAT-algorithm with eval weight cache.
+    Description: Apply SLB with `cache_eval_weight` on a network with two convolutions, run it in eval mode in
+        GRAPH_MODE, and save it into checkpoint.
+    Expectation: Cached weights have unique names, network compiles and outputs the same as network without cache,
+        and cached weights are not saved into checkpoint.
+    """
+
+    context.set_context(mode=context.GRAPH_MODE, device_target="CPU")
+    config = {"quant_dtype": [QuantDtype.INT8, QuantDtype.INT2], "compact_weight": compact_weight}
+    network = SlbQAT(dict(config, cache_eval_weight=True)).apply(TwoConvNetToQuant())
+    conv_quants = [cell for _, cell in network.cells_and_names() if isinstance(cell, Conv2dSlbQuant)]
+    assert len(conv_quants) == 2
+    network.check_names()
+    network.set_train(False)
+    names = [conv_quant.eval_weight.name for conv_quant in conv_quants]
+    assert len(set(names)) == 2
+    assert all(name.endswith("_eval_cache") for name in names)
+
+    ref_network = SlbQAT(config).apply(TwoConvNetToQuant())
+    load_param_into_net(ref_network, network.parameters_dict())
+    ref_network.set_train(False)
+    np.random.seed(1)
+    data = Tensor(np.random.normal(size=(2, 1, 16, 16)), mstype.float32)
+    assert np.allclose(network(data).asnumpy(), ref_network(data).asnumpy(), atol=1e-5)
+
+    ckpt_file = os.path.join(str(tmp_path), "slb_cache.ckpt")
+    save_checkpoint(network, ckpt_file)
+    assert not [name for name in load_checkpoint(ckpt_file) if name.endswith("_eval_cache")]
+
+
 @pytest.mark.level0
 @pytest.mark.platform_x86_cpu
 @pytest.mark.env_onecard
@@ -0,0 +1,104 @@
+# Copyright 2023 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""test quantization utils."""
+import pytest
+import numpy as np
+from mindspore_gs.quantization.quant_utils import compute_kl_threshold, compute_kl_thresholds, \
+    compute_kl_threshold_from_histogram
+
+
+def compute_kl_threshold_loop(data, bitwidth):
+    """Reference implementation of `compute_kl_threshold` which evaluates candidate thresholds one by one."""
+    data_max = np.abs(data).max()
+    if data_max < 1e-5:
+        return 1e-5
+    hist, bin_edges = np.histogram(np.abs(data), bins='sqrt', range=(0, data_max), density=True)
+    if hist.shape[0] > 1024:
+        hist, bin_edges = np.histogram(np.abs(data), range=(0, data_max), density=True)
+    hist = hist / np.sum(hist)
+    cumsum = np.cumsum(hist)
+    bit_pow_range = pow(2, int(bitwidth) - 1)
+    if bit_pow_range + 1 > len(bin_edges) - 1:
+        return float(bin_edges[-1])
+    threshold = []
+    kl = []
+    for i in range(bit_pow_range + 1, len(bin_edges), 1):
+        threshold.append((i + 0.5) * (bin_edges[1] - bin_edges[0]))
+        cumsum_tmp = np.copy(cumsum)
+        cumsum_tmp[(i - 1):] = 1
+        forward_interp = np.interp(np.linspace(0.0, 1.0, bit_pow_range), np.linspace(0.0, 1.0, i),
+                                   cumsum_tmp[:i])
+        cumsum_tmp[:i] = np.interp(np.linspace(0.0, 1.0, i), np.linspace(0.0, 1.0, bit_pow_range), forward_interp)
+        kl.append(np.sum((cumsum - cumsum_tmp) * np.log2(cumsum / cumsum_tmp)))
+    return max(float(threshold[np.argmin(kl)]), 1e-5)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+@pytest.mark.parametrize("bitwidth", [2, 4, 8])
+@pytest.mark.parametrize("chunk_size", [None, 1, 64])
+def test_compute_kl_threshold(bitwidth, chunk_size):
+    """
+    Feature: compute_kl_threshold.
+    Description: Compute KL threshold of data with different distributions.
+    Expectation: Threshold is the same as evaluating candidate thresholds one by one.
+    """
+    np.random.seed(1)
+    datas = [np.random.normal(size=(64, 32, 3, 3)).astype(np.float32),
+             np.random.laplace(size=200000),
+             np.random.uniform(-1, 1, size=5000),
+             np.round(np.random.normal(size=3000) * 3),
+             np.random.normal(size=100) * 1e-6]
+    for data in datas:
+        assert compute_kl_threshold(data, bitwidth, chunk_size) == compute_kl_threshold_loop(data, bitwidth)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_compute_kl_thresholds():
+    """
+    Feature: compute_kl_thresholds.
+    Description: Compute KL thresholds of each channel of a weight.
+    Expectation: Thresholds are the same as computing each channel by `compute_kl_threshold`.
+    """
+    np.random.seed(1)
+    weight = np.random.normal(size=(16, 256, 3, 3)).astype(np.float32) * np.random.uniform(size=(16, 1, 1, 1))
+    weight[3] = 0
+    thresholds = compute_kl_thresholds(weight, 4)
+    assert thresholds.shape == (16,)
+    for threshold, channel in zip(thresholds, weight):
+        assert threshold == compute_kl_threshold_loop(channel, 4)
+    with pytest.raises(ValueError):
+        compute_kl_thresholds(weight, 4, chunk_size=0)
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_compute_kl_threshold_from_histogram():
+    """
+    Feature: compute_kl_threshold_from_histogram.
+    Description: Compute KL threshold from the histogram of absolute value of data.
+    Expectation: Threshold is the same as computing from data by `compute_kl_threshold`.
+    """
+    np.random.seed(1)
+    data = np.random.normal(size=10000)
+    hist, bin_edges = np.histogram(np.abs(data), bins='sqrt', range=(0, np.abs(data).max()))
+    assert compute_kl_threshold_from_histogram(hist, bin_edges, 8) == compute_kl_threshold(data, 8)
+    assert compute_kl_threshold_from_histogram(np.zeros(4), np.arange(5), 8) == 1e-5
+    with pytest.raises(ValueError):
+        compute_kl_threshold_from_histogram(hist, bin_edges[:-1], 8)
@@ -0,0 +1,75 @@
+# Copyright 2023 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""test Transformer of quantization."""
+import pytest
+from mindspore import nn
+from mindspore.rewrite import SymbolTree
+from mindspore_gs.quantization.transformer import Transformer
+
+
+class ConvBnReLU(nn.Cell):
+    """Conv2d + BatchNorm2d + ReLU, whose output is consumed by two branches."""
+
+    def __init__(self):
+        super(ConvBnReLU, self).__init__()
+        self.conv = nn.Conv2d(1, 2, 3)
+        self.bn = nn.BatchNorm2d(2)
+        self.relu = nn.ReLU()
+        self.conv1 = nn.Conv2d(2, 2, 1)
+        self.conv2 = nn.Conv2d(2, 2, 1)
+
+    def construct(self, x):
+        x = self.conv(x)
+        x = self.bn(x)
+        x = self.relu(x)
+        return self.conv1(x) + self.conv2(x)
+
+
+def _visited_types(symbol_tree: SymbolTree):
+    return sorted(node.get_instance_type().__name__ for node in symbol_tree.nodes()
+                  if node.get_attribute("is_node_visited"))
+
+
+@pytest.mark.level0
+@pytest.mark.platform_x86_cpu
+@pytest.mark.env_onecard
+def test_apply_transformers():
+    """
+    Feature: Transformer.apply_transformers.
+    Description: Apply several transformers on a network whose subgraph is shared by two branches in one traversal.
+    Expectation: Only transformers whose root type matches node are applied, matched nodes do not overlap, transformer
+        in front takes effect, and the result is the same as applying transformers one by one.
+    """
+
+    symbol_tree = SymbolTree.create(ConvBnReLU())
+    Transformer.apply_transformers(symbol_tree, [Transformer([nn.Conv2d, nn.BatchNorm2d]),
+                                                 Transformer([nn.BatchNorm2d, nn.ReLU])])
+    assert _visited_types(symbol_tree) == ["BatchNorm2d", "Conv2d"]
+
+    symbol_tree = SymbolTree.create(ConvBnReLU())
+    Transformer.apply_transformers(symbol_tree, [Transformer([nn.BatchNorm2d, nn.ReLU]),
+                                                 Transformer([nn.Conv2d, nn.BatchNorm2d])])
+    assert _visited_types(symbol_tree) == ["BatchNorm2d", "ReLU"]
+
+    symbol_tree = SymbolTree.create(ConvBnReLU())
+    Transformer([nn.Conv2d, nn.BatchNorm2d]).apply(symbol_tree)
+    assert _visited_types(symbol_tree) == ["BatchNorm2d", "Conv2d"]
+    Transformer([nn.BatchNorm2d, nn.ReLU]).apply(symbol_tree)
+    assert _visited_types(symbol_tree) == ["BatchNorm2d", "Conv2d"]
+
+    symbol_tree = SymbolTree.create(ConvBnReLU())
+    Transformer.apply_transformers(symbol_tree, [Transformer([nn.Conv2d, nn.BatchNorm2d, nn.ReLU]),
+                                                 Transformer([nn.BatchNorm2d, nn.ReLU])])
+    assert _visited_types(symbol_tree) == ["BatchNorm2d", "Conv2d", "ReLU"]